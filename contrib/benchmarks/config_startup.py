@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Measure fedrq's import and startup time with and without the validated config
+cache.
+
+Each command is run in a fresh interpreter.
+The uncached runs set $FEDRQ_NO_CONFIG_CACHE.
+The cached runs reuse a cache that's written by a warmup run.
+The in-process get_config() timings exclude the interpreter and import
+overhead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+COMMANDS: dict[str, list[str]] = {
+    "pkgs --help": ["pkgs", "--help"],
+    "check-config": ["check-config"],
+}
+
+
+def run(argv: list[str], env: dict[str, str], number: int) -> float:
+    cmd = [sys.executable, "-m", "fedrq", *argv]
+    times: list[float] = []
+    for _ in range(number):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def parseargs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parseargs()
+    with tempfile.TemporaryDirectory() as cachedir:
+        env = os.environ | {"XDG_CACHE_HOME": cachedir}
+        uncached_env = env | {"FEDRQ_NO_CONFIG_CACHE": "1"}
+        print(f"{'case':<20} {'uncached (ms)':>14} {'cached (ms)':>12} {'saved':>8}")
+        for name, argv in COMMANDS.items():
+            uncached = run(argv, uncached_env, args.number)
+            # Warm up the cache
+            run(argv, env, 1)
+            cached = run(argv, env, args.number)
+            print(
+                f"{name:<20} {uncached:>14.1f} {cached:>12.1f}"
+                f" {uncached - cached:>7.1f}ms"
+            )
+
+        os.environ["XDG_CACHE_HOME"] = cachedir
+        from fedrq.config import get_config
+
+        get_config()
+        number = args.number * 10
+        cached = timeit.timeit(get_config, number=number) / number * 1000
+        os.environ["FEDRQ_NO_CONFIG_CACHE"] = "1"
+        uncached = timeit.timeit(get_config, number=number) / number * 1000
+        print(
+            f"{'get_config()':<20} {uncached:>14.1f} {cached:>12.1f}"
+            f" {uncached - cached:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
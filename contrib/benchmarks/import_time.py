@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Gate the import time of fedrq's commands that don't query the repos.
+
+Each command is run in a fresh interpreter with `-X importtime`.
+The total import time is the sum of the cumulative times of the top-level
+imports, excluding the interpreter's `site` initialization.
+This exits with a non-zero status if the median total import time of a
+command exceeds the budget or a command imports one of the heavy modules that
+only the query commands need.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+COMMANDS: dict[str, list[str]] = {
+    "--version": ["--version"],
+    "--help": ["--help"],
+    "formatters": ["formatters"],
+    "pkgs --help": ["pkgs", "--help"],
+    "download-spec --help": ["download-spec", "--help"],
+}
+# Modules that should only be imported when a command needs them
+HEAVY_MODULES = frozenset(
+    {
+        "dnf",
+        "hawkey",
+        "libdnf5",
+        "requests",
+        "rpm",
+        "urllib3",
+        "multiprocessing",
+        "pydantic",
+    }
+)
+
+
+def importtime(argv: list[str]) -> tuple[float, set[str]]:
+    """
+    Run fedrq with `-X importtime`.
+
+    Returns:
+        The total import time in milliseconds and the imported modules
+    """
+    cmd = [sys.executable, "-X", "importtime", "-m", "fedrq", *argv]
+    # Don't let a running daemon or the environment affect the results
+    env = {k: v for k, v in os.environ.items() if not k.startswith("FEDRQ_")}
+    proc = subprocess.run(
+        cmd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    total = 0
+    modules: set[str] = set()
+    for line in proc.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        # Nested imports are indented
+        if not name.startswith("  ") and name.strip() != "site":
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def parseargs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=10)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=250,
+        help="Maximum median import time in milliseconds. Default: %(default)s",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parseargs()
+    failed = False
+    print(f"{'command':<24} {'import (ms)':>12}  heavy modules")
+    for name, argv in COMMANDS.items():
+        times: list[float] = []
+        heavy: set[str] = set()
+        for _ in range(args.number):
+            total, modules = importtime(argv)
+            times.append(total)
+            heavy |= modules & HEAVY_MODULES
+        median = statistics.median(times)
+        over = median > args.budget
+        failed |= over or bool(heavy)
+        print(
+            f"{name:<24} {median:>12.1f}  {', '.join(sorted(heavy)) or '-'}"
+            + ("  (over budget)" if over else "")
+        )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
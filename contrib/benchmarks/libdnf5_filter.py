@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Measure the per-call overhead of the libdnf5 backend's PackageQuery._filter().
+
+The sack is left empty so that the libdnf5 filter methods themselves are
+nearly free and the timings are dominated by fedrq's Python code.
+The legacy implementation that parsed keys and inspected type annotations on
+every call is inlined below for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import typing as t
+from functools import partial
+
+import libdnf5
+
+from fedrq.backends.libdnf5.backend import (
+    CONVERT_TO_LIST,
+    BaseMaker,
+    PackageQuery,
+    _QueryFilterKwargs,
+)
+
+CASES: dict[str, dict[str, t.Any]] = {
+    "name": {"name": "bash"},
+    "name+arch": {"name": "bash", "arch__neq": "src"},
+    "glob+latest": {"name__glob": "python3-*", "latest": 1},
+    "requires+reponame": {"requires": ["bash"], "reponame": "fedora"},
+}
+
+
+# Copied verbatim from fedrq.backends.libdnf5.backend before the filter
+# dispatch was precompiled
+_ValT = t.TypeVar("_ValT")
+
+
+def _convert_value(key: str, value: _ValT) -> t.Union[list[_ValT], _ValT]:
+    """
+    Overkill code to normalize single strings or ints that libdnf5 requires to
+    be a list based on type annotations.
+    """
+    d_annotations = t.get_type_hints(_QueryFilterKwargs)
+    annotation = d_annotations[key]
+    if t.get_origin(annotation) is not t.Union or not any(
+        isinstance(value, typ) for typ in CONVERT_TO_LIST
+    ):
+        return value
+    union_types = t.get_args(annotation)
+    pairs = [(t.get_origin(arg), t.get_args(arg)) for arg in union_types]
+    for origin, sargs in pairs:
+        assert isinstance(origin, type)
+        if not issubclass(origin, list):
+            continue
+        if t.get_origin(sargs[0]) is t.Union:
+            pairs = [(t.get_origin(arg), t.get_args(arg)) for arg in union_types]
+            for origin, sargs in pairs:
+                assert isinstance(origin, type)
+                if issubclass(origin, list) and isinstance(value, sargs[0]):
+                    return [value]
+        if isinstance(value, sargs[0]):
+            return [value]
+    return value
+
+
+class LegacyPackageQuery(PackageQuery):
+    def _filter(self, **kwargs: t.Any) -> None:  # type: ignore[override]
+        if not kwargs:
+            return None
+        filter_mapping = {
+            "latest": "latest_evr",
+            "latest_per_arch": "latest_evr",
+            "reponame": "repo_id",
+        }
+        comp_mapping: dict[str, int] = {
+            "eq": libdnf5.common.QueryCmp_EQ,
+            "neq": libdnf5.common.QueryCmp_NEQ,
+            "glob": libdnf5.common.QueryCmp_GLOB,
+            "contains": libdnf5.common.QueryCmp_CONTAINS,
+            "gt": libdnf5.common.QueryCmp_GT,
+            "gte": libdnf5.common.QueryCmp_GTE,
+            "lt": libdnf5.common.QueryCmp_LT,
+            "lte": libdnf5.common.QueryCmp_LTE,
+        }
+        invalid = []
+        for key in kwargs:
+            if key not in _QueryFilterKwargs.__annotations__:
+                invalid.append(key)
+        if invalid:
+            raise TypeError(f"Invalid keyword arguments: {invalid}")
+        if kwargs.pop("empty", None):
+            self.clear()
+            return None
+        if kwargs.pop("downgrades", None):
+            self.filter_downgrades()
+        for key, value in kwargs.items():
+            split = key.rsplit("__", 1)
+            name = "filter_" + filter_mapping.get(split[0], split[0])
+            args = [_convert_value(key, value)]
+            if len(split) == 2:
+                args.append(comp_mapping[split[1]])
+            getattr(self, name)(*args)
+
+
+def parseargs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parseargs()
+    base = BaseMaker().fill_sack()
+    query = PackageQuery(base)
+    legacy = LegacyPackageQuery(base)
+    print(f"{'case':<20} {'legacy (us)':>12} {'compiled (us)':>14} {'speedup':>8}")
+    for name, kwargs in CASES.items():
+        times = [
+            timeit.timeit(partial(q.filter, **kwargs), number=args.number)
+            / args.number
+            * 1e6
+            for q in (legacy, query)
+        ]
+        print(
+            f"{name:<20} {times[0]:>12.2f} {times[1]:>14.2f}"
+            f" {times[0] / times[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
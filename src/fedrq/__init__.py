@@ -11,21 +11,21 @@ import logging
 import os
 import warnings
 
-import pydantic
-
 __version__ = "1.6.0.post0"
 
 
 def _filter_pydantic_v2_warnings() -> None:
+    # Importing pydantic is slow,
+    # so this is called by the modules that use it instead of at import time.
+    if "_FEDRQ_SHOW_PYDANTIC_WARNINGS" in os.environ:
+        return
+    import pydantic
+
     typ: type[DeprecationWarning] | None
     if typ := getattr(pydantic, "PydanticDeprecatedSince20", None):
         warnings.simplefilter(action="ignore", category=typ)
 
 
-if "_FEDRQ_SHOW_PYDANTIC_WARNINGS" not in os.environ:
-    _filter_pydantic_v2_warnings()
-
-
 fmt = "{levelname}:{name}:{lineno}: {message}"
 logging.basicConfig(format=fmt, style="{")
 logger = logging.getLogger("fedrq")
@@ -7,10 +7,12 @@ PRIVATE: Utilities for dealing with RPM archives
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+import os
+import threading
+from collections.abc import Iterable, Iterator
 from contextlib import closing, contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING
 
 import rpm
 
@@ -25,12 +27,31 @@ class RPMArchiveError(Exception):
 
 
 class RPMArchive:
-    def __init__(self, path: Path, *, ts: rpm.TransactionSet | None = None) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ts: rpm.TransactionSet | None = None,
+        fileobj: IO[bytes] | None = None,
+    ) -> None:
+        """
+        Args:
+            path:
+                Path to the RPM
+            ts:
+                TransactionSet used to read the RPM header
+            fileobj:
+                Read the RPM from this file object instead of opening `path`.
+                The file object may be non-seekable (e.g., a pipe).
+                In that case, the payload can only be unpacked once.
+        """
         self.path = path
         self.ts: rpm.TransactionSet = ts or rpm.TransactionSet()
-        self.fd: rpm.fd = rpm.fd(str(path), "r")
+        self.seekable: bool = fileobj is None or fileobj.seekable()
+        self.fd: rpm.fd = rpm.fd(str(path) if fileobj is None else fileobj, "r")
         self.hdr: rpm.hdr = self.ts.hdrFromFdno(self.fd)
-        self._loc: int = self.fd.tell()
+        self._loc: int | None = self.fd.tell() if self.seekable else None
+        self._unpacked = False
 
     def __repr__(self) -> str:  # pragma: no cover
         path, ts = self.path, self.ts
@@ -45,8 +66,15 @@ class RPMArchive:
         Yields:
             A tuple of the `rpm.files` object, the payload's open `rpm.fd`, and
             the `rpm.archive` object
+        Raises:
+            `RPMArchiveError` if the payload of a non-seekable RPM was already
+            unpacked
         """
-        self.fd.seek(self._loc)
+        if self._loc is not None:
+            self.fd.seek(self._loc)
+        elif self._unpacked:
+            raise RPMArchiveError(f"{self}'s payload was already unpacked")
+        self._unpacked = True
         files: rpm.files = rpm.files(self.hdr)
         payload: rpm.fd = rpm.fd(self.fd, "r", self.hdr["payloadcompressor"])
         archive: rpm.archive = files.archive(payload)
@@ -88,4 +116,65 @@ class RPMArchive:
         self.fd.close()
 
 
-__all__ = ("RPMArchive", "RPMArchiveError")
+def _write_chunks(
+    chunks: Iterable[bytes], fd: int, errors: list[BaseException]
+) -> None:
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            for chunk in chunks:
+                fp.write(chunk)
+    except BrokenPipeError:
+        # The reader is done
+        pass
+    except BaseException as exc:
+        errors.append(exc)
+
+
+def extract_specfile_from_stream(
+    chunks: Iterable[bytes],
+    destdir: Path,
+    *,
+    name: str = "<stream>",
+    ts: rpm.TransactionSet | None = None,
+) -> Path:
+    """
+    Extract an SRPM's specfile to `destdir` while the SRPM is being read from
+    `chunks`.
+    The SRPM is piped to rpm from a writer thread.
+    `chunks` stops being consumed once the specfile has been extracted.
+
+    Args:
+        chunks:
+            Iterable of the SRPM's bytes, such as an HTTP response body
+        destdir:
+            Directory in which to extract the specfile.
+            The directory must already exist
+        name:
+            Name of the SRPM used in error messages
+        ts:
+            TransactionSet used to read the SRPM header
+    Raises:
+        `RPMArchiveError` if the stream is not a *source* RPM.
+        Errors raised while iterating over `chunks` are re-raised.
+    """
+    read_fd, write_fd = os.pipe()
+    errors: list[BaseException] = []
+    writer = threading.Thread(
+        target=_write_chunks, args=(chunks, write_fd, errors), daemon=True
+    )
+    writer.start()
+    try:
+        # Closing the read end makes the writer stop with a BrokenPipeError
+        fp = os.fdopen(read_fd, "rb")
+        with fp, RPMArchive(Path(name), ts=ts, fileobj=fp) as archive:
+            return archive.extract_specfile(destdir)
+    except Exception:
+        writer.join()
+        if errors:
+            raise errors[0] from None
+        raise
+    finally:
+        writer.join()
+
+
+__all__ = ("RPMArchive", "RPMArchiveError", "extract_specfile_from_stream")
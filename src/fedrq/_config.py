@@ -4,6 +4,23 @@
 
 from __future__ import annotations
 
+from enum import auto as auto_enum
+
+from fedrq._compat import StrEnum
+
 
 class ConfigError(ValueError):
     pass
+
+
+class LoadFilelists(StrEnum):
+    auto = auto_enum()
+    always = auto_enum()
+    never = auto_enum()
+
+    @classmethod
+    def from_bool(cls, /, boolean: bool) -> LoadFilelists:
+        return cls.always if boolean else cls.never
+
+    def __bool__(self) -> bool:
+        return self == LoadFilelists.always
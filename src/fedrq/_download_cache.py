@@ -0,0 +1,200 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+PRIVATE: Content-addressed cache of downloaded packages
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
+
+LOG = logging.getLogger(__name__)
+
+# Size of the chunks that are streamed to disk
+CHUNK_SIZE = 1024 * 1024
+# Map repodata checksum type names to their hashlib names
+_CHECKSUM_TYPES = {"sha": "sha1"}
+_PARTIAL_SUFFIX = ".part"
+
+
+class CacheBusyError(Exception):
+    """
+    Another process or thread is downloading the same package
+    """
+
+
+def new_hasher(checksum: tuple[str, str] | None) -> Any | None:
+    """
+    Return a hashlib object for a (type, hexdigest) repodata checksum or `None`
+    if the checksum type isn't supported
+    """
+    if not checksum:
+        return None
+    try:
+        return hashlib.new(_CHECKSUM_TYPES.get(checksum[0], checksum[0]))
+    except ValueError:
+        return None
+
+
+def get_download_cachedir() -> Path:
+    from fedrq.config import get_smartcache_basedir
+
+    return get_smartcache_basedir() / "downloads"
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    """
+    Hardlink `src` to `dest` or copy it when hardlinking isn't possible.
+    `dest` is replaced atomically.
+    """
+    fd, name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+    os.close(fd)
+    try:
+        try:
+            os.unlink(name)
+            os.link(src, name)
+        except OSError:
+            shutil.copyfile(src, name)
+            os.chmod(name, 0o644)
+        os.replace(name, dest)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(name)
+        raise
+
+
+class DownloadCache:
+    """
+    Size-bounded cache of downloaded packages keyed by their repodata
+    checksums.
+    Entries are evicted in least recently used order.
+    Interrupted downloads are kept and resumed with HTTP Range requests.
+    """
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def path(self, checksum: tuple[str, str]) -> Path:
+        return self.directory / checksum[0] / checksum[1]
+
+    def get(self, checksum: tuple[str, str]) -> Path | None:
+        """
+        Return the path to the cached package or `None`
+        """
+        path = self.path(checksum)
+        try:
+            # Mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def fetch(
+        self,
+        checksum: tuple[str, str],
+        get: Callable[[Mapping[str, str]], requests.Response],
+    ) -> Path:
+        """
+        Download a package into the cache.
+
+        Args:
+            checksum:
+                The package's (type, hexdigest) repodata checksum
+            get:
+                Function that makes a streaming GET request with extra headers
+
+        Raises:
+            CacheBusyError: The package is already being downloaded
+            ValueError: The checksum didn't match.
+                The partial download is discarded.
+        """
+        if not (hasher := new_hasher(checksum)):
+            raise ValueError(f"Unsupported checksum type: {checksum[0]}")
+        path = self.path(checksum)
+        part = path.with_name(path.name + _PARTIAL_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with part.open("a+b") as fp:
+            try:
+                fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise CacheBusyError(f"{part} is locked") from None
+            # Another process may have finished the download
+            if path.exists():
+                part.unlink()
+                return path
+            fp.seek(0)
+            for chunk in iter(partial(fp.read, CHUNK_SIZE), b""):
+                hasher.update(chunk)
+            offset = fp.tell()
+            if offset:
+                LOG.debug("Resuming %s from byte %s", path.name, offset)
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            req = get(headers)
+            if offset and req.status_code == 416:
+                # The partial download is invalid. Start over.
+                req.close()
+                fp.truncate(0)
+                hasher = new_hasher(checksum)
+                offset = 0
+                req = get({})
+            with req:
+                req.raise_for_status()
+                if offset and req.status_code != 206:
+                    # The server ignored the Range header
+                    fp.truncate(0)
+                    hasher = new_hasher(checksum)
+                for chunk in req.iter_content(CHUNK_SIZE):
+                    fp.write(chunk)
+                    hasher.update(chunk)
+            fp.flush()
+            if hasher.hexdigest() != checksum[1]:
+                part.unlink()
+                raise ValueError(
+                    f"Checksum mismatch for {path.name}:"
+                    f" expected {checksum[0]}:{checksum[1]},"
+                    f" got {checksum[0]}:{hasher.hexdigest()}"
+                )
+            os.chmod(part, 0o644)
+            os.replace(part, path)
+        return path
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in
+        `max_size`.
+        Partial downloads are not evicted.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*/*"):
+            if path.name.endswith(_PARTIAL_SUFFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            LOG.debug("Evicting %s from the download cache", path.name)
+            with suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
@@ -0,0 +1,172 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+PRIVATE: Pure Python comparison of RPM versions and dependencies
+"""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+_DIGITS = re.compile(r"[0-9]+")
+_ALPHA = re.compile(r"[a-zA-Z]+")
+_OPERATORS = {
+    "=": "=",
+    "==": "=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+}
+
+
+def _is_segment_char(char: str) -> bool:
+    return (char.isascii() and char.isalnum()) or char in "~^"
+
+
+def _compare_markers(a: str, i: int, b: str, j: int) -> int | None:
+    """
+    Compare the tilde or caret at the current position of `a` or `b`.
+
+    Returns:
+        None if neither version has a marker at this position,
+        0 if both have the same marker, or the rpmvercmp() result otherwise
+    """
+    char_a = a[i] if i < len(a) else ""
+    char_b = b[j] if j < len(b) else ""
+    # Tilde sorts before everything else, even the end of the string
+    if "~" in (char_a, char_b):
+        if char_a == char_b:
+            return 0
+        return -1 if char_a == "~" else 1
+    # Caret sorts after the end of the string but before everything else
+    if "^" in (char_a, char_b):
+        if char_a == char_b:
+            return 0
+        if not char_a or not char_b:
+            return -1 if not char_a else 1
+        return 1 if char_b == "^" else -1
+    return None
+
+
+def _compare_segments(seg_a: str, seg_b: str, numeric: bool) -> int:
+    if numeric:
+        seg_a = seg_a.lstrip("0")
+        seg_b = seg_b.lstrip("0")
+        if len(seg_a) != len(seg_b):
+            return 1 if len(seg_a) > len(seg_b) else -1
+    if seg_a != seg_b:
+        return 1 if seg_a > seg_b else -1
+    return 0
+
+
+def rpmvercmp(a: str, b: str) -> int:
+    """
+    Pure Python port of rpm's rpmvercmp()
+
+    Returns:
+        1 if `a` is newer than `b`, 0 if they're equal, or -1 if `b` is newer
+    """
+    if a == b:
+        return 0
+    i = j = 0
+    len_a, len_b = len(a), len(b)
+    while i < len_a or j < len_b:
+        while i < len_a and not _is_segment_char(a[i]):
+            i += 1
+        while j < len_b and not _is_segment_char(b[j]):
+            j += 1
+        marker = _compare_markers(a, i, b, j)
+        if marker is not None:
+            if marker:
+                return marker
+            i += 1
+            j += 1
+            continue
+        if i >= len_a or j >= len_b:
+            break
+        pattern = _DIGITS if a[i].isdigit() else _ALPHA
+        match_a = pattern.match(a, i)
+        match_b = pattern.match(b, j)
+        assert match_a
+        i = match_a.end()
+        # Numeric segments are always newer than alpha segments
+        if not match_b:
+            return 1 if pattern is _DIGITS else -1
+        j = match_b.end()
+        if result := _compare_segments(
+            match_a.group(), match_b.group(), pattern is _DIGITS
+        ):
+            return result
+    if i >= len_a and j >= len_b:
+        return 0
+    # Whichever version still has characters left over wins
+    return -1 if i >= len_a else 1
+
+
+class Reldep(NamedTuple):
+    """
+    A simple `name [operator evr]` dependency.
+    `op` and `evr` are empty for unversioned dependencies.
+    """
+
+    name: str
+    op: str = ""
+    evr: str = ""
+
+
+def parse_reldep(string: str) -> Reldep | None:
+    """
+    Parse a simple dependency string.
+
+    Returns:
+        None for rich dependencies and other strings that aren't simple
+        dependencies
+    """
+    parts = string.split()
+    if len(parts) == 1 and not string.startswith("("):
+        return Reldep(parts[0])
+    if len(parts) == 3 and (op := _OPERATORS.get(parts[1])):
+        return Reldep(parts[0], op, parts[2])
+    return None
+
+
+def _split_evr(evr: str) -> tuple[int, str, str | None]:
+    epoch, _, version = evr.rpartition(":")
+    version, _, release = version.partition("-")
+    return int(epoch) if epoch.isdigit() else 0, version, release or None
+
+
+def evrcmp(a: str, b: str) -> int:
+    """
+    Compare two `[epoch:]version[-release]` strings like rpm does when
+    matching dependencies.
+    The release is ignored when one of the strings doesn't have one.
+    """
+    epoch_a, version_a, release_a = _split_evr(a)
+    epoch_b, version_b, release_b = _split_evr(b)
+    if epoch_a != epoch_b:
+        return 1 if epoch_a > epoch_b else -1
+    if result := rpmvercmp(version_a, version_b):
+        return result
+    if release_a is None or release_b is None:
+        return 0
+    return rpmvercmp(release_a, release_b)
+
+
+def overlaps(provide: Reldep, require: Reldep) -> bool:
+    """
+    Whether `provide` satisfies `require`.
+    The names are assumed to match.
+    Unversioned dependencies satisfy every version.
+    """
+    if not provide.op or not require.op:
+        return True
+    sense = evrcmp(provide.evr, require.evr)
+    if sense < 0:
+        return ">" in provide.op or "<" in require.op
+    if sense > 0:
+        return "<" in provide.op or ">" in require.op
+    return any(char in provide.op and char in require.op for char in "=<>")
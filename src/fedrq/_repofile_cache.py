@@ -0,0 +1,131 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+PRIVATE: Persistent cache of remote .repo files that revalidates with HTTP
+conditional requests
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from fedrq._config import ConfigError
+
+LOG = logging.getLogger(__name__)
+
+# Timeout for each request in seconds
+TIMEOUT = 30
+_CHUNK_SIZE = 64 * 1024
+
+
+def _write_atomic(path: Path, chunks: Iterable[bytes]) -> None:
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with open(fd, "wb") as fp:
+            for chunk in chunks:
+                fp.write(chunk)
+        os.chmod(name, 0o644)
+        os.replace(name, path)
+    except BaseException:
+        os.unlink(name)
+        raise
+
+
+class RepofileCache:
+    """
+    Cache of remote .repo files.
+
+    Entries younger than `ttl` seconds are used without contacting the server.
+    Older entries are revalidated with If-None-Match and If-Modified-Since.
+    When the server can't be reached, a stale entry is used instead.
+    """
+
+    def __init__(self, directory: Path, ttl: float, offline: bool = False) -> None:
+        """
+        Args:
+            directory:
+                Cache directory
+            ttl:
+                Number of seconds for which an entry is used without
+                revalidating it
+            offline:
+                Use cached entries regardless of their age
+                and never download files
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.repo", self.directory / f"{key}.json"
+
+    @staticmethod
+    def _read_meta(path: Path) -> dict[str, Any] | None:
+        try:
+            with path.open("r", encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url: str) -> Path:
+        """
+        Return the path to an up to date copy of `url`
+
+        Raises:
+            ConfigError: The file couldn't be downloaded and isn't cached
+        """
+        path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path) if path.exists() else None
+        if meta and (self.offline or time.time() - meta["fetched"] < self.ttl):
+            LOG.debug("Using cached %s", url)
+            return path
+        if self.offline:
+            raise ConfigError(f"{url} is not cached and cacheonly is enabled")
+
+        import requests
+
+        headers: dict[str, str] = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        LOG.info("Downloading %s", url)
+        try:
+            with requests.get(
+                url, headers=headers, stream=True, timeout=TIMEOUT
+            ) as req:
+                if meta and req.status_code == 304:
+                    LOG.debug("%s was not modified", url)
+                elif req.status_code == 200:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    _write_atomic(path, req.iter_content(_CHUNK_SIZE))
+                    meta = {
+                        "url": url,
+                        "etag": req.headers.get("ETag"),
+                        "last_modified": req.headers.get("Last-Modified"),
+                    }
+                else:
+                    raise ConfigError(
+                        f"Failed to download {url}: HTTP {req.status_code}"
+                    )
+        # Only fall back to the cached copy when the server can't be reached.
+        # HTTP errors like 404 mean that the cached copy is stale.
+        except requests.RequestException as exc:
+            if not meta:
+                raise ConfigError(f"Failed to download {url}") from exc
+            LOG.warning("Failed to download %s. Using the cached copy.", url)
+            LOG.debug("Handled error:", exc_info=exc)
+            return path
+        meta["fetched"] = time.time()
+        _write_atomic(meta_path, [json.dumps(meta).encode("utf-8")])
+        return path
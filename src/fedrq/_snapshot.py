@@ -0,0 +1,523 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+PRIVATE: On-disk package metadata snapshots that answer simple queries
+without loading a backend
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from contextlib import closing
+from fnmatch import fnmatchcase
+from glob import escape as glob_escape
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fedrq._reldeps import rpmvercmp
+from fedrq.backends.base import _resolve_specs_in_bulk
+from fedrq.config import get_smartcache_basedir
+
+if TYPE_CHECKING:
+    from fedrq.backends.base import PackageCompat, RepoqueryBase
+
+LOG = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3
+# dnf's default metadata_expire.
+# Used when the backend doesn't report a repository's metadata_expire.
+DEFAULT_METADATA_EXPIRE = 48 * 60 * 60
+# Reverse dependency types that can be queried from a snapshot
+RELDEP_KINDS = (
+    "requires",
+    "recommends",
+    "suggests",
+    "supplements",
+    "enhances",
+    "obsoletes",
+)
+# Formatters that only need the attributes stored in a snapshot
+SNAPSHOT_FORMATTERS = frozenset(
+    {
+        "plain",
+        "plainwithrepo",
+        "nevrr",
+        "na",
+        "nev",
+        "nevr",
+        "nevra",
+        "full_nevra",
+        "nv",
+        "source",
+        "src",
+        "name",
+        "arch",
+        "epoch",
+        "version",
+        "release",
+        "evr",
+        "reponame",
+        "repoid",
+        "sourcerpm",
+        "source_name",
+    }
+)
+# SQLite limits the number of parameters in a single statement
+_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE packages (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    release TEXT NOT NULL,
+    arch TEXT NOT NULL,
+    reponame TEXT NOT NULL,
+    sourcerpm TEXT
+);
+CREATE TABLE reldeps (
+    package INTEGER NOT NULL REFERENCES packages (id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+"""
+# Created after the data is inserted, which is faster than updating the indexes
+# for every row
+_INDEXES = """
+CREATE INDEX packages_name ON packages (name);
+CREATE INDEX packages_sourcerpm ON packages (sourcerpm);
+CREATE INDEX reldeps_kind_name ON reldeps (kind, name);
+"""
+_COLUMNS = "packages.name, epoch, version, release, arch, reponame, sourcerpm"
+
+
+@dataclasses.dataclass(frozen=True)
+class SnapshotPackage:
+    """
+    Lightweight package read from a snapshot.
+    It only implements the PackageCompat attributes used by
+    [`SNAPSHOT_FORMATTERS`][fedrq._snapshot.SNAPSHOT_FORMATTERS].
+    """
+
+    name: str
+    epoch: int
+    version: str
+    release: str
+    arch: str
+    reponame: str
+    sourcerpm: str | None
+
+    @property
+    def repoid(self) -> str:
+        return self.reponame
+
+    @property
+    def evr(self) -> str:
+        if self.epoch:
+            return f"{self.epoch}:{self.version}-{self.release}"
+        return f"{self.version}-{self.release}"
+
+    @property
+    def source_name(self) -> str | None:
+        if not self.sourcerpm:
+            return None
+        return self.sourcerpm.rsplit("-", 2)[0]
+
+    def evr_cmp(self, other: SnapshotPackage) -> int:
+        if self.epoch != other.epoch:
+            return 1 if self.epoch > other.epoch else -1
+        return rpmvercmp(self.version, other.version) or rpmvercmp(
+            self.release, other.release
+        )
+
+    def __lt__(self, other: SnapshotPackage) -> bool:
+        if self.name != other.name:
+            return self.name < other.name
+        if evrcmp := self.evr_cmp(other):
+            return evrcmp < 0
+        return self.arch < other.arch
+
+    def __gt__(self, other: SnapshotPackage) -> bool:
+        return other < self
+
+    def __str__(self) -> str:
+        return f"{self.name}-{self.evr}.{self.arch}"
+
+
+def _reldep_name(reldep: object) -> str:
+    string = str(reldep)
+    # Rich dependencies don't have a separate name
+    if string.startswith("("):
+        return string
+    return string.split(" ", 1)[0]
+
+
+def _chunks(items: Sequence[Any]) -> Iterator[Sequence[Any]]:
+    for idx in range(0, len(items), _CHUNK_SIZE):
+        yield items[idx : idx + _CHUNK_SIZE]
+
+
+def _sha256(path: str | Path) -> str | None:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _is_expired(repomd: str | Path, metadata_expire: int) -> bool:
+    """
+    Whether a repomd.xml is older than its repo's `metadata_expire`.
+    Negative values mean that the metadata never expires.
+    """
+    if metadata_expire < 0:
+        return False
+    try:
+        mtime = os.stat(repomd).st_mtime
+    except OSError:
+        return True
+    return time.time() - mtime > metadata_expire
+
+
+def get_snapshot_path(key: Mapping[str, Any]) -> Path:
+    """
+    Return the path of the snapshot for a sack key
+    """
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8"))
+    return (
+        get_smartcache_basedir()
+        / "snapshots"
+        / str(key["branch"])
+        / f"{digest.hexdigest()[:32]}.sqlite"
+    )
+
+
+def find_repomd(cachedir: str | Path, repoid: str) -> Path | None:
+    """
+    Find the cached repomd.xml for `repoid` in a dnf or dnf5 cachedir
+    """
+    candidates = [
+        path
+        for path in Path(cachedir).glob(f"{glob_escape(repoid)}-*/repodata/repomd.xml")
+        # Don't match the caches of other repos that start with the same name
+        if path.parent.parent.name.rsplit("-", 1)[0] == repoid
+    ]
+    return max(candidates, key=lambda path: path.stat().st_mtime, default=None)
+
+
+def write_snapshot(
+    key: Mapping[str, Any],
+    rq: RepoqueryBase,
+    repomds: Mapping[str, Path],
+    metadata_expire: Mapping[str, int] | None = None,
+) -> Path:
+    """
+    Write a snapshot of the packages in `rq`'s sack.
+
+    Args:
+        key:
+            Key that identifies the sack configuration
+        rq:
+            Repoquery object with a filled sack
+        repomds:
+            Mapping of the enabled repos to their cached repomd.xml files.
+            The snapshot is only used while these files are unchanged.
+        metadata_expire:
+            Mapping of repos to their `metadata_expire` in seconds.
+            The snapshot is not used once any repomd.xml is older than its
+            repo's `metadata_expire`.
+            `DEFAULT_METADATA_EXPIRE` is used for missing repos.
+    """
+    path = get_snapshot_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    try:
+        with closing(sqlite3.connect(tmp)) as connection:
+            connection.executescript(_SCHEMA)
+            _insert_packages(connection, rq.query())
+            connection.executescript(_INDEXES)
+            meta = {
+                "version": str(SNAPSHOT_VERSION),
+                "key": json.dumps(key, sort_keys=True),
+                "repos": json.dumps(
+                    [
+                        [
+                            repoid,
+                            str(repomd),
+                            _sha256(repomd),
+                            (metadata_expire or {}).get(
+                                repoid, DEFAULT_METADATA_EXPIRE
+                            ),
+                        ]
+                        for repoid, repomd in sorted(repomds.items())
+                    ]
+                ),
+                "base_arches": json.dumps(sorted(rq.base_arches)),
+                "basearch": rq.basearch,
+            }
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            connection.commit()
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def _insert_packages(
+    connection: sqlite3.Connection, packages: Iterable[PackageCompat]
+) -> None:
+    for idx, package in enumerate(packages):
+        connection.execute(
+            "INSERT INTO packages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                idx,
+                package.name,
+                package.epoch,
+                package.version,
+                package.release,
+                package.arch,
+                package.reponame,
+                package.sourcerpm or None,
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO reldeps VALUES (?, ?, ?)",
+            {
+                (idx, kind, _reldep_name(reldep))
+                for kind in RELDEP_KINDS
+                for reldep in getattr(package, kind)
+            },
+        )
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot written by `fedrq make-cache`.
+    Use [`Snapshot.open()`][fedrq._snapshot.Snapshot.open] to load one.
+    The query methods return lists of
+    [`SnapshotPackage`][fedrq._snapshot.SnapshotPackage]s and mirror the
+    semantics of the corresponding RepoqueryBase and PackageQuery methods.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        base_arches: Collection[str],
+        basearch: str,
+    ) -> None:
+        self._connection = connection
+        self.base_arches = frozenset(base_arches)
+        self.basearch = basearch
+        connection.create_function("fnmatch", 2, fnmatchcase, deterministic=True)
+
+    @classmethod
+    def open(cls, key: Mapping[str, Any], check_expire: bool = True) -> Snapshot | None:
+        """
+        Open the snapshot for a sack key.
+
+        Args:
+            key:
+                Key that identifies the sack configuration
+            check_expire:
+                Whether to reject the snapshot when a repository's cached
+                metadata has expired.
+                Loading the backend would refresh expired metadata,
+                but queries that are answered from a snapshot never do.
+
+        Returns:
+            None if the snapshot doesn't exist or if any of the repositories'
+            cached metadata has changed or expired since it was written
+        """
+        path = get_snapshot_path(key)
+        if not path.is_file():
+            return None
+        try:
+            connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+            connection.execute("PRAGMA mmap_size = 268435456")
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error as exc:
+            LOG.debug("Failed to open snapshot %s", path, exc_info=exc)
+            return None
+        if meta.get("version") != str(SNAPSHOT_VERSION) or meta.get(
+            "key"
+        ) != json.dumps(key, sort_keys=True):
+            LOG.debug("Snapshot %s is incompatible", path)
+            connection.close()
+            return None
+        for repoid, repomd, checksum, expire in json.loads(meta["repos"]):
+            if _sha256(repomd) != checksum:
+                LOG.debug("Snapshot %s is outdated: %s changed", path, repoid)
+                connection.close()
+                return None
+            if check_expire and _is_expired(repomd, expire):
+                LOG.debug("Snapshot %s is outdated: %s expired", path, repoid)
+                connection.close()
+                return None
+        LOG.debug("Using snapshot %s", path)
+        return cls(connection, json.loads(meta["base_arches"]), meta["basearch"])
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _select(self, query: str, params: Iterable[Any]) -> list[SnapshotPackage]:
+        return [
+            SnapshotPackage(*row) for row in self._connection.execute(query, params)
+        ]
+
+    def query_names(self, names: Sequence[str]) -> list[SnapshotPackage]:
+        """
+        Return the packages whose name is in `names`
+        """
+        packages: list[SnapshotPackage] = []
+        for chunk in _chunks(names):
+            packages.extend(
+                self._select(
+                    f"SELECT {_COLUMNS} FROM packages"
+                    f" WHERE name IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return packages
+
+    @staticmethod
+    def _glob_clause(column: str, patterns: Sequence[str]) -> str:
+        # SQLite's GLOB operator is only equivalent to fnmatch()
+        # for patterns without bracket expressions
+        return " OR ".join(
+            f"fnmatch({column}, ?)" if "[" in pattern else f"{column} GLOB ?"
+            for pattern in patterns
+        )
+
+    def query_globs(self, patterns: Sequence[str]) -> list[SnapshotPackage]:
+        """
+        Return the packages whose name matches any of the glob `patterns`
+        """
+        if not patterns:
+            return []
+        return self._select(
+            f"SELECT {_COLUMNS} FROM packages"
+            f" WHERE {self._glob_clause('name', patterns)}",
+            patterns,
+        )
+
+    def query_reldeps(
+        self, kind: str, patterns: Sequence[str]
+    ) -> list[SnapshotPackage]:
+        """
+        Return the packages with a `kind` (e.g., requires) dependency whose
+        name matches any of the glob `patterns`
+        """
+        if kind not in RELDEP_KINDS:
+            raise ValueError(f"Invalid reldep kind: {kind!r}")
+        if not patterns:
+            return []
+        return self._select(
+            f"SELECT DISTINCT {_COLUMNS} FROM packages"
+            " JOIN reldeps ON reldeps.package = packages.id"
+            f" WHERE kind = ? AND ({self._glob_clause('reldeps.name', patterns)})",
+            [kind, *patterns],
+        )
+
+    def get_subpackages(
+        self, packages: Iterable[SnapshotPackage]
+    ) -> list[SnapshotPackage]:
+        """
+        Return the binary packages built from the source `packages`
+        """
+        sourcerpms = [
+            f"{package.name}-{package.version}-{package.release}.src.rpm"
+            for package in packages
+        ]
+        result: list[SnapshotPackage] = []
+        for chunk in _chunks(sourcerpms):
+            result.extend(
+                self._select(
+                    f"SELECT {_COLUMNS} FROM packages"
+                    f" WHERE sourcerpm IN ({', '.join('?' * len(chunk))})"
+                    " AND arch != 'src'",
+                    chunk,
+                )
+            )
+        return result
+
+    def resolve_pkg_specs(
+        self, specs: Collection[str], with_src: bool = True
+    ) -> list[SnapshotPackage] | None:
+        """
+        Resolve package specs without Provides or file paths.
+
+        Returns:
+            None if any of the specs can only be resolved by the backend
+        """
+        resolved, fallback = _resolve_specs_in_bulk(
+            specs, self.query_names, self.query_globs, with_src
+        )
+        if fallback:
+            LOG.debug("Snapshot cannot resolve %s", fallback)
+            return None
+        return list(
+            dict.fromkeys(
+                package for packages in resolved.values() for package in packages
+            )
+        )
+
+    def arch_filter(
+        self,
+        packages: Iterable[SnapshotPackage],
+        arch: str | Iterable[str] | None = None,
+    ) -> list[SnapshotPackage]:
+        """
+        Filter packages by arch like RepoqueryBase.arch_filter()
+        """
+        if not arch:
+            return list(packages)
+        if arch == "notsrc":
+            arches: Collection[str] = {*self.base_arches, "noarch"}
+        elif arch == "arched":
+            arches = {self.basearch}
+        elif isinstance(arch, str):
+            arches = {arch}
+        else:
+            arches = set(arch)
+        return [package for package in packages if package.arch in arches]
+
+    @staticmethod
+    def filter_latest(
+        packages: Iterable[SnapshotPackage], latest: int | None
+    ) -> list[SnapshotPackage]:
+        """
+        Only keep the `latest` EVRs of each name.arch.
+        A negative `latest` excludes the latest EVRs instead.
+        """
+        packages = list(packages)
+        if not latest:
+            return packages
+        groups: defaultdict[tuple[str, str], dict[str, SnapshotPackage]] = defaultdict(
+            dict
+        )
+        for package in packages:
+            groups[package.name, package.arch].setdefault(package.evr, package)
+        keep: set[tuple[str, str, str]] = set()
+        key = functools.cmp_to_key(SnapshotPackage.evr_cmp)
+        for (name, arch), evrs in groups.items():
+            ordered = sorted(evrs.values(), key=key, reverse=True)
+            keep.update((name, arch, package.evr) for package in ordered[: abs(latest)])
+        return [
+            package
+            for package in packages
+            if ((package.name, package.arch, package.evr) in keep) == (latest > 0)
+        ]
@@ -19,6 +19,39 @@ def get_source_name(package: PackageCompat) -> str:
     return package.name if package.arch == "src" else t.cast(str, package.source_name)
 
 
+_PackageT = t.TypeVar("_PackageT", bound="PackageCompat")
+
+
+class _PackageSortKey:
+    """
+    Sort key that orders packages the same way as the Package objects'
+    comparison methods, but only falls back to the backend's (relatively
+    expensive) EVR comparison when two packages have the same name.
+    """
+
+    __slots__ = ("name", "evr", "arch", "package")
+
+    def __init__(self, package: PackageCompat) -> None:
+        self.name = package.name
+        self.evr = package.evr
+        self.arch = package.arch
+        self.package = package
+
+    def __lt__(self, other: _PackageSortKey) -> bool:
+        if self.name != other.name:
+            return self.name < other.name
+        if self.evr != other.evr:
+            return self.package < other.package
+        return self.arch < other.arch
+
+
+def sort_packages(packages: t.Iterable[_PackageT]) -> list[_PackageT]:
+    """
+    Sort packages by name, EVR, and arch
+    """
+    return sorted(packages, key=_PackageSortKey)
+
+
 def filter_latest(query: PackageQueryCompat, latest: t.Optional[int]) -> None:
     # logger.debug("filter_latest(query={}, latest={})".format(tuple(query), latest))
     if latest:
@@ -50,6 +83,19 @@ def exhaust_it(it: Iterator[t.Any]) -> None:
     deque(it, maxlen=0)
 
 
+def format_size(size: float) -> str:
+    """
+    Format a size in bytes for humans
+    """
+    unit = "B"
+    for larger_unit in ("KiB", "MiB", "GiB"):
+        if size < 1024:
+            break
+        size /= 1024
+        unit = larger_unit
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
 _EnumT = t.TypeVar("_EnumT", bound=Enum)
 
 
@@ -34,16 +34,39 @@ LOG = logging.getLogger(__name__)
 
 
 class Backends:
+    """
+    Lazily check which backends are available.
+    A backend is only probed the first time it's requested.
+    """
+
     def __init__(self) -> None:
-        self.available: dict[str, ModuleType] = {}
-        self.missing: dict[str, MissingBackendError] = {}
-        for name, mod in BACKENDS.items():
-            try:
-                mod.ensure_backend()
-            except MissingBackendError as exc:
-                self.missing[name] = exc
-            else:
-                self.available[name] = mod
+        self._available: dict[str, ModuleType] = {}
+        self._missing: dict[str, MissingBackendError] = {}
+
+    def probe(self, name: str) -> ModuleType | None:
+        """
+        Return the backend module if the backend is available or `None`
+        """
+        if name in self._available:
+            return self._available[name]
+        if name in self._missing:
+            return None
+        mod = BACKENDS[name]
+        try:
+            mod.ensure_backend()
+        except MissingBackendError as exc:
+            self._missing[name] = exc
+            return None
+        self._available[name] = mod
+        return mod
+
+    @property
+    def available(self) -> dict[str, ModuleType]:
+        return {name: mod for name in BACKENDS if (mod := self.probe(name))}
+
+    @property
+    def missing(self) -> dict[str, MissingBackendError]:
+        return {name: self._missing[name] for name in BACKENDS if not self.probe(name)}
 
 
 @functools.lru_cache
@@ -77,12 +100,13 @@ class _DefaultBackend:
         if default not in BACKENDS:
             raise MissingBackendError(f"Invalid backend {default!r}.")
         backends = _get_backends()
-        if backend := backends.available.get(default):
+        if backend := backends.probe(default):
             return backend.get_backend()
         if not fallback:
-            raise backends.missing[default]
-        if backend := next(iter(backends.available.values()), None):
-            return backend.get_backend()
+            raise backends._missing[default]
+        for name in BACKENDS:
+            if backend := backends.probe(name):
+                return backend.get_backend()
         _split = ", ".join(backends.missing)
         raise MissingBackendError(
             f"None of the following backends were available: {_split}"
@@ -5,10 +5,15 @@ from __future__ import annotations
 
 import abc
 import dataclasses
+import fnmatch
 import importlib.resources
 import logging
-from collections.abc import Callable, Collection, Iterable, Iterator
+import re
+import sys
+from collections import defaultdict
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
 from datetime import date
+from operator import attrgetter
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -22,6 +27,8 @@ from warnings import warn
 
 from typing_extensions import TypeVar
 
+from fedrq._reldeps import Reldep, overlaps, parse_reldep
+
 if TYPE_CHECKING:
     from _typeshed import StrPath
     from typing_extensions import Self, TypeAlias
@@ -68,6 +75,50 @@ else:
     # _RepoqueryT = TypeVar("_RepoqueryT", bound="RepoqueryBase")
 LOG = logging.getLogger("fedrq.backends")
 
+# Characters that make hawkey and libdnf5 treat a spec as a glob
+_GLOB_CHARS = frozenset("*?[")
+# Specs with these characters are file paths, Provides, or contain epochs.
+# They are never resolved by name in bulk.
+_NO_BULK_CHARS = frozenset("/ ()<>=,:\\")
+# Package names can't contain these characters, so specs with them can only
+# match file paths or Provides
+_DEP_CHARS = frozenset("/ ()<>=")
+# Package attributes that contain lists of Reldeps
+_RELDEP_ATTRS = frozenset(
+    {
+        "provides",
+        "requires",
+        "recommends",
+        "suggests",
+        "supplements",
+        "enhances",
+        "obsoletes",
+        "conflicts",
+    }
+)
+
+
+class FilelistsRequired(Exception):
+    """
+    Raised by a Repoquery object that was loaded without filelists
+    when it needs them to answer a query.
+    See `RepoqueryBase.filelists_on_demand`.
+    """
+
+
+def path_needs_filelists(path: str) -> bool:
+    """
+    Whether the filelists metadata is needed to match a file path or glob.
+    The primary metadata only lists files in /etc, files in `bin/` directories,
+    and /usr/lib/sendmail.
+    """
+    return (
+        path.startswith("/")
+        and not path.startswith("/etc/")
+        and "bin/" not in path
+        and path != "/usr/lib/sendmail"
+    )
+
 
 @runtime_checkable
 class PackageCompat(Protocol):  # pragma: no cover
@@ -309,7 +360,9 @@ class BaseMakerBase(metaclass=abc.ABCMeta):
         """
         Fill the sack and returns the Base object.
         The repository configuration shouldn't be manipulated after this.
-        'from_cache' isn't currently supported by the libdnf5 backend.
+        When 'from_cache' is True, metadata is only loaded from the cache
+        without any network access.
+        Repositories that have not been cached raise the backend's RepoError.
         """
         ...
 
@@ -355,6 +408,23 @@ class BaseMakerBase(metaclass=abc.ABCMeta):
         Set configuration options. Must be called before reading repos.
         """
 
+    def get(self, key: str) -> Any:  # noqa: ARG002
+        """
+        Get the value of a configuration option
+        """
+        # Can be overriden by subclasses. Purposely isn't an @abstractmethod.
+        raise NotImplementedError
+
+    def get_repo_option(self, repoid: str, key: str) -> Any:  # noqa: ARG002
+        """
+        Get the value of a repository's configuration option
+
+        Raises:
+            KeyError: `repoid` doesn't exist
+        """
+        # Can be overriden by subclasses. Purposely isn't an @abstractmethod.
+        raise NotImplementedError
+
     @abc.abstractmethod
     def set_var(self, key: str, value: Any) -> None:
         """
@@ -471,6 +541,245 @@ class BaseMakerBase(metaclass=abc.ABCMeta):
         """
 
 
+class SourceIndex(Generic[_PackageT]):
+    """
+    Bidirectional index of source package NEVRs (`name-version-release`)
+    and the binary packages that were built from them.
+    Use the Repoquery's
+    [`get_source_index()`][fedrq.backends.base.RepoqueryBase.get_source_index]
+    instead of instantiating this directly.
+    """
+
+    def __init__(self, packages: Iterable[_PackageT]) -> None:
+        self._binaries: defaultdict[str, list[_PackageT]] = defaultdict(list)
+        self._sources: dict[_PackageT, str] = {}
+        for package in packages:
+            if not (sourcerpm := package.sourcerpm):
+                continue
+            # Strip .src.rpm
+            nevr = sourcerpm.rsplit(".", 2)[0]
+            self._binaries[nevr].append(package)
+            self._sources[package] = nevr
+
+    @staticmethod
+    def get_nevr(package: PackageCompat) -> str:
+        """
+        Return the `name-version-release` of a source package
+        """
+        return f"{package.name}-{package.version}-{package.release}"
+
+    def get_binaries(self, nevr: str) -> list[_PackageT]:
+        """
+        Return the binary packages built from the source package `nevr`
+        """
+        return self._binaries.get(nevr, [])
+
+    def get_source(self, package: _PackageT) -> str | None:
+        """
+        Return the NEVR of the source package that `package` was built from.
+        Source packages return their own NEVR.
+        """
+        if package.arch == "src":
+            return self.get_nevr(package)
+        return self._sources.get(package)
+
+    def get_source_name(self, package: _PackageT) -> str | None:
+        """
+        Return the name of the source package that `package` was built from
+        """
+        if nevr := self.get_source(package):
+            return nevr.rsplit("-", 2)[0]
+        return None
+
+
+def _split_dep_specs(specs: Iterable[str]) -> tuple[list[str], list[str]]:
+    """
+    Split out the specs that can't match any NEVRA form, i.e., file paths and
+    simple (versioned) Provides.
+    These can be resolved with one `provides` and one `file` query instead of
+    individually.
+    Rich dependencies and specs with escapes are left with the other specs.
+
+    Returns:
+        A list of file paths and Provides and a list of the other specs
+    """
+    deps: list[str] = []
+    other: list[str] = []
+    for spec in dict.fromkeys(specs):
+        if (
+            _DEP_CHARS.intersection(spec)
+            and "\\" not in spec
+            and (spec.startswith("/") or parse_reldep(spec))
+        ):
+            deps.append(spec)
+        else:
+            other.append(spec)
+    return deps, other
+
+
+# (name, version, release, arch) with None as a wildcard
+_NevraForm = tuple[str, "str | None", "str | None", "str | None"]
+
+
+def _nevra_forms(spec: str) -> list[_NevraForm]:
+    """
+    Return the NEVRA, NA, and NAME forms that `spec` can be parsed as,
+    in the order that they're tried
+    """
+    forms: list[_NevraForm] = []
+    nevr, dot, arch = spec.rpartition(".")
+    if dot and nevr and arch and "-" not in arch:
+        parts = nevr.rsplit("-", 2)
+        if len(parts) == 3 and all(parts):
+            forms.append((parts[0], parts[1], parts[2], arch))
+        forms.append((nevr, None, None, arch))
+    forms.append((spec, None, None, None))
+    return forms
+
+
+def _resolve_specs_in_bulk(
+    specs: Iterable[str],
+    query_names: Callable[[list[str]], Iterable[_PackageT]],
+    query_globs: Callable[[list[str]], Iterable[_PackageT]],
+    with_src: bool = True,
+) -> tuple[dict[str, list[_PackageT]], list[str]]:
+    """
+    Resolve the specs that can be matched with name queries in bulk.
+
+    The default NEVRA forms are tried in the same order as
+    `RepoqueryBase.resolve_pkg_specs()` (NEVRA, NA, NAME, NEVR, NEV),
+    but the candidate packages for all plain names, NAME.ARCH, and
+    NAME-VERSION-RELEASE.ARCH specs are fetched with one `query_names()`
+    call and name globs are fetched with one `query_globs()` call.
+    A spec is only considered resolved when one of the NEVRA, NA, or NAME
+    forms matches, as the later forms can only apply when these don't.
+
+    Returns:
+        A mapping of resolved specs to the packages that they matched and
+        a list of specs that need to be resolved individually.
+    """
+    plans: dict[str, list[_NevraForm]] = {}
+    globs: dict[str, Callable[[str], Any]] = {}
+    fallback: list[str] = []
+    for spec in dict.fromkeys(specs):
+        is_glob = bool(_GLOB_CHARS.intersection(spec))
+        # Globs with a "." could also be NEVRA or NA globs
+        if not spec or _NO_BULK_CHARS.intersection(spec) or (is_glob and "." in spec):
+            fallback.append(spec)
+        elif is_glob:
+            globs[spec] = re.compile(fnmatch.translate(spec)).match
+        else:
+            plans[spec] = _nevra_forms(spec)
+
+    resolved: dict[str, list[_PackageT]] = {}
+    if plans:
+        names = {form[0] for forms in plans.values() for form in forms}
+        by_name = _group_by_name(query_names(list(names)), with_src)
+        for spec, forms in plans.items():
+            if matches := _match_nevra_forms(forms, by_name):
+                resolved[spec] = matches
+            else:
+                fallback.append(spec)
+
+    if globs:
+        glob_names = _group_by_name(query_globs(list(globs)), with_src)
+        for spec, match in globs.items():
+            if matches := [
+                package
+                for name, packages in glob_names.items()
+                if match(name)
+                for package in packages
+            ]:
+                resolved[spec] = matches
+            else:
+                fallback.append(spec)
+    return resolved, fallback
+
+
+def _match_nevra_forms(
+    forms: Iterable[_NevraForm], by_name: Mapping[str, list[_PackageT]]
+) -> list[_PackageT]:
+    """
+    Return the packages that match the first of `forms` that matches any
+    """
+    for name, version, release, arch in forms:
+        if matches := [
+            package
+            for package in by_name.get(name, ())
+            if (version is None or package.version == version)
+            and (release is None or package.release == release)
+            and (arch is None or package.arch == arch)
+        ]:
+            return matches
+    return []
+
+
+def _group_by_name(
+    packages: Iterable[_PackageT], with_src: bool
+) -> dict[str, list[_PackageT]]:
+    by_name: defaultdict[str, list[_PackageT]] = defaultdict(list)
+    for package in packages:
+        if with_src or package.arch != "src":
+            by_name[package.name].append(package)
+    return by_name
+
+
+def _attribute_provides(
+    packages: Iterable[_PackageT],
+    reldeps: Mapping[str, Reldep],
+    result: Mapping[str, list[_PackageT]],
+    glob: bool = True,
+) -> None:
+    """
+    Add each package to the `result` lists of the `reldeps` that it provides
+    """
+    provides: defaultdict[str, list[tuple[Reldep, _PackageT]]] = defaultdict(list)
+    for package in packages:
+        for provide in package.provides:
+            if reldep := parse_reldep(str(provide)):
+                provides[reldep.name].append((reldep, package))
+    for dep, require in reldeps.items():
+        if glob and _GLOB_CHARS.intersection(require.name):
+            match = re.compile(fnmatch.translate(require.name)).match
+            candidates = [
+                item
+                for name, items in provides.items()
+                if match(name)
+                for item in items
+            ]
+        else:
+            candidates = provides.get(require.name, [])
+        result[dep].extend(
+            dict.fromkeys(
+                package for provide, package in candidates if overlaps(provide, require)
+            )
+        )
+
+
+def _attribute_files(
+    packages: Iterable[_PackageT],
+    paths: Collection[str],
+    result: Mapping[str, list[_PackageT]],
+    glob: bool = True,
+) -> None:
+    """
+    Add each package to the `result` lists of the `paths` that match its files
+    """
+    globs = [
+        (path, re.compile(fnmatch.translate(path)).match)
+        for path in paths
+        if glob and _GLOB_CHARS.intersection(path)
+    ]
+    exact = set(paths).difference(path for path, _ in globs)
+    for package in packages:
+        files = list(package.files)
+        for path in exact.intersection(files):
+            result[path].append(package)
+        for path, match in globs:
+            if any(map(match, files)):
+                result[path].append(package)
+
+
 class NEVRAFormsCompat(Protocol):
     NEVRA: int
     NEVR: int
@@ -488,6 +797,19 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
     directly annotating with this type.
     """
 
+    # Minimum number of source packages passed to get_subpackages() for which
+    # the source index is built instead of filtering by sourcerpm
+    _SOURCE_INDEX_THRESHOLD = 25
+    _source_index: SourceIndex | None = None
+    filelists_on_demand: bool = False
+    """
+    Set when the sack was loaded without filelists.
+    Queries that need the filelists raise
+    [`FilelistsRequired`][fedrq.backends.base.FilelistsRequired]
+    instead of silently returning incomplete results,
+    so the caller can reload the sack with filelists.
+    """
+
     def __init__(self, base) -> None:
         self.base = base
 
@@ -498,6 +820,13 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         Return a set of the system's arch and basearch.
         """
 
+    @property
+    def basearch(self) -> str:
+        """
+        Return the system's basearch
+        """
+        return self.base.conf.basearch
+
     def _get_resolve_options(
         self,
         resolve: bool,
@@ -545,6 +874,171 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
                 Whether to consider `.src` packages when resolving `specs`
         """
 
+    def _bulk_resolve_specs(
+        self: RepoqueryBase[_PackageT, _PackageQueryT],
+        specs: Iterable[str],
+        with_src: bool = True,
+    ) -> tuple[dict[str, list[_PackageT]], list[str], list[str]]:
+        """
+        Resolve the specs that can be matched with name queries in bulk.
+        See `_resolve_specs_in_bulk()`.
+
+        Returns:
+            A mapping of the specs that were resolved by name to their
+            packages, a list of file paths and Provides
+            (see `_split_dep_specs()`), and a list of specs that need to be
+            resolved individually
+        """
+        deps, specs = _split_dep_specs(specs)
+        resolved, fallback = _resolve_specs_in_bulk(
+            specs,
+            lambda names: self.query(name=names),
+            lambda globs: self.query(name__glob=globs),
+            with_src,
+        )
+        return resolved, deps, fallback
+
+    def _dep_glob_queries(
+        self, deps: Collection[str], with_provides: bool, with_filenames: bool
+    ) -> Iterator[_PackageQueryT_co]:
+        """
+        Yield one query for the Provides globs and one for the file path
+        globs in `deps`.
+        The other `deps` are already matched by the `provides` and `file`
+        queries that `resolve_pkg_specs()` runs for all specs.
+        """
+        globs = [dep for dep in deps if _GLOB_CHARS.intersection(dep)]
+        if globs and with_provides:
+            yield self.query(provides__glob=globs)
+        if with_filenames and (paths := [dep for dep in globs if dep[0] == "/"]):
+            yield self.query(file__glob=paths)
+
+    def resolve_deps_mapping(
+        self: RepoqueryBase[_PackageT, _PackageQueryT],
+        deps: Collection[str],
+        with_provides: bool = True,
+        with_filenames: bool = True,
+        *,
+        glob: bool = True,
+    ) -> dict[str, list[_PackageT]]:
+        """
+        Map simple dependencies (e.g., `foo`, `foo >= 1`, or `/usr/bin/foo`)
+        to the packages that provide them.
+        All of the Provides and all of the file paths are each matched with a
+        single query and then attributed to the individual `deps`.
+        Globs are supported unless `glob` is False.
+
+        Args:
+            deps:
+                Dependency strings. Rich dependencies are not supported.
+            with_provides:
+                Match the packages' Provides
+            with_filenames:
+                Match file paths against the packages' files
+            glob:
+                Whether to treat `deps` with glob characters as globs
+        """
+        result: dict[str, list[_PackageT]] = {dep: [] for dep in deps}
+        paths = [dep for dep in result if dep.startswith("/")]
+        reldeps = {
+            dep: reldep
+            for dep in result
+            if not dep.startswith("/") and (reldep := parse_reldep(dep))
+        }
+        if reldeps and with_provides:
+            packages = self._query_patterns("provides", reldeps, glob)
+            _attribute_provides(packages, reldeps, result, glob)
+        if paths and (with_provides or with_filenames):
+            # Files in the primary metadata are also matched as Provides
+            packages = self._query_patterns(
+                "file" if with_filenames else "provides", paths, glob
+            )
+            _attribute_files(packages, paths, result, glob)
+        return result
+
+    def _query_patterns(
+        self: RepoqueryBase[_PackageT, _PackageQueryT],
+        key: str,
+        patterns: Iterable[str],
+        glob: bool = True,
+    ) -> list[_PackageT]:
+        """
+        Return the packages that match any of `patterns` with one query for
+        the exact patterns and one query for the globs
+        """
+        exact: list[str] = []
+        globs: list[str] = []
+        for pattern in patterns:
+            if glob and _GLOB_CHARS.intersection(pattern):
+                globs.append(pattern)
+            else:
+                exact.append(pattern)
+        packages: dict[_PackageT, None] = {}
+        if exact:
+            packages.update(dict.fromkeys(self.query(**{key: exact})))
+        if globs:
+            packages.update(dict.fromkeys(self.query(**{f"{key}__glob": globs})))
+        return list(packages)
+
+    def resolve_pkg_specs_mapping(
+        self,
+        specs: Collection[str],
+        resolve: bool = False,
+        latest: int | None = None,
+        with_src: bool = True,
+        *,
+        with_filenames: bool | None = None,
+        with_provides: bool | None = None,
+        resolve_provides: bool | None = None,
+        nevra_forms: list[int] | None = None,
+    ) -> dict[str, _PackageQueryT_co]:
+        """
+        Resolve pkg specs like
+        [`resolve_pkg_specs()`][fedrq.backends.base.RepoqueryBase.resolve_pkg_specs]
+        but return a mapping of each spec to the packages that it matched.
+        The arguments are the same.
+        """
+        opts = self._get_resolve_options(
+            resolve, with_filenames, with_provides, resolve_provides
+        )
+        if nevra_forms:
+            bulk: dict[str, list[Any]] = {}
+            deps: list[str] = []
+        else:
+            bulk, deps, _ = self._bulk_resolve_specs(specs, with_src)
+        if bulk and opts["with_provides"]:
+            # Attribute the Provides matches to the specs that are otherwise
+            # resolved in bulk. These specs are never file paths, so the
+            # with_filenames matches don't need to be considered.
+            for package in self.query(provides=list(bulk)):
+                for reldep in package.provides:
+                    name = str(reldep).split(" ", 1)[0]
+                    if name in bulk:
+                        bulk[name].append(package)
+        # File paths and Provides can't match any NEVRA form
+        bulk.update(
+            self.resolve_deps_mapping(
+                deps, opts["with_provides"], opts["with_filenames"]
+            )
+        )
+        result: dict[str, _PackageQueryT_co] = {}
+        for spec in dict.fromkeys(specs):
+            if spec in bulk:
+                query = self.query(pkg=bulk[spec], latest=latest)
+            else:
+                query = self.resolve_pkg_specs(
+                    [spec],
+                    resolve,
+                    latest,
+                    with_src,
+                    with_filenames=with_filenames,
+                    with_provides=with_provides,
+                    resolve_provides=resolve_provides,
+                    nevra_forms=nevra_forms,
+                )
+            result[spec] = query
+        return result
+
     def arch_filterm(
         self: RepoqueryBase[PackageCompat, _PackageQueryT],
         query: _PackageQueryT,
@@ -567,7 +1061,7 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         if arch == "notsrc":
             return query.filterm(arch=(*self.base_arches, "noarch"))  # type: ignore
         elif arch == "arched":
-            return query.filterm(arch=self.base.conf.basearch)
+            return query.filterm(arch=self.basearch)
         else:
             return query.filterm(arch=arch)
 
@@ -593,7 +1087,7 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         if arch == "notsrc":
             return query.filter(arch=(*self.base_arches, "noarch"))  # type: ignore
         if arch == "arched":
-            return query.filter(arch=list(self.base_arches))
+            return query.filter(arch=self.basearch)
         return query.filter(arch=arch)
 
     @abc.abstractmethod
@@ -615,11 +1109,29 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         """
         if kwargs.get("latest") is None:
             kwargs.pop("latest", None)
+        if self.filelists_on_demand:
+            for key, value in kwargs.items():
+                if key == "file" or key.startswith("file__"):
+                    if not isinstance(value, str):
+                        kwargs[key] = value = list(value)
+                    self.require_filelists([value] if isinstance(value, str) else value)
         query = self._query()
         query.filterm(**kwargs)
         self.arch_filterm(query, arch)
         return query
 
+    def require_filelists(self, paths: Iterable[str] | None = None) -> None:
+        """
+        Raise [`FilelistsRequired`][fedrq.backends.base.FilelistsRequired]
+        if the sack was loaded without filelists and they're needed to match
+        `paths`.
+        When `paths` is None, the filelists are always needed.
+        """
+        if not self.filelists_on_demand:
+            return
+        if paths is None or any(map(path_needs_filelists, paths)):
+            raise FilelistsRequired
+
     def get_package(
         self,
         name: str,
@@ -655,10 +1167,19 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         if val := kwargs.pop("sourcerpm", None):
             warn(f"Removing invalid kwarg: 'sourcerpm={val}")
 
+        packages = list(packages)
         for package in packages:
             if package.arch != "src":
                 raise ValueError(f"{package} must be a source package.")
 
+        index = self.get_source_index(len(packages) >= self._SOURCE_INDEX_THRESHOLD)
+        if index:
+            binaries = [
+                binary
+                for package in packages
+                for binary in index.get_binaries(index.get_nevr(package))
+            ]
+            return self.query(pkg=binaries, **kwargs)
         sourcerpms = [
             f"{package.name}-{package.version}-{package.release}.src.rpm"
             for package in packages
@@ -666,6 +1187,188 @@ class RepoqueryBase(Generic[_PackageT_co, _PackageQueryT_co], metaclass=abc.ABCM
         query = self.query(sourcerpm=sourcerpms, **kwargs)
         return query
 
+    def get_source_index(
+        self: RepoqueryBase[_PackageT, _PackageQueryT], build: bool = True
+    ) -> SourceIndex[_PackageT] | None:
+        """
+        Return the [`SourceIndex`][fedrq.backends.base.SourceIndex] of all
+        binary packages in the sack.
+        It's built on first use with one pass over the sack and then cached.
+
+        Args:
+            build:
+                Whether to build the index if it doesn't exist yet.
+                When False and the index hasn't been built, None is returned.
+        """
+        if self._source_index is None and build:
+            self._source_index = SourceIndex(self.query(arch__neq="src"))
+        return self._source_index
+
+    def fetch_columns(
+        self, query: Iterable[PackageCompat], attrs: Iterable[str]
+    ) -> dict[str, list[Any]]:
+        """
+        Extract multiple attributes from every package in `query` in a single
+        pass.
+
+        Args:
+            query:
+                A `PackageQueryCompat` or another iterable of packages
+            attrs:
+                Names of `PackageCompat` attributes
+
+        Returns:
+            A mapping of each attribute to a list with one value per package,
+            in the order in which `query` yields them.
+            Reldep attributes (e.g., `requires`) are lists of interned strings
+            and `files` is a list of strings.
+        """
+        columns: dict[str, list[Any]] = {attr: [] for attr in attrs}
+        getters = [
+            (column.append, self._column_getter(attr))
+            for attr, column in columns.items()
+        ]
+        for package in query:
+            for append, getter in getters:
+                append(getter(package))
+        return columns
+
+    def _column_getter(self, attr: str) -> Callable[[Any], Any]:
+        """
+        Return a function that extracts `attr` from a package for
+        `fetch_columns()`.
+        Backends can override this to bypass the `PackageCompat` properties.
+        """
+        if attr in _RELDEP_ATTRS:
+
+            def getter(package: PackageCompat) -> list[str]:
+                return [sys.intern(str(reldep)) for reldep in getattr(package, attr)]
+
+            return getter
+        if attr == "files":
+            return lambda package: list(package.files)
+        return attrgetter(attr)
+
+    def rdeps_closure(
+        self: RepoqueryBase[_PackageT, _PackageQueryT],
+        packages: Iterable[_PackageT],
+        operator: str = "requires",
+        depth: int | None = None,
+        *,
+        latest: int | None = None,
+        exclude: Iterable[_PackageT] = (),
+    ) -> dict[_PackageT, int]:
+        """
+        Find the transitive reverse dependencies of `packages`.
+
+        The closure is expanded breadth-first with one
+        `query({operator}=frontier)` call per level.
+        Each package is only expanded once, the first time it's reached.
+        Source packages (i.e., packages that BuildRequire the closure) are
+        included but not expanded, as they don't provide anything.
+
+        Args:
+            packages:
+                Binary packages whose reverse dependencies to find.
+                These are not included in the result.
+            operator:
+                Dependency type to follow (`requires`, `recommends`, etc.)
+            depth:
+                Maximum number of levels to expand. `None` expands until
+                no new packages are found.
+            latest:
+                Limit each level's packages with the same name and arch.
+            exclude:
+                Packages to never include or expand
+
+        Returns:
+            A mapping of packages to the depth at which they were first reached.
+            Direct reverse dependencies have a depth of 1.
+        """
+        seen: set[_PackageT] = set(packages)
+        seen.update(exclude)
+        result: dict[_PackageT, int] = {}
+        frontier = self.query(pkg=list(packages), arch__neq="src")
+        level = 0
+        while frontier and (depth is None or level < depth):
+            level += 1
+            rdeps = self.query(**{operator: frontier}, latest=latest)
+            new = [package for package in rdeps if package not in seen]
+            if not new:
+                break
+            seen.update(new)
+            for package in new:
+                result[package] = level
+            frontier = self.query(pkg=new, arch__neq="src")
+        return result
+
+    def requires_closure(
+        self: RepoqueryBase[_PackageT, _PackageQueryT],
+        packages: Iterable[_PackageT],
+        depth: int | None = None,
+        *,
+        weak: bool = False,
+        latest: int | None = None,
+    ) -> dict[_PackageT, int]:
+        """
+        Find the packages that provide the transitive dependencies of
+        `packages`.
+        When `packages` contains source packages, their BuildRequires are
+        resolved at the first level.
+
+        The closure is expanded breadth-first.
+        All of a level's not yet resolved dependencies are resolved with one
+        `query(provides=...)` call and, for file dependencies, one
+        `query(file=...)` call.
+        When multiple packages provide the same dependency, all of them are
+        included.
+        Only binary packages for the current arch and noarch packages are
+        considered as providers.
+
+        Args:
+            packages:
+                Packages whose dependencies to find.
+                These are not included in the result.
+            depth:
+                Maximum number of levels to expand. `None` expands until
+                no new packages are found.
+            weak:
+                Whether to also follow Recommends
+            latest:
+                Limit each level's providers with the same name and arch.
+
+        Returns:
+            A mapping of packages to the depth at which they were first reached.
+            Direct dependencies have a depth of 1.
+        """
+        attrs = ("requires", "recommends") if weak else ("requires",)
+        frontier = list(packages)
+        seen: set[_PackageT] = set(frontier)
+        resolved: set[str] = set()
+        result: dict[_PackageT, int] = {}
+        level = 0
+        while frontier and (depth is None or level < depth):
+            level += 1
+            reldeps: set[str] = set()
+            for package in frontier:
+                for attr in attrs:
+                    reldeps.update(map(str, getattr(package, attr)))
+            reldeps -= resolved
+            resolved |= reldeps
+            specs = [reldep for reldep in reldeps if not reldep.startswith("rpmlib(")]
+            if not specs:
+                break
+            providers = self.query(provides=specs, arch="notsrc", latest=latest)
+            if paths := [spec for spec in specs if spec.startswith("/")]:
+                providers = providers.union(
+                    self.query(file=paths, arch="notsrc", latest=latest)
+                )
+            frontier = [package for package in providers if package not in seen]
+            seen.update(frontier)
+            for package in frontier:
+                result[package] = level
+        return result
+
     @property
     @abc.abstractmethod
     def backend(self) -> BackendMod:
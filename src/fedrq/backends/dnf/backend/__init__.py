@@ -83,6 +83,12 @@ class BaseMaker(BaseMakerBase):
     def set(self, key: str, value: t.Any) -> None:
         setattr(self.conf, key, value)
 
+    def get(self, key: str) -> t.Any:
+        return getattr(self.conf, key)
+
+    def get_repo_option(self, repoid: str, key: str) -> t.Any:
+        return getattr(self._repos[repoid], key)
+
     def set_var(self, key: str, value: t.Any) -> None:
         if key not in self.base.conf.substitutions:
             raise KeyError(f"{key} is not a valid substitution")
@@ -262,8 +268,21 @@ class Repoquery(RepoqueryBase[PackageCompat, PackageQueryCompat[PackageCompat]])
         if nevra_forms:
             opts["forms"] = nevra_forms
 
-        query = self.query(empty=True)
-        for p in specs:
+        if nevra_forms:
+            query = self.query(empty=True)
+            fallback = list(specs)
+        else:
+            # Resolve plain names, globs, and NEVRAs with as few queries as
+            # possible and only fall back to dnf.subject for the rest.
+            # File paths and Provides can't match any NEVRA form, so they're
+            # only matched by the provides and file queries below.
+            resolved, deps, fallback = self._bulk_resolve_specs(specs, with_src)
+            query = self.query(pkg=[pkg for pkgs in resolved.values() for pkg in pkgs])
+            for dep_query in self._dep_glob_queries(
+                deps, opts["with_provides"], opts["with_filenames"]
+            ):
+                query = query.union(dep_query)
+        for p in fallback:
             subject = dnf.subject.Subject(p).get_best_query(self.base.sack, **opts)
             query = query.union(subject)
         if opts["with_provides"]:
@@ -18,6 +18,7 @@ from collections.abc import Collection, Iterable, Iterator
 from datetime import datetime as DT
 from datetime import timezone as TZ
 from enum import Enum
+from operator import methodcaller
 from os.path import join as path_join
 from urllib.parse import urlparse
 
@@ -277,6 +278,14 @@ class BaseMaker(BaseMakerBase):
         LOG.debug("Setting config option %s=%r", key, value)
         self._set(self.conf, key, value)
 
+    def get(self, key: str) -> t.Any:
+        return self._get_option(self.conf, key).get_value()
+
+    def get_repo_option(self, repoid: str, key: str) -> t.Any:
+        if not (repo := self._get_repo(repoid)):
+            raise KeyError(repoid)
+        return self._get_option(repo.get_config(), key).get_value()
+
     def set_var(self, key: str, value: t.Any) -> None:
         self.vars.set(key, value)
 
@@ -300,10 +309,13 @@ class BaseMaker(BaseMakerBase):
         Fill the sack and returns the Base object.
         The repository configuration shouldn't be manipulated after this.
 
+        When `from_cache` is True, metadata is only loaded from the cache
+        and repositories that have not been cached raise an error.
+
         Note that the `_cachedir` arg is private and subject to removal.
         """
         if from_cache:
-            raise NotImplementedError
+            self.set("cacheonly", "all")
         try:
             self.rs.load_repos(  # pyright: ignore[reportAttributeAccessIssue]
                 libdnf5.repo.Repo.Type_SYSTEM
@@ -765,21 +777,6 @@ class PackageQuery(libdnf5.rpm.PackageQuery, PackageQueryCompat[Package]):
     ) -> None:
         if not kwargs:
             return None
-        filter_mapping = {
-            "latest": "latest_evr",
-            "latest_per_arch": "latest_evr",
-            "reponame": "repo_id",
-        }
-        comp_mapping: dict[str, int] = {
-            "eq": libdnf5.common.QueryCmp_EQ,
-            "neq": libdnf5.common.QueryCmp_NEQ,
-            "glob": libdnf5.common.QueryCmp_GLOB,
-            "contains": libdnf5.common.QueryCmp_CONTAINS,
-            "gt": libdnf5.common.QueryCmp_GT,
-            "gte": libdnf5.common.QueryCmp_GTE,
-            "lt": libdnf5.common.QueryCmp_LT,
-            "lte": libdnf5.common.QueryCmp_LTE,
-        }
         invalid = []
         for key in kwargs:
             if key not in _QueryFilterKwargs.__annotations__:
@@ -791,16 +788,18 @@ class PackageQuery(libdnf5.rpm.PackageQuery, PackageQueryCompat[Package]):
             return None
         if kwargs.pop("downgrades", None):
             self.filter_downgrades()
+        plans = _get_filter_plans(type(self))
         for key, value in kwargs.items():
-            split = key.rsplit("__", 1)
-            name = "filter_" + filter_mapping.get(split[0], split[0])
-            # TODO: Remove _convert_value once we drop support for libdnf5
+            plan = plans[key]
+            # TODO: Remove list_types once we drop support for libdnf5
             # 5.2.0 and can rely on support for passing plain strings to query
             # functions.
-            args = [_convert_value(key, value)]
-            if len(split) == 2:
-                args.append(comp_mapping[split[1]])
-            getattr(self, name)(*args)
+            if plan.list_types and isinstance(value, plan.list_types):
+                value = [value]
+            if plan.comp is None:
+                plan.method(self, value)
+            else:
+                plan.method(self, value, plan.comp)
 
     def filterm(  # type: ignore[override]
         self,
@@ -882,35 +881,83 @@ class PackageQuery(libdnf5.rpm.PackageQuery, PackageQueryCompat[Package]):
         return f"{self.__class__.__name__}<{tuple(self)}>"
 
 
-_ValT = t.TypeVar("_ValT")
+_FILTER_NAME_MAPPING = {
+    "latest": "latest_evr",
+    "latest_per_arch": "latest_evr",
+    "reponame": "repo_id",
+}
+_COMP_MAPPING: dict[str, int] = {
+    "eq": libdnf5.common.QueryCmp_EQ,
+    "neq": libdnf5.common.QueryCmp_NEQ,
+    "glob": libdnf5.common.QueryCmp_GLOB,
+    "contains": libdnf5.common.QueryCmp_CONTAINS,
+    "gt": libdnf5.common.QueryCmp_GT,
+    "gte": libdnf5.common.QueryCmp_GTE,
+    "lt": libdnf5.common.QueryCmp_LT,
+    "lte": libdnf5.common.QueryCmp_LTE,
+}
+
+
+class _FilterPlan(t.NamedTuple):
+    """
+    How PackageQuery._filter() applies a single keyword argument
+    """
+
+    method: t.Callable[..., t.Any]
+    """Unbound `filter_*` method"""
+    comp: t.Optional[int]
+    """`QueryCmp_*` constant or None to use the method's default"""
+    list_types: tuple[type, ...]
+    """Types of plain values that libdnf5 requires to be wrapped in a list"""
 
 
-def _convert_value(key: str, value: _ValT) -> t.Union[list[_ValT], _ValT]:
+def _get_list_types(annotation: t.Any) -> tuple[type, ...]:
     """
-    Overkill code to normalize single strings or ints that libdnf5 requires to
+    Overkill code to determine which single strings or ints libdnf5 requires to
     be a list based on type annotations.
     """
-    d_annotations = t.get_type_hints(_QueryFilterKwargs)
-    annotation = d_annotations[key]
-    if t.get_origin(annotation) is not t.Union or not any(
-        isinstance(value, typ) for typ in CONVERT_TO_LIST
-    ):
-        return value
-    union_types = t.get_args(annotation)
-    pairs = [(t.get_origin(arg), t.get_args(arg)) for arg in union_types]
-    for origin, sargs in pairs:
-        assert isinstance(origin, type)
-        if not issubclass(origin, list):
+    if t.get_origin(annotation) is not t.Union:
+        return ()
+    types: list[type] = []
+    for arg in t.get_args(annotation):
+        origin = t.get_origin(arg)
+        if not isinstance(origin, type) or not issubclass(origin, list):
             continue
-        if t.get_origin(sargs[0]) is t.Union:
-            pairs = [(t.get_origin(arg), t.get_args(arg)) for arg in union_types]
-            for origin, sargs in pairs:
-                assert isinstance(origin, type)
-                if issubclass(origin, list) and isinstance(value, sargs[0]):
-                    return [value]
-        if isinstance(value, sargs[0]):
-            return [value]
-    return value
+        (item,) = t.get_args(arg)
+        items = t.get_args(item) if t.get_origin(item) is t.Union else (item,)
+        types.extend(
+            typ
+            for typ in items
+            if isinstance(typ, type) and issubclass(typ, CONVERT_TO_LIST)
+        )
+    return tuple(dict.fromkeys(types))
+
+
+def _missing_filter(name: str) -> t.Callable[..., t.Any]:
+    def method(self: PackageQuery, *args: t.Any) -> t.Any:
+        # Raise the AttributeError only when the filter is actually used
+        return getattr(self, name)(*args)
+
+    return method
+
+
+@functools.cache
+def _get_filter_plans(cls: type[PackageQuery]) -> dict[str, _FilterPlan]:
+    """
+    Compile the `_QueryFilterKwargs` annotations into a `_FilterPlan` for each
+    keyword argument so that PackageQuery._filter() doesn't need to parse the
+    keys or inspect the type annotations on every call.
+    """
+    plans: dict[str, _FilterPlan] = {}
+    for key, annotation in t.get_type_hints(_QueryFilterKwargs).items():
+        split = key.rsplit("__", 1)
+        name = "filter_" + _FILTER_NAME_MAPPING.get(split[0], split[0])
+        plans[key] = _FilterPlan(
+            getattr(cls, name, None) or _missing_filter(name),
+            _COMP_MAPPING[split[1]] if len(split) == 2 else None,
+            _get_list_types(annotation),
+        )
+    return plans
 
 
 class NEVRAForms(int, Enum):
@@ -925,6 +972,47 @@ class NEVRAForms(int, Enum):
     NAME = libdnf5.rpm.Nevra.Form_NAME
 
 
+# Package attributes that map directly to libdnf5.rpm.Package getters.
+# fetch_columns() calls these without going through the Package properties.
+_COLUMN_METHODS: dict[str, str] = {
+    "name": "get_name",
+    "arch": "get_arch",
+    "a": "get_arch",
+    "version": "get_version",
+    "v": "get_version",
+    "release": "get_release",
+    "r": "get_release",
+    "evr": "get_evr",
+    "from_repo": "get_from_repo_id",
+    "debug_name": "get_debuginfo_name",
+    "source_debug_name": "get_debugsource_name",
+    "installtime": "get_install_time",
+    "buildtime": "get_build_time",
+    "size": "get_download_size",
+    "downloadsize": "get_download_size",
+    "installsize": "get_install_size",
+    "description": "get_description",
+    "summary": "get_summary",
+    "license": "get_license",
+    "url": "get_url",
+    "reponame": "get_repo_id",
+    "repoid": "get_repo_id",
+    "vendor": "get_vendor",
+    "packager": "get_packager",
+    "location": "get_location",
+}
+_RELDEP_COLUMN_METHODS: dict[str, str] = {
+    "provides": "get_provides",
+    "requires": "get_requires",
+    "recommends": "get_recommends",
+    "suggests": "get_suggests",
+    "supplements": "get_supplements",
+    "enhances": "get_enhances",
+    "obsoletes": "get_obsoletes",
+    "conflicts": "get_conflicts",
+}
+
+
 class Repoquery(RepoqueryBase[Package, PackageQuery]):
     """
     Helpers to query a repository.
@@ -939,6 +1027,10 @@ class Repoquery(RepoqueryBase[Package, PackageQuery]):
         base_vars = self.base.get_vars()
         return {base_vars.get_value("arch"), base_vars.get_value("basearch")}
 
+    @property
+    def basearch(self) -> str:
+        return self.base.get_vars().get_value("basearch")
+
     def _query(self) -> PackageQuery:
         obj = PackageQuery(self.base)
         obj.__rq__ = self
@@ -968,8 +1060,23 @@ class Repoquery(RepoqueryBase[Package, PackageQuery]):
             for form in nevra_forms:
                 v_nevra_forms.append(form)
             _sc(settings, "nevra_forms", v_nevra_forms)
-        r_query = self.query(empty=True)
-        for spec in specs:
+        if nevra_forms:
+            r_query = self.query(empty=True)
+            fallback = list(specs)
+        else:
+            # Resolve plain names, globs, and NEVRAs with as few queries as
+            # possible and only call resolve_pkg_spec() for the rest.
+            # File paths and Provides can't match any NEVRA form, so they're
+            # only matched by the provides and file queries below.
+            resolved, deps, fallback = self._bulk_resolve_specs(specs, with_src)
+            r_query = self.query(
+                pkg=[pkg for pkgs in resolved.values() for pkg in pkgs]
+            )
+            for dep_query in self._dep_glob_queries(
+                deps, opts["with_provides"], opts["with_filenames"]
+            ):
+                r_query.union(dep_query)
+        for spec in fallback:
             query = self._query()
             query.resolve_pkg_spec(spec, settings, with_src)
             r_query.union(query)
@@ -980,6 +1087,30 @@ class Repoquery(RepoqueryBase[Package, PackageQuery]):
         filter_latest(r_query, latest)
         return r_query
 
+    def _column_getter(self, attr: str) -> t.Callable[[t.Any], t.Any]:
+        if method := _COLUMN_METHODS.get(attr):
+            return methodcaller(method)
+        if method := _RELDEP_COLUMN_METHODS.get(attr):
+            get_reldeps = methodcaller(method)
+            # Many packages share the same reldeps,
+            # so only convert each one to a string once
+            strings: dict[int, str] = {}
+
+            def getter(package: Package) -> list[str]:
+                result: list[str] = []
+                for reldep in get_reldeps(package):
+                    key = reldep.get_id().id
+                    if (string := strings.get(key)) is None:
+                        string = strings[key] = sys.intern(reldep.to_string())
+                    result.append(string)
+                return result
+
+            return getter
+        if attr == "files":
+            get_files = methodcaller("get_files")
+            return lambda package: list(get_files(package))
+        return super()._column_getter(attr)
+
     @property
     def backend(self) -> BackendMod:
         """
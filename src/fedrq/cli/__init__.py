@@ -5,7 +5,13 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Sequence
+import contextlib
+import logging
+import os
+import sys
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, TextIO
 
 try:
     import argcomplete
@@ -14,31 +20,36 @@ except ImportError:
 else:
     HAS_ARGCOMPLETE = True
 
-from fedrq.cli.base import CheckConfig, Command
-from fedrq.cli.commands.cache import MakeCacheCommand
-from fedrq.cli.commands.changelogs import ChangelogCommand
-from fedrq.cli.commands.download import DownloadCommand, DownloadSpecCommand
-from fedrq.cli.commands.formatters import FormattersCommand
-from fedrq.cli.commands.pkgs import Pkgs
-from fedrq.cli.commands.repolist import Repolist
-from fedrq.cli.commands.subpkgs import Subpkgs
-from fedrq.cli.commands.whatrequires import (
-    WhatCommand,
-    Whatenhances,
-    Whatobsoletes,
-    Whatrecommends,
-    Whatrequires,
-    WhatrequiresSrc,
-    Whatsuggests,
-    Whatsupplements,
-)
+if TYPE_CHECKING:
+    from fedrq.cli.base import Command
+    from fedrq.cli.commands.cache import MakeCacheCommand
+    from fedrq.cli.commands.changelogs import ChangelogCommand
+    from fedrq.cli.commands.daemon import DaemonCommand
+    from fedrq.cli.commands.download import DownloadCommand, DownloadSpecCommand
+    from fedrq.cli.commands.formatters import FormattersCommand
+    from fedrq.cli.commands.pkgs import Pkgs
+    from fedrq.cli.commands.repolist import Repolist
+    from fedrq.cli.commands.requires import Requires
+    from fedrq.cli.commands.subpkgs import Subpkgs
+    from fedrq.cli.commands.whatrequires import (
+        WhatCommand,
+        Whatenhances,
+        Whatobsoletes,
+        Whatrecommends,
+        Whatrequires,
+        WhatrequiresSrc,
+        Whatsuggests,
+        Whatsupplements,
+    )
 
 __all__ = (
     "Command",
     "Pkgs",
     "Repolist",
+    "Requires",
     "Subpkgs",
     "ChangelogCommand",
+    "DaemonCommand",
     "DownloadCommand",
     "DownloadSpecCommand",
     "FormattersCommand",
@@ -53,6 +64,80 @@ __all__ = (
     "Whatsupplements",
 )
 
+logger = logging.getLogger(__name__)
+
+# Map the public command classes to the modules that define them.
+# The command modules are only imported when they're used,
+# so that commands like `fedrq formatters` don't pay for the others' imports.
+_CLASSES: dict[str, str] = {
+    "CheckConfig": "fedrq.cli.base",
+    "Command": "fedrq.cli.base",
+    "MakeCacheCommand": "fedrq.cli.commands.cache",
+    "ChangelogCommand": "fedrq.cli.commands.changelogs",
+    "DaemonCommand": "fedrq.cli.commands.daemon",
+    "DownloadCommand": "fedrq.cli.commands.download",
+    "DownloadSpecCommand": "fedrq.cli.commands.download",
+    "FormattersCommand": "fedrq.cli.commands.formatters",
+    "Pkgs": "fedrq.cli.commands.pkgs",
+    "Repolist": "fedrq.cli.commands.repolist",
+    "Requires": "fedrq.cli.commands.requires",
+    "Subpkgs": "fedrq.cli.commands.subpkgs",
+    "WhatCommand": "fedrq.cli.commands.whatrequires",
+    "Whatenhances": "fedrq.cli.commands.whatrequires",
+    "Whatobsoletes": "fedrq.cli.commands.whatrequires",
+    "Whatrecommends": "fedrq.cli.commands.whatrequires",
+    "Whatrequires": "fedrq.cli.commands.whatrequires",
+    "WhatrequiresSrc": "fedrq.cli.commands.whatrequires",
+    "Whatsuggests": "fedrq.cli.commands.whatrequires",
+    "Whatsupplements": "fedrq.cli.commands.whatrequires",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if module := _CLASSES.get(name):
+        return getattr(import_module(module), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazyCommands(Mapping[str, "type[Command]"]):
+    """
+    Mapping of subcommand names to Command classes.
+    Each command's module is imported the first time the command is accessed.
+    """
+
+    def __init__(self, commands: dict[str, str]) -> None:
+        self._commands = commands
+
+    def __getitem__(self, key: str) -> type[Command]:
+        return __getattr__(self._commands[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._commands)
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._commands
+
+
+class _OutputTracker:
+    """
+    stdout proxy that records whether a command printed anything
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self.written = False
+
+    def write(self, text: str) -> int:
+        if text:
+            self.written = True
+        return self._stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
 
 def version() -> str:
     from fedrq import __version__
@@ -60,7 +145,23 @@ def version() -> str:
     return __version__
 
 
-def main(argv: Sequence | None = None, **kwargs) -> None:
+def _parser_commands(argv: Sequence[str]) -> Collection[str]:
+    """
+    Return the names of the subcommands whose parsers need to be built.
+    Building a parser imports the command's module,
+    so only build the selected command's parser when possible.
+    """
+    # Shell completion needs every parser
+    if HAS_ARGCOMPLETE and "_ARGCOMPLETE" in os.environ:
+        return COMMANDS
+    if argv and argv[0] in COMMANDS:
+        return (argv[0],)
+    if list(argv) == ["--version"]:
+        return ()
+    return COMMANDS
+
+
+def _make_parser(argv: Sequence[str], **kwargs) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="fedrq is a tool for querying the Fedora and EPEL repositories.",
         **kwargs,
@@ -69,31 +170,87 @@ def main(argv: Sequence | None = None, **kwargs) -> None:
     subparsers = parser.add_subparsers(
         title="Subcommands", dest="action", required=True
     )
-    for name, cls in COMMANDS.items():
-        cls.make_parser(subparsers.add_parser, name=name, add_help=True)
+    selected = _parser_commands(argv)
+    for name in COMMANDS:
+        if name in selected:
+            COMMANDS[name].make_parser(subparsers.add_parser, name=name, add_help=True)
+        else:
+            # Keep the other subcommands as valid choices
+            subparsers.add_parser(name)
+    return parser
+
+
+def main(argv: Sequence | None = None, **kwargs) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    parser = _make_parser(argv, **kwargs)
     if HAS_ARGCOMPLETE:
         argcomplete.autocomplete(parser)
-    args = parser.parse_args(argv)
-    return COMMANDS[args.action](args).run()
-
-
-COMMANDS: dict[str, type[Command]] = {
-    "make-cache": MakeCacheCommand,
-    "check-config": CheckConfig,
-    "changelog": ChangelogCommand,
-    "download": DownloadCommand,
-    "download-spec": DownloadSpecCommand,
-    "formatters": FormattersCommand,
-    "pkgs": Pkgs,
-    "subpkgs": Subpkgs,
-    "repolist": Repolist,
-    "whatenhances": Whatenhances,
-    "whatobsoletes": Whatobsoletes,
-    "whatrecommends": Whatrecommends,
-    "whatrequires": Whatrequires,
-    "wr": Whatrequires,
-    "whatrequires-src": WhatrequiresSrc,
-    "wrsrc": WhatrequiresSrc,
-    "whatsuggests": Whatsuggests,
-    "whatsupplements": Whatsupplements,
-}
+    _run(parser.parse_args(argv), argv)
+
+
+def _run(args: argparse.Namespace, argv: Sequence[str]) -> None:
+    """
+    Run the command that was parsed from `argv`
+    """
+    cls = COMMANDS[args.action]
+
+    from fedrq.backends.base import FilelistsRequired
+
+    # Forward the command to a running daemon unless we're the daemon
+    if cls.DAEMON and cls._rq_cache is None:
+        from fedrq.cli.commands.daemon import DAEMON_SOCKET_ENV, forward
+
+        if socket := os.environ.get(DAEMON_SOCKET_ENV):
+            code = forward(socket, argv, args)
+            if code is not None:
+                if code:
+                    sys.exit(code)
+                return None
+    command = cls(args)
+    output = _OutputTracker(sys.stdout)
+    try:
+        with contextlib.redirect_stdout(output):
+            return command.run()
+    except FilelistsRequired:
+        from fedrq._config import LoadFilelists
+
+        # Commands that could need the filelists after they started printing
+        # load them upfront, so this is only reached before any output.
+        if output.written:
+            sys.exit(
+                "ERROR: The filelists are needed to finish this query."
+                " Rerun it with --filelists=always."
+            )
+        # The sack was loaded without filelists, but the command needs them.
+        # Rerun it with filelists instead of printing incomplete results.
+        logger.debug("Reloading the sack with filelists")
+        args.load_filelists = LoadFilelists.always
+        # The names were already read from stdin
+        args.stdin = False
+        return cls(args).run()
+
+
+COMMANDS: Mapping[str, type[Command]] = _LazyCommands(
+    {
+        "make-cache": "MakeCacheCommand",
+        "check-config": "CheckConfig",
+        "changelog": "ChangelogCommand",
+        "daemon": "DaemonCommand",
+        "download": "DownloadCommand",
+        "download-spec": "DownloadSpecCommand",
+        "formatters": "FormattersCommand",
+        "pkgs": "Pkgs",
+        "subpkgs": "Subpkgs",
+        "repolist": "Repolist",
+        "requires": "Requires",
+        "whatenhances": "Whatenhances",
+        "whatobsoletes": "Whatobsoletes",
+        "whatrecommends": "Whatrecommends",
+        "whatrequires": "Whatrequires",
+        "wr": "Whatrequires",
+        "whatrequires-src": "WhatrequiresSrc",
+        "wrsrc": "WhatrequiresSrc",
+        "whatsuggests": "Whatsuggests",
+        "whatsupplements": "Whatsupplements",
+    }
+)
@@ -11,12 +11,13 @@ import collections.abc as cabc
 import json
 import logging
 import re
+import shlex
 import sys
 from functools import wraps
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
-from fedrq.backends.base import BaseMakerBase, PackageCompat
+from fedrq.backends.base import BaseMakerBase, PackageCompat, path_needs_filelists
 
 try:
     import tomli_w
@@ -25,8 +26,7 @@ except ImportError:
 else:
     HAS_TOMLI_W = True
 
-from pydantic import ValidationError
-
+from fedrq._config import ConfigError, LoadFilelists
 from fedrq._utils import mklog
 from fedrq.backends import BACKENDS, MissingBackendError
 from fedrq.cli.formatters import (
@@ -35,10 +35,13 @@ from fedrq.cli.formatters import (
     FormatterError,
     Formatters,
 )
-from fedrq.config import ConfigError, LoadFilelists, Release, RQConfig, get_config
+from fedrq.release_repo import prefetch_repogs
 
 if TYPE_CHECKING:
+    from fedrq._snapshot import Snapshot
     from fedrq.backends.base import BackendMod, PackageQueryCompat
+    from fedrq.config import Release, RQConfig
+    from fedrq.release_repo import RepoG
 
 logger = logging.getLogger("fedrq")
 
@@ -52,8 +55,6 @@ These modules are only available for the default system Python interpreter.
 
 SPLIT_REGEX = re.compile(r"\s*[,\s]\s*")
 
-DOES_NOT_REQUIRE_FILELISTS = ("/etc", "/usr/bin", "/usr/sbin")
-
 
 # Based on dnf.cli.option_parser._RepoCallback
 class _EnableDisableRepo(argparse.Action):
@@ -115,6 +116,15 @@ class Command(metaclass=abc.ABCMeta):
     query: PackageQueryCompat
     formatters: Formatters = DefaultFormatters
     formatter: Formatter
+    # Whether the command can be forwarded to a running `fedrq daemon`
+    DAEMON: bool = True
+    # Filled Repoquery objects shared between commands.
+    # This is only set by `fedrq daemon`.
+    _rq_cache: cabc.MutableMapping[tuple[Any, ...], Any] | None = None
+    # Whether the command can answer some queries from the metadata snapshot
+    # written by `fedrq make-cache` instead of loading the backend
+    SNAPSHOT: bool = False
+    snapshot: Snapshot | None = None
 
     def __init__(self, args: argparse.Namespace):
         self.args = args
@@ -126,12 +136,17 @@ class Command(metaclass=abc.ABCMeta):
         if hasattr(self.args, "names"):
             self.get_names()
 
+        # pydantic and the config module are only imported by commands that
+        # use the config
+        from pydantic import ValidationError
+
         try:
             self.config = self._get_config()
         except ValidationError as exc:
             sys.exit(str(exc))
         self._set_config("backend")
         self._set_config("smartcache")
+        self._set_config("cacheonly")
         self._set_config("load_filelists")
         if (
             self.config.load_filelists == LoadFilelists.auto
@@ -143,25 +158,27 @@ class Command(metaclass=abc.ABCMeta):
 
     def _should_load_filelists(self) -> bool:
         """
-        Method to determine whether filelists should be automatically loaded in
+        Method to determine whether filelists should be loaded upfront in
         auto mode.
+        Formatters that need filelists are checked by v_formatters().
+        Otherwise, the sack is loaded without filelists and `fedrq.cli.main()`
+        reruns the command with filelists if it turns out to need them
+        before it printed anything.
+        See `RepoqueryBase.filelists_on_demand`.
         Can be overrideen in subclasses.
         """
-        return "files" in getattr(self.args, "formatter", "") or (
-            self._paths_need_filelists(getattr(self.args, "names", []))
-        )
+        return self._paths_need_filelists(getattr(self.args, "names", []))
 
     def _paths_need_filelists(self, names: cabc.Iterable[str]) -> bool:
         """
         Given a list of package specs, determine whether filelists are needed
         to resolve them.
         """
-        return any(
-            name.startswith("/") and not name.startswith(DOES_NOT_REQUIRE_FILELISTS)
-            for name in cast(list[str], names)
-        )
+        return any(map(path_needs_filelists, cast(list[str], names)))
 
     def _get_config(self):
+        from fedrq.config import get_config
+
         # This makes it easier to mock the config
         return get_config()
 
@@ -300,6 +317,13 @@ class Command(metaclass=abc.ABCMeta):
                 "--formatter",
                 default="plain",
             ).completer = cls.formatters._argcompleter  # type: ignore[attr-defined]
+            parser.add_argument(
+                "--no-sort",
+                "--stream",
+                action="store_true",
+                dest="no_sort",
+                help="Print results as they're found instead of sorting them first",
+            )
         cachedir_group = parser.add_mutually_exclusive_group()
         cachedir_group.add_argument(
             "--system-cache",
@@ -325,6 +349,20 @@ class Command(metaclass=abc.ABCMeta):
         # This is mutually exclusive with --smartcache. It's still undocumented
         # and subject to change.
         cachedir_group.add_argument("--cachedir", help=argparse.SUPPRESS, type=Path)
+        parser.add_argument(
+            "-C",
+            "--cacheonly",
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help="Only load repodata from the cache without checking for updates."
+            " Fail if a repository has not been cached.",
+        )
+        parser.add_argument(
+            "--no-snapshot",
+            action="store_true",
+            help="Always load the repodata with the backend"
+            " instead of using the metadata snapshot from make-cache",
+        )
         parser.add_argument("--debug", action="store_true")
         parser.add_argument(
             "-L",
@@ -420,6 +458,13 @@ class Command(metaclass=abc.ABCMeta):
         except FormatterError as err:
             logger.debug("FormatterError", exc_info=err)
             return str(err) + "\n" + FORMATTER_ERROR_SUFFIX
+        self.formatter.sort = not getattr(self.args, "no_sort", False)
+        # Formatters that resolve dependencies while they're printing
+        # can't be rerun with filelists
+        if self.config.load_filelists == LoadFilelists.auto and (
+            self.formatter.needs_filelists or self.formatter.resolves_deps_lazily
+        ):
+            self.config.load_filelists = LoadFilelists.always
         return None
 
     @v_add_errors
@@ -444,10 +489,24 @@ class Command(metaclass=abc.ABCMeta):
             return str(err)
         return None
 
-    def _enable_disable_bm(self, bm: BaseMakerBase):
+    def _enable_repogs(self) -> dict[str, RepoG]:
+        return {
+            repo: self.release.get_repog(repo)
+            for func, repo in self.args.enable_disable
+            if func == "enable"
+        }
+
+    def _enable_disable_bm(
+        self, bm: BaseMakerBase, repogs: dict[str, RepoG] | None = None
+    ):
+        if repogs is None:
+            repogs = self._enable_repogs()
+            # Fetch remote repo files concurrently,
+            # and then apply the options in order
+            prefetch_repogs(list(repogs.values()), self.config, self.release)
         for func, repo in self.args.enable_disable:
             if func == "enable":
-                self.release.get_repog(repo).load(bm, self.config, self.release)
+                repogs[repo].load(bm, self.config, self.release)
             elif func == "disable":
                 bm.disable_repo(repo, True)
             else:
@@ -472,20 +531,68 @@ class Command(metaclass=abc.ABCMeta):
         if self.args.forcearch:
             conf["ignorearch"] = True
             bvars["arch"] = self.args.forcearch
+        key = self._rq_cache_key(conf)
+        if self._rq_cache is not None and key in self._rq_cache:
+            flog.debug("Reusing cached Repoquery for %s", key)
+            self.rq = self._rq_cache[key]
+            return None
         bm = self.backend.BaseMaker()
         try:
+            repogs = self._enable_repogs()
+            # Fetch the release's and the --enablerepo repos' remote repo files
+            # concurrently before loading them in order
+            prefetch_repogs(
+                [self.release.repog, *repogs.values()], self.config, self.release
+            )
             self.release.make_base(self.config, conf, bvars, bm, False)
-            self._enable_disable_bm(bm)
+            self._enable_disable_bm(bm, repogs)
         except ConfigError as exc:
             return str(exc)
+        # Only load the primary metadata.
+        # The command is rerun with filelists if it needs them.
+        filelists_on_demand = self.config.load_filelists == LoadFilelists.auto
+        if filelists_on_demand:
+            bm.load_filelists(False)
         try:
-            filled = bm.fill_sack()
+            filled = bm.fill_sack(from_cache=self.config.cacheonly)
         except self.backend.RepoError as exc:
             flog.debug("RepoError: ", exc_info=exc)
+            if self.config.cacheonly:
+                from fedrq.config import DEFAULT_REPO_CLASS
+
+                make_cache = ["fedrq", "make-cache", "-b", self.release.branch]
+                # Each repo class is cached separately
+                if self.release.repo_name != DEFAULT_REPO_CLASS:
+                    make_cache.extend(("-r", self.release.repo_name))
+                return (
+                    f"{exc}\nRun '{shlex.join(make_cache)}'"
+                    " to populate the cache or pass --no-cacheonly."
+                )
             return str(exc)
         self.rq = self.backend.Repoquery(filled)
+        self.rq.filelists_on_demand = filelists_on_demand
+        if self._rq_cache is not None:
+            self._rq_cache[key] = self.rq
         return None
 
+    def _rq_cache_key(self, conf: dict[str, Any]) -> tuple[Any, ...]:
+        """
+        Return a key that identifies the sack that v_rq() would load
+        """
+        return (
+            self.backend.BACKEND,
+            self.release.release_config.name,
+            self.release.branch,
+            self.release.repo_name,
+            tuple(self.args.enable_disable),
+            self.args.forcearch,
+            conf.get("cachedir"),
+            self.config.smartcache,
+            self.config.load_filelists,
+            self.config.load_other_metadata,
+            self.config.cacheonly,
+        )
+
     @v_fatal_error
     def v_backend(self) -> str | None:
         try:
@@ -494,10 +601,77 @@ class Command(metaclass=abc.ABCMeta):
             return MISSING_BACKEND_MSG.format(str(exc))
         return None
 
+    def _snapshot_key(self) -> dict[str, Any]:
+        """
+        Return a key that identifies the repositories that v_rq() would load
+        without loading the backend
+        """
+        return {
+            "release": self.release.release_config.name,
+            "branch": self.release.branch,
+            "repos": self.release.repo_name,
+            "enable_disable": [list(item) for item in self.args.enable_disable],
+            "forcearch": self.args.forcearch,
+            "cachedir": str(self.args.cachedir) if self.args.cachedir else None,
+            "system_cache": self.args.system_cache,
+            "smartcache": self.config.smartcache,
+        }
+
+    def _snapshot_supported(self) -> bool:
+        """
+        Whether the command's arguments can be handled with a snapshot.
+        Subclasses that set SNAPSHOT must override this.
+        """
+        return False
+
+    def v_snapshot(self) -> bool:
+        """
+        Try to load the metadata snapshot instead of the backend.
+
+        Returns:
+            Whether a valid snapshot was loaded into `self.snapshot`
+        """
+        if (
+            not self.SNAPSHOT
+            or getattr(self.args, "no_snapshot", True)
+            # A daemon has its own resident sacks
+            or self._rq_cache is not None
+        ):
+            return False
+        from fedrq._snapshot import SNAPSHOT_FORMATTERS, Snapshot
+
+        if (
+            getattr(self.args, "formatter", None) not in SNAPSHOT_FORMATTERS
+            or not self._snapshot_supported()
+        ):
+            return False
+        try:
+            self.release = self.config.get_release(self.args.branch, self.args.repos)
+        except ConfigError:
+            # Let v_release() report the error
+            return False
+        # --cacheonly never refreshes expired metadata either
+        self.snapshot = Snapshot.open(
+            self._snapshot_key(), check_expire=not self.config.cacheonly
+        )
+        return self.snapshot is not None
+
     def v_default(self) -> None:
         self.v_formatters()
         self.v_latest()
         self.v_arch()
+        if not self._v_errors and self.v_snapshot():
+            return
+        self.v_load_rq()
+
+    def v_load_rq(self) -> None:
+        """
+        Load the backend and fill the sack.
+        Commands that used a snapshot can call this to fall back to the backend.
+        """
+        if self.snapshot:
+            self.snapshot.close()
+            self.snapshot = None
         # Fatal
         self.v_backend()
         self._v_handle_errors()
@@ -511,6 +685,8 @@ class CheckConfig(Command):
     Verify fedrq configuration
     """
 
+    DAEMON = False
+
     def __init__(self, args: argparse.Namespace):
         self.args = args
         self.v_logging()
@@ -557,6 +733,10 @@ class CheckConfig(Command):
             sys.exit("tomli-w is required for --dump.")
         if not self.args.dump:
             print("Validating config...")
+        from pydantic import ValidationError
+
+        from fedrq.config import get_config
+
         try:
             self.config = get_config()
         except ValidationError as exc:
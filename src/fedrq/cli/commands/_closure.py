@@ -0,0 +1,73 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+PRIVATE: Shared base class for the commands that expand dependency closures
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from fedrq.backends.base import PackageCompat
+from fedrq.cli.base import Command, v_add_errors
+
+
+class ClosureCommand(Command):
+    """
+    Base class for commands with --recursive and --depth options
+    """
+
+    @staticmethod
+    def _add_recursive_args(parser: argparse.ArgumentParser, description: str) -> None:
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "-R",
+            "--recursive",
+            action="store_true",
+            help=description + " until no new packages are found."
+            " Line-based formatters' output is prefixed with the depth"
+            " at which each package was reached.",
+        )
+        group.add_argument(
+            "--depth",
+            type=int,
+            metavar="N",
+            help="Like --recursive, but stop after N levels."
+            " --depth 1 is equivalent to not passing --recursive.",
+        )
+
+    @property
+    def _recursive(self) -> bool:
+        return bool(
+            getattr(self.args, "recursive", None)
+            or getattr(self.args, "depth", None) is not None
+        )
+
+    @v_add_errors
+    def v_depth(self) -> str | None:
+        if not self._recursive:
+            return None
+        if self.args.depth is not None and self.args.depth < 1:
+            return "--depth must be a positive integer"
+        if getattr(self.args, "extra_exact", None):
+            return "--recursive and --depth cannot be used with --extra-exact"
+        return None
+
+    def _print_closure(self, depths: dict[PackageCompat, int]) -> None:
+        self.query = self.rq.query(pkg=list(depths), arch=self.args.arch)
+        if self.formatter.MULTILINE:
+            for line in self.format():
+                print(line)
+            return
+        levels: dict[int, list[PackageCompat]] = {}
+        for package in self.query:
+            levels.setdefault(depths[package], []).append(package)
+        printed: set[str] = set()
+        for level in sorted(levels):
+            for line in self.format(levels[level]):
+                # Some formatters (e.g., source) produce the same line for
+                # multiple packages. Only show the first depth.
+                if line not in printed:
+                    printed.add(line)
+                    print(f"{level} : {line}")
@@ -8,9 +8,89 @@ Commands for managing the repo cache
 from __future__ import annotations
 
 import argparse
+import logging
+import os
+import sys
+import time
 from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
-from fedrq.cli.base import Command
+from fedrq._config import ConfigError
+from fedrq._utils import format_size
+from fedrq.backends.base import BaseMakerBase
+from fedrq.cli.base import Command, v_add_errors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _CacheResult:
+    branch: str
+    repos: int = 0
+    seconds: float = 0.0
+    downloaded: int = 0
+    error: str | None = None
+
+
+def _downloaded_bytes(cachedir: str | None, since: float) -> int:
+    """
+    Sum the size of the repodata files in `cachedir` that were written after
+    `since`
+    """
+    if not cachedir:
+        return 0
+    total = 0
+    for path in Path(cachedir).glob("*/repodata/*"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if stat.st_mtime >= since:
+            total += stat.st_size
+    return total
+
+
+def _make_cache_worker(
+    args: argparse.Namespace, branches: list[str]
+) -> list[_CacheResult]:
+    """
+    Refresh the cache for `branches` in series.
+    This runs in a worker process, so each worker gets its own backend Base.
+    """
+    results: list[_CacheResult] = []
+    for branch in branches:
+        wargs = argparse.Namespace(**vars(args))
+        wargs.branch = branch
+        wargs.all_releases = False
+        since = time.time()
+        start = time.perf_counter()
+        try:
+            cmd = MakeCacheCommand(wargs)
+            bm, repos = cmd.refresh()
+        except SystemExit as exc:
+            # Validation errors are printed before exiting with an int code
+            error = exc.code if isinstance(exc.code, str) else "failed"
+            results.append(_CacheResult(branch, error=error))
+            continue
+        except Exception as exc:
+            logger.debug("Failed to refresh %s", branch, exc_info=exc)
+            results.append(_CacheResult(branch, error=str(exc) or repr(exc)))
+            continue
+        try:
+            cachedir = bm.get("cachedir")
+        except NotImplementedError:
+            cachedir = None
+        results.append(
+            _CacheResult(
+                branch,
+                repos=len(repos),
+                seconds=time.perf_counter() - start,
+                downloaded=_downloaded_bytes(cachedir, since),
+            )
+        )
+    return results
 
 
 class MakeCacheCommand(Command):
@@ -18,9 +98,59 @@ class MakeCacheCommand(Command):
     Load the repodata for the current branch/repo config
     """
 
+    # Always reload the repodata instead of reusing a resident sack
+    DAEMON = False
+    # Start method for the multi-release worker processes.
+    # Each worker needs a fresh process so it gets its own backend Base.
+    MP_CONTEXT: str = "spawn"
+
+    _sack_key: dict[str, Any]
+
     def __init__(self, args: argparse.Namespace) -> None:
         super().__init__(args)
-        self.v_default()
+        if self.args.cacheonly:
+            sys.exit("make-cache cannot be used with --cacheonly")
+        # make-cache always refreshes the cache,
+        # even if `cacheonly` is set in the config file.
+        self.config.cacheonly = False
+        self.branches: list[str] = []
+        if self.args.all_releases:
+            self.branches = list(dict.fromkeys(self.config.cache_branches))
+        elif self.args.branch:
+            self.branches = list(
+                dict.fromkeys(
+                    b for b in map(str.strip, self.args.branch.split(",")) if b
+                )
+            )
+            if len(self.branches) == 1:
+                self.args.branch = self.branches[0]
+        self.parallel: bool = self.args.all_releases or len(self.branches) > 1
+        if self.parallel:
+            self.v_branches()
+            self._v_handle_errors()
+        else:
+            self.v_default()
+
+    @v_add_errors
+    def v_branches(self) -> str | list[str] | None:
+        if not self.branches:
+            return (
+                "--all-releases requires `cache_branches` to be set"
+                " in the configuration. See fedrq(5)."
+            )
+        errors: list[str] = []
+        for branch in self.branches:
+            try:
+                self.config.get_release(branch, self.args.repos)
+            except ConfigError as err:
+                errors.append(str(err))
+        return errors or None
+
+    def v_rq(self) -> None:
+        # v_rq() adjusts the smartcache config,
+        # so compute the snapshot key like the commands that use it do.
+        self._sack_key = self._snapshot_key()
+        super().v_rq()
 
     @classmethod
     def make_parser(
@@ -39,9 +169,117 @@ class MakeCacheCommand(Command):
             ],
             **kwargs,
         )
+        parser.add_argument(
+            "--all-releases",
+            action="store_true",
+            help="Refresh the cache for every branch in the `cache_branches`"
+            " config option. See fedrq(5).",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of releases to refresh in parallel"
+            " when passing multiple branches. Defaults to the number of CPUs.",
+        )
         return parser
 
+    def refresh(self) -> tuple[BaseMakerBase, list[str]]:
+        """
+        Write a snapshot for the loaded repodata.
+
+        Returns:
+            The BaseMaker and the list of enabled repos
+        """
+        bm = self.backend.BaseMaker(self.rq.base)
+        enabled_repos = bm.repolist(True)
+        if not self.args.no_snapshot:
+            self._write_snapshot(bm, enabled_repos)
+        return bm, enabled_repos
+
     def run(self) -> None:
-        enabled_repos = self.backend.BaseMaker(self.rq.base).repolist(True)
+        if self.parallel:
+            self._run_parallel()
+            return
+        _, enabled_repos = self.refresh()
         inflected = "repo" if len(enabled_repos) == 1 else "repos"
         print(f"Loaded {len(enabled_repos)} {inflected}")
+
+    def _group_branches(self) -> list[list[str]]:
+        """
+        Group branches that share a cachedir so that they are not refreshed
+        concurrently
+        """
+        if self.args.cachedir or self.args.system_cache or not self.config.smartcache:
+            return [self.branches]
+        groups: dict[str, list[str]] = {}
+        for branch in self.branches:
+            release = self.config.get_release(branch, self.args.repos)
+            groups.setdefault(str(release.version), []).append(branch)
+        return list(groups.values())
+
+    def _run_parallel(self) -> None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        groups = self._group_branches()
+        jobs = min(len(groups), self.args.jobs or os.cpu_count() or 1)
+        failed = False
+        total_start = time.perf_counter()
+        total_downloaded = 0
+        with ProcessPoolExecutor(
+            max_workers=max(jobs, 1),
+            mp_context=multiprocessing.get_context(self.MP_CONTEXT),
+        ) as executor:
+            futures = [
+                executor.submit(_make_cache_worker, self.args, group)
+                for group in groups
+            ]
+            for future in as_completed(futures):
+                for result in future.result():
+                    if result.error:
+                        failed = True
+                        print(f"{result.branch}: {result.error}", file=sys.stderr)
+                        continue
+                    total_downloaded += result.downloaded
+                    inflected = "repo" if result.repos == 1 else "repos"
+                    print(
+                        f"{result.branch}: Loaded {result.repos} {inflected}"
+                        f" in {result.seconds:.1f}s"
+                        f" ({format_size(result.downloaded)} downloaded)",
+                        flush=True,
+                    )
+        print(
+            f"Refreshed {len(self.branches)} releases"
+            f" in {time.perf_counter() - total_start:.1f}s"
+            f" ({format_size(total_downloaded)} downloaded)"
+        )
+        if failed:
+            sys.exit(1)
+
+    def _write_snapshot(self, bm: BaseMakerBase, repos: list[str]) -> None:
+        """
+        Write a metadata snapshot that simple queries can use instead of
+        loading the backend
+        """
+        from fedrq._snapshot import find_repomd, write_snapshot
+
+        try:
+            cachedir = bm.get("cachedir")
+        except NotImplementedError:
+            return
+        repomds = {}
+        for repoid in repos:
+            if not (repomd := find_repomd(cachedir, repoid)):
+                logger.debug("Not writing a snapshot: %s is not cached", repoid)
+                return
+            repomds[repoid] = repomd
+        try:
+            metadata_expire = {
+                repoid: int(bm.get_repo_option(repoid, "metadata_expire"))
+                for repoid in repos
+            }
+        except NotImplementedError:
+            metadata_expire = None
+        path = write_snapshot(self._sack_key, self.rq, repomds, metadata_expire)
+        logger.debug("Wrote metadata snapshot to %s", path)
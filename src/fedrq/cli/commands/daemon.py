@@ -0,0 +1,332 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Persistent query daemon that keeps filled package sacks resident
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping, Sequence
+from pathlib import Path
+from typing import Any, TextIO
+
+from fedrq.cli.base import Command
+
+DAEMON_SOCKET_ENV = "FEDRQ_DAEMON_SOCKET"
+# Environment variables that affect command behavior and need to be forwarded
+# from the client to the daemon
+FORWARDED_ENV = ("FEDRQ_BRANCH", "FEDRQ_BACKEND")
+
+_LOG = logging.getLogger(__name__)
+
+
+def get_daemon_socket() -> Path:
+    """
+    Return the default path of the daemon's Unix socket
+    """
+    if path := os.environ.get(DAEMON_SOCKET_ENV):
+        return Path(path)
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(runtime_dir, "fedrq", "daemon.sock")
+    # Avoid importing fedrq.config at module import time
+    from fedrq.config import get_smartcache_basedir
+
+    return get_smartcache_basedir() / "daemon.sock"
+
+
+class SackCache(MutableMapping[tuple[Any, ...], Any]):
+    """
+    LRU mapping of sack keys to filled Repoquery objects.
+    Entries expire after `max_age` seconds so that the daemon eventually picks
+    up new repodata.
+    """
+
+    def __init__(self, max_size: int = 8, max_age: float | None = 3600) -> None:
+        self.max_size = max_size
+        self.max_age = max_age
+        self.__data: OrderedDict[tuple[Any, ...], tuple[float, Any]] = OrderedDict()
+
+    def __getitem__(self, key: tuple[Any, ...]) -> Any:
+        created, value = self.__data[key]
+        if self.max_age is not None and time.monotonic() - created > self.max_age:
+            _LOG.debug("Expiring %s", key)
+            del self.__data[key]
+            raise KeyError(key)
+        self.__data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: tuple[Any, ...], value: Any) -> None:
+        self.__data[key] = (time.monotonic(), value)
+        self.__data.move_to_end(key)
+        while len(self.__data) > self.max_size:
+            evicted, _ = self.__data.popitem(last=False)
+            _LOG.debug("Evicting %s", evicted)
+
+    def __delitem__(self, key: tuple[Any, ...]) -> None:
+        del self.__data[key]
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+
+class _SocketWriter(io.TextIOBase):
+    """
+    Text stream that forwards everything written to it to the client as
+    JSON messages
+    """
+
+    def __init__(self, wfile: Any, stream: str, bufsize: int = 64 * 1024) -> None:
+        self.wfile = wfile
+        self.stream = stream
+        self.bufsize = bufsize
+        self._buffer: list[str] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._buffer.append(s)
+        self._size += len(s)
+        if self._size >= self.bufsize:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if self._buffer:
+            _send(self.wfile, {self.stream: "".join(self._buffer)})
+            self._buffer.clear()
+            self._size = 0
+        self.wfile.flush()
+
+
+def _send(wfile: Any, message: dict[str, Any]) -> None:
+    wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+@contextlib.contextmanager
+def _patched_env(env: dict[str, str | None]) -> Iterator[None]:
+    old = {key: os.environ.get(key) for key in env}
+    try:
+        for key, value in env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        yield
+    finally:
+        for key, value in old.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _DaemonServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            _LOG.debug("Received invalid request")
+            return
+        _LOG.debug("Handling request: %s", request)
+        stdout = _SocketWriter(self.wfile, "stdout")
+        # Don't buffer stderr so errors and warnings are shown immediately
+        stderr = _SocketWriter(self.wfile, "stderr", 0)
+        stdin = io.StringIO(request.get("stdin") or "")
+        code = 0
+        old_stdin = sys.stdin
+        cwd = os.getcwd()
+        try:
+            sys.stdin = stdin
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(contextlib.redirect_stdout(stdout))
+                stack.enter_context(contextlib.redirect_stderr(stderr))
+                stack.enter_context(_patched_env(request.get("env", {})))
+                try:
+                    os.chdir(request.get("cwd") or cwd)
+                    self.server.run_command(request["argv"])
+                except SystemExit as exc:
+                    code = _exit_code(exc)
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+        finally:
+            sys.stdin = old_stdin
+            os.chdir(cwd)
+        stdout.flush()
+        stderr.flush()
+        _send(self.wfile, {"exit": code})
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    def __init__(
+        self,
+        path: Path,
+        run_command: Callable[[Sequence[str]], None],
+    ) -> None:
+        self.run_command = run_command
+        super().__init__(str(path), _RequestHandler)
+
+    def server_bind(self) -> None:
+        # Only the daemon's user may connect to the socket
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+def forward(
+    path: str | Path,
+    argv: Sequence[str],
+    args: argparse.Namespace,
+    *,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int | None:
+    """
+    Forward a command to a running `fedrq daemon`.
+
+    Returns:
+        The command's exit code or None if the daemon could not be reached
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    request = {
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "env": {key: os.environ.get(key) for key in FORWARDED_ENV},
+        # Read stdin in the client, as the daemon cannot access it
+        "stdin": sys.stdin.read() if getattr(args, "stdin", False) else None,
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError as exc:
+        _LOG.debug("Failed to connect to the fedrq daemon at %s", path, exc_info=exc)
+        sock.close()
+        return None
+    with sock, sock.makefile("rwb") as fp:
+        _send(fp, request)
+        fp.flush()
+        for line in fp:
+            message = json.loads(line)
+            if "stdout" in message:
+                stdout.write(message["stdout"])
+            elif "stderr" in message:
+                stderr.write(message["stderr"])
+            elif "exit" in message:
+                stdout.flush()
+                return message["exit"]
+    # The daemon hung up without sending an exit code
+    print("ERROR: Lost connection to the fedrq daemon", file=stderr)
+    return 1
+
+
+class DaemonCommand(Command):
+    """
+    Run a persistent daemon that keeps loaded repositories in memory.
+    Set $FEDRQ_DAEMON_SOCKET to have other fedrq commands forward their
+    arguments to the daemon.
+    """
+
+    DAEMON = False
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.v_logging()
+
+    @classmethod
+    def make_parser(
+        cls,
+        parser_func: Callable = argparse.ArgumentParser,
+        *,
+        add_help: bool = False,
+        **kwargs,
+    ) -> argparse.ArgumentParser:
+        parser = super().make_parser(
+            parser_func,
+            add_help=add_help,
+            help="Keep loaded repositories resident between queries",
+            parents=[],
+            **kwargs,
+        )
+        parser.add_argument(
+            "--socket",
+            type=Path,
+            help="Path to the daemon's Unix socket."
+            f" Defaults to ${DAEMON_SOCKET_ENV}"
+            " or $XDG_RUNTIME_DIR/fedrq/daemon.sock",
+        )
+        parser.add_argument(
+            "--max-sacks",
+            type=int,
+            default=8,
+            help="Maximum number of (branch, repo, backend, ...)"
+            " sacks to keep in memory. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            default=3600,
+            help="Number of seconds after which a loaded sack is reloaded"
+            " to pick up new repodata. Default: %(default)s",
+        )
+        parser.add_argument("--debug", action="store_true")
+        return parser
+
+    def _run_command(self, argv: Sequence[str]) -> None:
+        # Import here to avoid a circular import
+        from fedrq.cli import COMMANDS, _make_parser, _run
+
+        args = _make_parser(argv).parse_args(argv)
+        # Clients keep these commands local, but don't trust them to
+        if not COMMANDS[args.action].DAEMON:
+            sys.exit(f"ERROR: 'fedrq {args.action}' cannot be run by the daemon")
+        _run(args, argv)
+
+    def run(self) -> None:
+        path: Path = self.args.socket or get_daemon_socket()
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        Command._rq_cache = SackCache(self.args.max_sacks, self.args.max_age or None)
+        server = _DaemonServer(path, self._run_command)
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            Command._rq_cache = None
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
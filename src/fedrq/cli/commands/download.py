@@ -9,30 +9,35 @@ from __future__ import annotations
 
 import argparse
 import logging
-import shutil
+import os
 import sys
-from collections.abc import Callable, Iterator
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import suppress
+from functools import partial
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any
-
-import requests
-import rpm
-
-from fedrq._archive import RPMArchive
-from fedrq._utils import exhaust_it
+from typing import TYPE_CHECKING, Any, TextIO
+
+from fedrq._download_cache import (
+    CHUNK_SIZE,
+    CacheBusyError,
+    DownloadCache,
+    get_download_cachedir,
+    link_or_copy,
+    new_hasher,
+)
+from fedrq._utils import exhaust_it, format_size
 from fedrq.backends.base import PackageCompat
-from fedrq.cli.base import Command
-
-_LOG = logging.getLogger(__name__)
+from fedrq.cli.base import Command, v_add_errors
 
+if TYPE_CHECKING:
+    import requests
+    import rpm
 
-def callback_ind(start: int, end: int) -> Callable[[Path], None]:
-    def inner(destpath: Path) -> None:
-        print(f"Downloading {destpath.name} ({start}/{end})")
-
-    return inner
+_LOG = logging.getLogger(__name__)
 
 
 def _get_req_kwargs(package: PackageCompat) -> dict[str, Any]:  # pragma: no cover
@@ -42,7 +47,7 @@ def _get_req_kwargs(package: PackageCompat) -> dict[str, Any]:  # pragma: no cov
     with suppress(AttributeError):
         repo_obj = repo_obj.get_config()
     if repo_obj.sslverify is False:
-        repo_obj["verify"] = False
+        req_kwargs["verify"] = False
     elif repo_obj.sslcacert:
         req_kwargs["verify"] = repo_obj.sslcacert
     if repo_obj.sslclientcert and repo_obj.sslclientkey:
@@ -50,19 +55,190 @@ def _get_req_kwargs(package: PackageCompat) -> dict[str, Any]:  # pragma: no cov
     return req_kwargs
 
 
+def _get_checksum(package: PackageCompat) -> tuple[str, str] | None:
+    """
+    Return the package's repodata checksum as a (type, hexdigest) tuple
+    """
+    try:
+        # dnf
+        return package.returnIdSum()  # type: ignore[attr-defined]
+    except AttributeError:
+        pass
+    # libdnf5
+    with suppress(AttributeError):
+        checksum = package.get_checksum()  # type: ignore[attr-defined]
+        return checksum.get_type_str(), checksum.get_checksum()
+    return None  # pragma: no cover
+
+
+def stream_to_file(
+    chunks: Iterable[bytes], dest: Path, checksum: tuple[str, str] | None = None
+) -> None:
+    """
+    Write `chunks` to a temporary file next to `dest` and atomically rename it
+    into place.
+
+    Args:
+        chunks:
+            Iterable of bytes to write
+        dest:
+            Destination path
+        checksum:
+            (type, hexdigest) tuple to verify the data against while it's
+            written.
+            `dest` is not created when the checksum doesn't match.
+
+    Raises:
+        ValueError: The checksum didn't match
+    """
+    hasher = new_hasher(checksum)
+    if checksum and not hasher:
+        _LOG.debug("Not verifying %s: unknown checksum type", dest.name)
+    fd, name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+    try:
+        with open(fd, "wb") as fp:
+            for chunk in chunks:
+                fp.write(chunk)
+                if hasher:
+                    hasher.update(chunk)
+        if hasher and checksum and hasher.hexdigest() != checksum[1]:
+            raise ValueError(
+                f"Checksum mismatch for {dest.name}:"
+                f" expected {checksum[0]}:{checksum[1]},"
+                f" got {checksum[0]}:{hasher.hexdigest()}"
+            )
+        os.chmod(name, 0o644)
+        os.replace(name, dest)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(name)
+        raise
+
+
+class SessionPool:
+    """
+    Thread-safe pool of HTTP sessions with one session per repo.
+    Each session is configured with the repo's TLS options,
+    and downloads from the same repo reuse its connections.
+    """
+
+    def __init__(self, maxsize: int = 1) -> None:
+        self.maxsize = maxsize
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, package: PackageCompat) -> requests.Session:
+        with self._lock:
+            if session := self._sessions.get(package.repoid):
+                return session
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            for key, value in _get_req_kwargs(package).items():
+                setattr(session, key, value)
+            self._sessions[package.repoid] = session
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class _Progress:
+    """
+    Aggregate progress line for concurrent downloads.
+    The line is only redrawn when `file` is a terminal.
+    """
+
+    def __init__(self, total: int, file: TextIO | None = None) -> None:
+        self.total = total
+        self.done = 0
+        self.size = 0
+        self.file = file or sys.stderr
+        self._tty = self.file.isatty()
+
+    def update(self, dest: Path) -> None:
+        self.done += 1
+        with suppress(OSError):
+            self.size += dest.stat().st_size
+        if self._tty:
+            print(f"\r{self}", end="", file=self.file, flush=True)
+
+    def finish(self) -> None:
+        print(f"\r{self}" if self._tty else self, file=self.file, flush=True)
+
+    def __str__(self) -> str:
+        return (
+            f"Downloaded {self.done}/{self.total} packages"
+            f" ({format_size(self.size)})"
+        )
+
+
+def _request(
+    package: PackageCompat,
+    url: str,
+    headers: Mapping[str, str],
+    sessions: SessionPool | None = None,
+) -> requests.Response:
+    """
+    Make a streaming GET request for one of `package`'s URLs
+    """
+    if sessions:
+        return sessions.get(package).get(
+            url, allow_redirects=True, stream=True, headers=headers
+        )
+    import requests
+
+    return requests.get(
+        url,
+        allow_redirects=True,
+        stream=True,
+        headers=headers,
+        **_get_req_kwargs(package),
+    )
+
+
 def download(
     package: PackageCompat,
     destdir: Path,
     callback: Callable[[Path], None] | None = None,
+    sessions: SessionPool | None = None,
+    cache: DownloadCache | None = None,
 ) -> Path:
+    """
+    Download `package` into `destdir`.
+    The package is streamed to disk in chunks and verified against its
+    repodata checksum.
+    Pass a SessionPool to reuse connections to the package's repo.
+    Pass a DownloadCache to reuse and resume remote downloads.
+    """
+    checksum = _get_checksum(package)
+    _get = partial(_request, package, sessions=sessions)
+
     def _remote_dl(url: str, src: Path, dest: Path) -> None:  # noqa: ARG001
-        req_kwargs = _get_req_kwargs(package)
-        req = requests.get(url, allow_redirects=True, **req_kwargs)
-        req.raise_for_status()
-        dest.write_bytes(req.content)
+        if cache and checksum and new_hasher(checksum):
+            try:
+                cached = cache.get(checksum) or cache.fetch(
+                    checksum, partial(_get, url)
+                )
+            except CacheBusyError:
+                _LOG.debug("Not using the download cache for %s", dest.name)
+            else:
+                link_or_copy(cached, dest)
+                return
+        with _get(url, {}) as req:
+            req.raise_for_status()
+            stream_to_file(req.iter_content(CHUNK_SIZE), dest, checksum)
 
     def _local_cp(url: str, src: Path, dest: Path) -> None:  # noqa: ARG001
-        shutil.copy2(src, dest)
+        with src.open("rb") as fp:
+            stream_to_file(iter(partial(fp.read, CHUNK_SIZE), b""), dest, checksum)
 
     url = package.remote_location()
     if not url:  # pragma: no cover
@@ -92,10 +268,20 @@ class DownloadCommand(Command):
     No gpg checking is preformed.
     """
 
+    # Downloads may prompt for confirmation
+    DAEMON = False
+
     def __init__(self, args: argparse.Namespace) -> None:
         super().__init__(args)
+        self.v_parallel()
         self.v_default()
 
+    @v_add_errors
+    def v_parallel(self) -> str | None:
+        if self.args.parallel < 1:
+            return "--parallel must be at least 1"
+        return None
+
     @classmethod
     def make_parser(
         cls,
@@ -117,8 +303,19 @@ class DownloadCommand(Command):
             **kwargs,
         )
         parser.add_argument("-o", "--destdir", type=Path, default=Path())
+        cls._add_parallel_arg(parser)
         return parser
 
+    @staticmethod
+    def _add_parallel_arg(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            default=3,
+            metavar="N",
+            help="Number of packages to download at once. Default: %(default)s",
+        )
+
     def _select_packages(self) -> None:
         self.query = self.rq.resolve_pkg_specs(
             self.args.names, self.args.resolve_packages, self.args.latest
@@ -145,15 +342,54 @@ class DownloadCommand(Command):
         print("Exiting...", file=sys.stderr)
         return False
 
+    def _fetch(
+        self,
+        package: PackageCompat,
+        destdir: Path,
+        sessions: SessionPool,
+        cache: DownloadCache | None,
+    ) -> Path:
+        """
+        Fetch a single package.
+        This runs in a worker thread.
+        """
+        return download(package, destdir, sessions=sessions, cache=cache)
+
     def _downloadit(self, destdir: Path) -> Iterator[tuple[PackageCompat, Path]]:
-        size = len(self.query)
-        for ind, package in enumerate(self.query):
-            try:
-                dest = download(package, destdir, callback_ind(ind + 1, size))
+        """
+        Download the packages concurrently.
+        Packages are yielded as they finish downloading.
+        """
+        progress = _Progress(len(self.query))
+        jobs = self.args.parallel
+        pool = SessionPool(jobs)
+        cache: DownloadCache | None = None
+        if self.config.download_cache_size:
+            cache = DownloadCache(
+                get_download_cachedir(), self.config.download_cache_size * 1024**2
+            )
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        try:
+            futures = {
+                executor.submit(self._fetch, package, destdir, pool, cache): package
+                for package in self.query
+            }
+            for future in as_completed(futures):
+                package = futures[future]
+                try:
+                    dest = future.result()
+                except Exception as exc:
+                    _LOG.debug("Handled error:", exc_info=exc)
+                    executor.shutdown(cancel_futures=True)
+                    sys.exit(f"Failed to download {package}: {exc!r}")
+                progress.update(dest)
                 yield package, dest
-            except Exception as exc:
-                _LOG.debug("Handled error:", exc_info=exc)
-                sys.exit(f"Failed to download {package}: {exc!r}")
+            progress.finish()
+        finally:
+            executor.shutdown(cancel_futures=True)
+            pool.close()
+            if cache:
+                cache.evict()
 
     def run(self) -> None:
         self._select_packages()
@@ -189,6 +425,7 @@ class DownloadSpecCommand(DownloadCommand):
             **kwargs,
         )
         parser.add_argument("-o", "--destdir", type=Path, default=Path())
+        cls._add_parallel_arg(parser)
         parser.add_argument(
             "--gpgcheck",
             action=argparse.BooleanOptionalAction,
@@ -197,22 +434,86 @@ class DownloadSpecCommand(DownloadCommand):
             " The keys must be part of the system RPM keyring."
             " Default: --no-gpgcheck",
         )
+        parser.add_argument(
+            "--stream-spec",
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help="Extract the specfile while the SRPM is downloading"
+            " and stop the transfer once the specfile has been read."
+            " SRPMs that are already in the download cache are read from the cache."
+            " Cannot be combined with --gpgcheck."
+            " Default: --stream-spec unless --gpgcheck is passed",
+        )
         parser.set_defaults(resolve_packages=False, arch="src")
         return parser
 
+    def v_default(self) -> None:
+        self.v_stream_spec()
+        super().v_default()
+
+    @v_add_errors
+    def v_stream_spec(self) -> str | None:
+        if not self.args.gpgcheck:
+            if self.args.stream_spec is None:
+                self.args.stream_spec = True
+            return None
+        # Streamed SRPMs aren't checked against the repodata checksum,
+        # and rpm only verifies the payload digest once it read all of it
+        if self.args.stream_spec:
+            return (
+                "--stream-spec cannot be combined with --gpgcheck."
+                " Pass --no-stream-spec to download and verify the full SRPMs."
+            )
+        self.args.stream_spec = False
+        return None
+
+    def _new_ts(self) -> rpm.TransactionSet:
+        import rpm
+
+        ts = rpm.TransactionSet()
+        if not self.args.gpgcheck:
+            ts.setVSFlags(rpm.RPMVSF_MASK_NOSIGNATURES)
+        return ts
+
+    def _fetch(
+        self,
+        package: PackageCompat,
+        destdir: Path,
+        sessions: SessionPool,
+        cache: DownloadCache | None,
+    ) -> Path:
+        from fedrq._archive import RPMArchive, extract_specfile_from_stream
+
+        # Each worker thread gets its own TransactionSet
+        ts = self._new_ts()
+        url = package.remote_location()
+        checksum = _get_checksum(package)
+        if (
+            self.args.stream_spec
+            and url
+            and not url.startswith("file://")
+            and not (cache and checksum and cache.get(checksum))
+        ):
+            with _request(package, url, {}, sessions) as req:
+                req.raise_for_status()
+                return extract_specfile_from_stream(
+                    req.iter_content(CHUNK_SIZE),
+                    self.args.destdir,
+                    name=Path(url).name,
+                    ts=ts,
+                )
+        dest = super()._fetch(package, destdir, sessions, cache)
+        try:
+            with RPMArchive(dest, ts=ts) as archive:
+                return archive.extract_specfile(self.args.destdir)
+        finally:
+            dest.unlink()
+
     def run(self) -> None:
         self._select_packages()
         for line in self.format():
             print(line)
         if not self._prompt():
             return
-
-        ts = rpm.TransactionSet()
-        if not self.args.gpgcheck:
-            ts.setVSFlags(rpm.RPMVSF_MASK_NOSIGNATURES)
         with TemporaryDirectory() as _tmp:
-            temp = Path(_tmp)
-            for _, dest in self._downloadit(temp):
-                with RPMArchive(dest, ts=ts) as archive:
-                    archive.extract_specfile(self.args.destdir)
-                dest.unlink()
+            exhaust_it(self._downloadit(Path(_tmp)))
@@ -16,6 +16,8 @@ class FormattersCommand(Command):
     List available formatters
     """
 
+    DAEMON = False
+
     def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
 
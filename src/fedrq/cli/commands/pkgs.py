@@ -16,6 +16,8 @@ class Pkgs(Command):
     NAMES can be package package name globs or NEVRs.
     """
 
+    SNAPSHOT = True
+
     def __init__(self, args: argparse.Namespace) -> None:
         super().__init__(args)
         self.v_default()
@@ -45,7 +47,26 @@ class Pkgs(Command):
         """
         return self.args.resolve_packages and super()._paths_need_filelists(names)
 
+    def _snapshot_supported(self) -> bool:
+        return not self.args.resolve_packages
+
+    def _run_snapshot(self) -> bool:
+        assert self.snapshot
+        resolved_packages = self.snapshot.resolve_pkg_specs(self.args.names)
+        if resolved_packages is None:
+            return False
+        packages = resolved_packages + self.snapshot.query_globs(self.args.names)
+        packages = self.snapshot.arch_filter(dict.fromkeys(packages), self.args.arch)
+        packages = self.snapshot.filter_latest(packages, self.args.latest)
+        for p in self.formatter.format(packages):  # type: ignore[arg-type]
+            print(p)
+        return True
+
     def run(self) -> None:
+        if self.snapshot:
+            if self._run_snapshot():
+                return
+            self.v_load_rq()
         self.query = self.rq.query(empty=True)
 
         resolved_packages = self.rq.resolve_pkg_specs(
@@ -7,8 +7,6 @@ import argparse
 import sys
 from collections import abc as cabc
 
-from pydantic import ValidationError
-
 from fedrq.cli.base import Command
 
 
@@ -17,11 +15,16 @@ class Repolist(Command):
     Display list of enabled repositories
     """
 
+    # Repolist only loads the repo configuration
+    DAEMON = False
+
     def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
         self._v_errors: list[str] = []
 
         self.v_logging()
+        from pydantic import ValidationError
+
         try:
             self.config = self._get_config()
         except ValidationError as exc:  # pragma: no cover
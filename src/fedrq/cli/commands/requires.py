@@ -0,0 +1,94 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+
+from fedrq.cli.commands._closure import ClosureCommand
+
+
+class Requires(ClosureCommand):
+    """
+    Find the packages that provide the dependencies of a list of packages.
+    When NAMEs are source packages, their BuildRequires are resolved.
+    When multiple packages provide the same dependency, all of them are
+    included.
+    """
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        super().__init__(args)
+        self.v_depth()
+        self.v_default()
+
+    @classmethod
+    def make_parser(
+        cls,
+        parser_func: Callable = argparse.ArgumentParser,
+        *,
+        add_help: bool = False,
+        **kwargs,
+    ) -> argparse.ArgumentParser:
+        parser = super().make_parser(
+            parser_func,
+            add_help=add_help,
+            help="Find the packages that provide the dependencies of a list of"
+            " packages",
+            parents=[cls.parent_parser(), cls.resolve_parser()],
+            **kwargs,
+        )
+        arch_group = parser.add_mutually_exclusive_group()
+        arch_group.add_argument(
+            "-A",
+            "--arch",
+            help="Only show packages that match ARCH",
+        )
+        arch_group.add_argument(
+            "-S",
+            "--notsrc",
+            dest="arch",
+            action="store_const",
+            const="notsrc",
+            help="This includes all binary RPMs. Multilib is excluded on x86_64. "
+            "Equivalent to --arch=notsrc",
+        )
+        parser.add_argument(
+            "--buildrequires",
+            action="store_true",
+            help="Treat NAMEs as source packages and resolve their BuildRequires."
+            " With --recursive, the runtime dependencies of the BuildRequires"
+            " are resolved after the first level.",
+        )
+        parser.add_argument(
+            "-W",
+            "--weak",
+            action="store_true",
+            help="Also follow Recommends",
+        )
+        cls._add_recursive_args(
+            parser, "Also find the packages that provide the results' dependencies"
+        )
+        return parser
+
+    def run(self) -> None:
+        packages = self.rq.resolve_pkg_specs(
+            self.args.names,
+            self.args.resolve_packages,
+            self.args.latest,
+            with_src=self.args.buildrequires,
+        )
+        if self.args.buildrequires:
+            packages.filterm(arch="src")
+        depths = self.rq.requires_closure(
+            packages,
+            self.args.depth if self._recursive else 1,
+            weak=self.args.weak,
+            latest=self.args.latest,
+        )
+        if self._recursive:
+            self._print_closure(depths)
+            return
+        self.query = self.rq.query(pkg=list(depths), arch=self.args.arch)
+        for p in self.format():
+            print(p)
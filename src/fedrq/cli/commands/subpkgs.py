@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import argparse
 from collections.abc import Callable
+from fnmatch import fnmatchcase
 
 from fedrq.cli.base import Command, v_add_errors
 
@@ -15,6 +16,8 @@ class Subpkgs(Command):
     For each SRPM name, list the subpackages that it provides
     """
 
+    SNAPSHOT = True
+
     def __init__(self, args: argparse.Namespace) -> None:
         super().__init__(args)
         self.v_default()
@@ -62,7 +65,40 @@ class Subpkgs(Command):
         )
         return parser
 
+    def _snapshot_supported(self) -> bool:
+        return True
+
+    def _run_snapshot(self) -> bool:
+        assert self.snapshot
+        srpms = self.snapshot.resolve_pkg_specs(self.args.names)
+        if srpms is None:
+            return False
+        srpms = [
+            package
+            for package in self.snapshot.filter_latest(srpms, self.args.latest)
+            if package.arch == "src"
+        ]
+        packages = self.snapshot.filter_latest(
+            self.snapshot.get_subpackages(srpms), self.args.latest
+        )
+        packages = self.snapshot.arch_filter(packages, self.args.arch)
+        if self.args.include_src:
+            packages = list(dict.fromkeys([*packages, *srpms]))
+        if self.args.match:
+            packages = [
+                package
+                for package in packages
+                if any(fnmatchcase(package.name, match) for match in self.args.match)
+            ]
+        for p in self.formatter.format(packages):  # type: ignore[arg-type]
+            print(p)
+        return True
+
     def run(self) -> None:
+        if self.snapshot:
+            if self._run_snapshot():
+                return
+            self.v_load_rq()
         srpms = self.rq.resolve_pkg_specs(self.args.names, latest=self.args.latest)
         srpms.filterm(arch="src")
         self.query = self.rq.get_subpackages(
@@ -11,7 +11,7 @@ import typing as t
 
 from fedrq._utils import filter_latest, get_source_name
 from fedrq.backends.base import PackageCompat, PackageQueryCompat
-from fedrq.cli.base import Command
+from fedrq.cli.commands._closure import ClosureCommand
 from fedrq.cli.formatters import DefaultFormatters, Formatter
 
 logger = logging.getLogger(__name__)
@@ -35,14 +35,14 @@ class BreakdownFormatter(Formatter):
                 runtime.append(p)
         if runtime:
             yield "Runtime:"
-            for p in sorted(runtime):
+            for p in self._sorted(runtime):
                 yield p.name
             yield f"    {len(runtime)} total runtime dependencies"
             if buildtime:
                 yield ""
         if buildtime:
             yield "Buildtime:"
-            for p in sorted(buildtime):
+            for p in self._sorted(buildtime):
                 yield p.name
             yield f"    {len(buildtime)} total buildtime dependencies"
         yield ""
@@ -54,9 +54,11 @@ class BreakdownFormatter(Formatter):
 WhatFormatters = DefaultFormatters | dict(breakdown=BreakdownFormatter)
 
 
-class WhatCommand(Command):
+class WhatCommand(ClosureCommand):
     formatters = WhatFormatters
+    SNAPSHOT = True
     _exclude_subpackages_opt: bool = False
+    _recursive_opt: bool = False
     _operator: str
     operator: str
 
@@ -64,6 +66,7 @@ class WhatCommand(Command):
         super().__init__(args)
         if getattr(self.args, "extra_exact", None):
             self.args.exact = True
+        self.v_depth()
         self.v_default()
 
     @classmethod
@@ -108,24 +111,74 @@ class WhatCommand(Command):
 
         if cls._exclude_subpackages_opt:
             parser.add_argument("-X", "--exclude-subpackages", action="store_true")
+        if cls._recursive_opt:
+            cls._add_recursive_args(
+                parser, f"Also find the packages that {cls._operator} the results"
+            )
         return parser
 
-    def exclude_subpackages(self, rpms: t.Optional[PackageQueryCompat]) -> None:
-        import re
+    def _closure(
+        self,
+        roots: cabc.Iterable[PackageCompat],
+        exclude: cabc.Iterable[PackageCompat] = (),
+    ) -> dict[PackageCompat, int]:
+        """
+        Expand the direct reverse dependencies in `roots` according to
+        --recursive/--depth and return a mapping of packages to their depth
+        """
+        depth = self.args.depth
+        depths = {package: 1 for package in roots}
+        if depth != 1:
+            closure = self.rq.rdeps_closure(
+                depths,
+                self.operator,
+                None if depth is None else depth - 1,
+                latest=self.args.latest,
+                exclude=exclude,
+            )
+            for package, level in closure.items():
+                depths.setdefault(package, level + 1)
+        return depths
+
+    def _snapshot_supported(self) -> bool:
+        # Only --exact queries match reldeps by name.
+        # The other modes need the backend to resolve Provides.
+        return (
+            self.args.exact
+            and not self.args.extra_exact
+            and not getattr(self.args, "exclude_subpackages", None)
+            and not self._recursive
+            # Versioned reldeps (e.g., 'foo >= 1') need the backend
+            and not any(" " in name for name in self.args.names)
+        )
 
-        rpms = rpms or self.rq.resolve_pkg_specs(self.args.names, resolve=True)
-        brpms = self.rq.query(pkg=rpms, arch__neq="src")
-        srpms = self.rq.query(pkg=rpms, arch="src")
+    def _run_snapshot(self) -> None:
+        assert self.snapshot
+        packages = self.snapshot.query_reldeps(self.operator, self.args.names)
+        packages = self.snapshot.arch_filter(packages, self.args.arch)
+        packages = self.snapshot.filter_latest(packages, self.args.latest)
+        for p in self.formatter.format(packages):  # type: ignore[arg-type]
+            print(p)
 
-        brpm_sourcerpms = [
-            re.sub(r"\.rpm$", "", t.cast(str, pkg.sourcerpm)) for pkg in brpms
+    def exclude_subpackages(self, rpms: t.Optional[PackageQueryCompat]) -> None:
+        rpms = rpms or self.rq.resolve_pkg_specs(self.args.names, resolve=True)
+        index = self.rq.get_source_index()
+        nevrs = {index.get_source(package) for package in rpms}
+        nevrs.discard(None)
+        subpackages = [
+            package for nevr in nevrs for package in index.get_binaries(nevr)
         ]
-        brpm_srpm_query = self.rq.resolve_pkg_specs(brpm_sourcerpms)
-        subpackages = self.rq.get_subpackages(brpm_srpm_query.union(srpms))
         self.query.filterm(pkg__neq=subpackages)
 
     def run(self) -> None:
+        if self.snapshot:
+            self._run_snapshot()
+            return
         self.query = self.rq.query(empty=True)
+        recursive = self._recursive
+        # When recursing, the arch filter only applies to the final output
+        arch = None if recursive else self.args.arch
+        resolved_packages = None
         # Resolve self.args.names into Package objs.
         # This makes it so packages that depend on virtual Provides of the
         # names are included.
@@ -135,22 +188,28 @@ class WhatCommand(Command):
             )
             self._logq(resolved_packages, "resolved_packages")
             operator_kwargs = {self.operator: resolved_packages}
-            rp_rdeps = self.rq.query(**operator_kwargs, arch=self.args.arch)
+            rp_rdeps = self.rq.query(**operator_kwargs, arch=arch)
             self._logq(rp_rdeps, "rp_rdeps")
 
             self.query = self.query.union(rp_rdeps)
 
         operator_kwargs = {f"{self.operator}__glob": self.args.names}
-        glob_rdeps = self.rq.query(**operator_kwargs, arch=self.args.arch)
+        glob_rdeps = self.rq.query(**operator_kwargs, arch=arch)
         self._logq(glob_rdeps, "glob_rdeps")
 
         self.query = self.query.union(glob_rdeps)
         filter_latest(self.query, self.args.latest)
 
+        if recursive:
+            depths = self._closure(self.query, resolved_packages or ())
+            self.query = self.rq.query(pkg=list(depths))
         if getattr(self.args, "exclude_subpackages", None):
             self.exclude_subpackages(
                 resolved_packages if self.args.resolve_packages else None
             )
+        if recursive:
+            self._print_closure({package: depths[package] for package in self.query})
+            return
 
         query: cabc.Iterable[PackageCompat] | None = None
         if getattr(self.args, "extra_exact", None):
@@ -186,6 +245,7 @@ class Whatrequires(WhatCommand):
     _operator = "Require"
     operator = "requires"
     _exclude_subpackages_opt = True
+    _recursive_opt = True
 
 
 class Whatrecommends(WhatCommand):
@@ -199,6 +259,7 @@ class Whatrecommends(WhatCommand):
     _operator = "Recommend"
     operator = "recommends"
     _exclude_subpackages_opt = True
+    _recursive_opt = True
 
 
 class Whatsuggests(WhatCommand):
@@ -249,7 +310,9 @@ class WhatrequiresSrc(WhatCommand):
     This command is a shortcut for `fedrq whatrequires $(fedrq subpkgs ...)`.
     """
 
+    SNAPSHOT = False
     _exclude_subpackages_opt = True
+    _recursive_opt = True
     _operator = "Require"
     operator = "requires"
 
@@ -298,6 +361,9 @@ class WhatrequiresSrc(WhatCommand):
             const="src",
             help="This is equivalent to --arch=src.",
         )
+        cls._add_recursive_args(
+            parser, f"Also find the packages that {cls._operator} the results"
+        )
         return parser
 
     def run(self) -> None:
@@ -305,6 +371,16 @@ class WhatrequiresSrc(WhatCommand):
             arch="src"
         )
         subpackages = self.rq.get_subpackages(srpms)
+        if self._recursive:
+            rdeps = self.rq.query(
+                **{self.operator: subpackages}, latest=self.args.latest
+            )
+            depths = self._closure(rdeps, subpackages)
+            if self.args.exclude_subpackages:
+                for package in subpackages:
+                    depths.pop(package, None)
+            self._print_closure(depths)
+            return
         qkwargs = {
             self.operator: subpackages,
             "arch": self.args.arch,
@@ -8,12 +8,15 @@ import abc
 import argparse
 import logging
 import re
-from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
 from contextlib import suppress
 from functools import partial
+from itertools import islice
 from typing import TYPE_CHECKING, Any, ClassVar, NoReturn, cast
+from weakref import WeakKeyDictionary
 
-from fedrq._utils import get_source_name
+from fedrq._reldeps import parse_reldep
+from fedrq._utils import get_source_name, sort_packages
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -88,6 +91,9 @@ _ATTRS_SINGLE: tuple[str, ...] = tuple(
     set(_ATTRS) - _MULTILINE_ATTRS  # pyright: ignore[reportOperatorIssue]
 )
 _DEFAULT_MULTILINE_SEPERATOR = "\n---\n"
+# Number of packages whose attributes are extracted at once by
+# SpecialFormatter._iter_values()
+_COLUMN_BATCH_SIZE = 1024
 
 
 def _stringify(
@@ -108,6 +114,9 @@ def _stringify(
 class Formatter(metaclass=abc.ABCMeta):
     ATTRS = _ATTRS
     MULTILINE = False
+    # Whether to sort packages before formatting them.
+    # When False, lines are yielded as soon as the backend produces packages.
+    sort: bool = True
 
     """
     Convert PackageCompat objects into a string representation
@@ -141,7 +150,27 @@ class Formatter(metaclass=abc.ABCMeta):
         Convert an Iterable of PackageCompat objects
         (or a PackageQueryCompat object) to an Iterable of str.
         """
-        yield from map(self.format_line, sorted(packages))
+        yield from map(self.format_line, self._sorted(packages))
+
+    def _sorted(self, packages: Iterable[PackageCompat]) -> Iterable[PackageCompat]:
+        return sort_packages(packages) if self.sort else packages
+
+    @property
+    def needs_filelists(self) -> bool:
+        """
+        Whether the formatter needs the filelists metadata
+        """
+        return False
+
+    @property
+    def resolves_deps_lazily(self) -> bool:
+        """
+        Whether format() may resolve dependencies after it already yielded
+        some lines.
+        Those queries may need the filelists when it's too late to rerun the
+        command with them.
+        """
+        return False
 
     def err(self, msg: str) -> NoReturn:
         raise FormatterError(f"{self.name!r} FormatterError: {msg}")
@@ -349,7 +378,24 @@ class Formatters(Mapping[str, type[Formatter]]):
 
 class SourceFromatter(Formatter):
     def format(self, packages: Iterable[PackageCompat]) -> Iterable[str]:
-        return sorted(set(map(self.format_line, packages)))
+        # Reuse the source package index if something else already built it
+        index = self.rq.get_source_index(build=False) if self.rq else None
+        lines = (
+            (index.get_source_name(p) or self.format_line(p) for p in packages)
+            if index
+            else map(self.format_line, packages)
+        )
+        if self.sort:
+            return sorted(set(lines))
+        return self._format_unique(lines)
+
+    @staticmethod
+    def _format_unique(lines: Iterable[str]) -> Iterator[str]:
+        seen: set[str] = set()
+        for line in lines:
+            if line not in seen:
+                seen.add(line)
+                yield line
 
     def format_line(self, package: PackageCompat) -> str:
         return get_source_name(package)
@@ -361,6 +407,15 @@ class SpecialFormatter(Formatter):
     """
 
     ATTRS: tuple[str, ...] = Formatter.ATTRS
+    # The attributes and nested formatters that are used to format packages
+    attrs: Sequence[str | Formatter] = ()
+
+    @property
+    def needs_filelists(self) -> bool:
+        return any(
+            attr == "files" if isinstance(attr, str) else attr.needs_filelists
+            for attr in self.attrs
+        )
 
     def _get_attrs(
         self, args: str | list[str], allow_multiline: bool = False
@@ -387,6 +442,28 @@ class SpecialFormatter(Formatter):
         if not self.args.strip() or self.args.strip() == ",":
             self.err("received less than 1 argument")
 
+    def _iter_values(
+        self, packages: Iterable[PackageCompat], attrs: Collection[str]
+    ) -> Iterator[tuple[PackageCompat, Mapping[str, Any]]]:
+        """
+        Yield each package with a mapping of `attrs` to their values.
+        When more than one attribute is requested, they're extracted in
+        batches with `RepoqueryBase.fetch_columns()`.
+        """
+        if self.rq is None or len(attrs) < 2:
+            for package in packages:
+                yield package, {attr: getattr(package, attr) for attr in attrs}
+            return
+        iterator = iter(packages)
+        while batch := list(islice(iterator, _COLUMN_BATCH_SIZE)):
+            columns = self.rq.fetch_columns(batch, attrs)
+            for package, values in zip(batch, zip(*columns.values())):
+                yield package, dict(zip(columns, values))
+
+
+def _escape_format(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
 
 class QueryFormatFormatter(SpecialFormatter):
     """
@@ -403,48 +480,47 @@ class QueryFormatFormatter(SpecialFormatter):
             self.err("Unterminated query format string")
         # Don't allow nested queryformat strings
         self.container = self.container.without(formatters={type(self)})
-        self._matches = list(self._REGEX.finditer(self.args))
-        self._attrs = {
-            macro: next(self._get_attrs([macro], False))
-            for macro in {
-                macro.group("macro")
-                for macro in self._matches
-                if not macro.group("leading")
-            }
-        }
+        self._compile()
+
+    def _compile(self) -> None:
+        """
+        Compile the query format string into a str.format() template
+        and the getters that fill its fields
+        """
+        attrs: dict[str, str | Formatter] = {}
+        template: list[str] = []
+        getters: list[Callable[[PackageCompat], str]] = []
+        pos = 0
+        for match_obj in self._REGEX.finditer(self.args):
+            template.append(_escape_format(self.args[pos : match_obj.start()]))
+            pos = match_obj.end()
+            if match_obj.group("leading"):
+                # %%{macro} is an escaped literal %{macro}
+                literal = self.args[match_obj.end("leading") : pos]
+                template.append(_escape_format(literal))
+                continue
+            macro = match_obj.group("macro")
+            if macro not in attrs:
+                attrs[macro] = next(self._get_attrs([macro], False))
+            template.append("{}")
+            getters.append(self._getter(attrs[macro]))
+        template.append(_escape_format(self.args[pos:]))
+        self._template = "".join(template)
+        self._getters = tuple(getters)
+        self.attrs = tuple(attrs.values())
+
+    @staticmethod
+    def _getter(attr: str | Formatter) -> Callable[[PackageCompat], str]:
+        if not isinstance(attr, str):
+            return attr.format_line
+
+        def getter(package: PackageCompat) -> str:
+            return _stringify(getattr(package, attr), multiline_allowed=False)
+
+        return getter
 
     def format_line(self, package: PackageCompat) -> str:
-        def fmt_part(
-            full_string: str, match_obj: re.Match, package: PackageCompat
-        ) -> str:
-            groups = match_obj.groupdict()
-            leading = groups["leading"]
-            macro = groups["macro"]
-            if leading:
-                return full_string[match_obj.end("leading") :]
-            attr = self._attrs[macro]
-            if isinstance(attr, str):
-                return _stringify(
-                    getattr(package, attr),
-                    multiline_allowed=False,
-                )
-            return attr.format_line(package)
-
-        string = self.args
-        matches = self._matches
-        if not matches:
-            return string
-        parts: list[str] = []
-        for idx, match_obj in enumerate(matches):
-            a, z = match_obj.span()
-            if idx == 0:
-                parts.append(string[:a])
-            parts.append(fmt_part(string, match_obj, package))
-            if idx + 1 < len(matches):
-                parts.append(string[z : matches[idx + 1].start()])
-            else:
-                parts.append(string[z:])
-        return "".join(parts)
+        return self._template.format(*[getter(package) for getter in self._getters])
 
 
 class AttrFormatter(SpecialFormatter):
@@ -461,12 +537,16 @@ class AttrFormatter(SpecialFormatter):
             raise FormatterError(f"'{self.args}' is not a valid attribute")
         self.attr = self.args
 
+    @property
+    def needs_filelists(self) -> bool:
+        return self.attr == "files"
+
     def format_line(self, package: PackageCompat) -> str:
         # Return one string if there's multiple lines
         return "\n".join(self.format([package]))
 
     def format(self, packages: Iterable[PackageCompat]) -> Iterable[str]:
-        for p in sorted(packages):
+        for p in self._sorted(packages):
             result = getattr(p, self.attr)
             if isinstance(result, Iterable) and not isinstance(result, str):
                 yield from map(
@@ -508,11 +588,14 @@ class JsonFormatter(SpecialFormatter):
     def validate(self) -> None:
         super().validate()
         self.attrs: list[Formatter | str] = list(self._get_attrs(self.args))
+        self._str_attrs = [attr for attr in self.attrs if isinstance(attr, str)]
 
-    def _format(self, package: PackageCompat) -> Iterable[tuple[str, Any]]:
+    def _format(
+        self, package: PackageCompat, values: Mapping[str, Any]
+    ) -> Iterable[tuple[str, Any]]:
         for attr in self.attrs:
             if isinstance(attr, str):
-                result = getattr(package, attr)
+                result = values[attr]
                 if isinstance(result, Iterable) and not isinstance(result, str):
                     result = [str(i) for i in result]
             else:
@@ -522,12 +605,36 @@ class JsonFormatter(SpecialFormatter):
     def format(self, packages: Iterable[PackageCompat]):
         import json
 
-        data = [dict(self._format(package)) for package in packages]
+        data = [
+            dict(self._format(package, values))
+            for package, values in self._iter_values(packages, self._str_attrs)
+        ]
         yield json.dumps(data, indent=2)
 
     format_line = format_line_notimplemented
 
 
+class NdjsonFormatter(JsonFormatter):
+    """
+    Write one compact JSON object per package as soon as it's formatted.
+    Like the json formatter, packages are written in iteration order.
+    """
+
+    def format(self, packages: Iterable[PackageCompat]) -> Iterator[str]:
+        for package, values in self._iter_values(packages, self._str_attrs):
+            yield self._dumps(package, values)
+
+    def format_line(self, package: PackageCompat) -> str:
+        return self._dumps(
+            package, {attr: getattr(package, attr) for attr in self._str_attrs}
+        )
+
+    def _dumps(self, package: PackageCompat, values: Mapping[str, Any]) -> str:
+        import json
+
+        return json.dumps(dict(self._format(package, values)), separators=(",", ":"))
+
+
 class SingleLineFormatter(SpecialFormatter):
     DEFAULT_DIVIDER = " : "
     ATTRS: tuple[str, ...] = _ATTRS_SINGLE
@@ -573,11 +680,14 @@ class SingleLineFormatter(SpecialFormatter):
         attr: str | Formatter,
         divider: str,
         multiline_allowed=False,
+        *,
+        values: Mapping[str, Any] | None = None,
     ) -> str:
         out = ""
         if isinstance(attr, str):
             out += _stringify(
-                getattr(package, attr), multiline_allowed=multiline_allowed
+                values[attr] if values is not None else getattr(package, attr),
+                multiline_allowed=multiline_allowed,
             )
         else:
             attr.rq = self.rq
@@ -586,12 +696,19 @@ class SingleLineFormatter(SpecialFormatter):
             out += divider
         return out
 
-    def format_line(self, package: PackageCompat) -> str:
+    def format_line(
+        self, package: PackageCompat, values: Mapping[str, Any] | None = None
+    ) -> str:
         out = ""
         for index, attr in enumerate(self.attrs):
-            out += self._fl(package, index, attr, self.divider)
+            out += self._fl(package, index, attr, self.divider, values=values)
         return out
 
+    def format(self, packages: Iterable[PackageCompat]) -> Iterator[str]:
+        attrs = [attr for attr in self.attrs if isinstance(attr, str)]
+        for package, values in self._iter_values(self._sorted(packages), attrs):
+            yield self.format_line(package, values)
+
 
 class MultilineFormatter(SingleLineFormatter):
     ATTRS = SpecialFormatter.ATTRS
@@ -606,7 +723,7 @@ class MultilineFormatter(SingleLineFormatter):
             self.err("requires two arguments")
 
     def format(self, packages: Iterable[PackageCompat]) -> Iterator[str]:
-        for package in sorted(packages):
+        for package in self._sorted(packages):
             initial = self._fl(package, 0, self.attrs[0], self.divider, False)
             attr = self.attrs[1]
             call: Formatter = (
@@ -626,10 +743,76 @@ def remote_location(_, package: PackageCompat) -> str:
     return _stringify(package.remote_location())
 
 
+class _ReldepIndex:
+    """
+    Cache of requirement strings to the packages that provide them
+    """
+
+    def __init__(self, rq: RepoqueryBase) -> None:
+        self.rq = rq
+        self._providers: dict[str, frozenset[PackageCompat]] = {}
+
+    def prime(self, reldeps: Iterable[str]) -> None:
+        """
+        Resolve all of the reldeps that aren't cached yet at once
+        """
+        missing = [reldep for reldep in reldeps if reldep not in self._providers]
+        if not missing:
+            return
+        # All of the simple reldeps are matched with one provides query and
+        # one file query. Only rich dependencies are resolved individually.
+        rich: list[str] = []
+        simple: list[str] = []
+        for reldep in missing:
+            if reldep.startswith("/") or parse_reldep(reldep):
+                simple.append(reldep)
+            else:
+                rich.append(reldep)
+        mapping: dict[str, Iterable[PackageCompat]] = dict(
+            self.rq.resolve_deps_mapping(simple, glob=False)
+        )
+        if rich:
+            mapping.update(
+                self.rq.resolve_pkg_specs_mapping(rich, resolve=True, with_src=False)
+            )
+        for reldep, packages in mapping.items():
+            self._providers[reldep] = frozenset(packages)
+
+    def __getitem__(self, reldep: str) -> frozenset[PackageCompat]:
+        self.prime([reldep])
+        return self._providers[reldep]
+
+
+# The sack never changes after it's loaded,
+# so the index can be shared by all formatters using the same Repoquery
+_RELDEP_INDEXES: WeakKeyDictionary[RepoqueryBase, _ReldepIndex] = WeakKeyDictionary()
+
+
+def _get_reldep_index(rq: RepoqueryBase) -> _ReldepIndex:
+    if (index := _RELDEP_INDEXES.get(rq)) is None:
+        index = _RELDEP_INDEXES[rq] = _ReldepIndex(rq)
+    return index
+
+
 class RequiresMatchFormatter(SpecialFormatter):
     format_line = format_line_notimplemented
     _WRSRC: bool = False
     MULTILINE = True
+    _match_packages: tuple[RepoqueryBase, frozenset[PackageCompat]] | None = None
+
+    def _get_match_packages(self, rq: RepoqueryBase) -> frozenset[PackageCompat]:
+        if self._match_packages and self._match_packages[0] is rq:
+            return self._match_packages[1]
+        match_names = self.args.split(";") if ";" in self.args else self.args.split(",")
+        if self._WRSRC:
+            src_packages = rq.resolve_pkg_specs(match_names).filterm(arch="src")
+            match_packages = frozenset(rq.get_subpackages(src_packages))
+        else:
+            match_packages = frozenset(
+                rq.resolve_pkg_specs(match_names, resolve=False, with_src=False)
+            )
+        self._match_packages = (rq, match_packages)
+        return match_packages
 
     def format(self, packages: Iterable[PackageCompat]) -> Iterator[str]:
         if not self.rq:
@@ -637,19 +820,11 @@ class RequiresMatchFormatter(SpecialFormatter):
         requires = {
             str(require) for package in packages for require in package.requires
         }
-        match_names = self.args.split(";") if ";" in self.args else self.args.split(",")
-        if self._WRSRC:
-            src_packages = self.rq.resolve_pkg_specs(match_names).filterm(arch="src")
-            match_packages = set(self.rq.get_subpackages(src_packages))
-        else:
-            match_packages = set(
-                self.rq.resolve_pkg_specs(match_names, resolve=False, with_src=False)
-            )
+        match_packages = self._get_match_packages(self.rq)
+        index = _get_reldep_index(self.rq)
+        index.prime(requires)
         for reldep in requires:
-            if (
-                set(self.rq.resolve_pkg_specs([reldep], resolve=True, with_src=False))
-                & match_packages
-            ):
+            if not index[reldep].isdisjoint(match_packages):
                 yield reldep
 
 
@@ -660,8 +835,22 @@ class RequiresMatchSrcFormatter(RequiresMatchFormatter):
 class _RequiresMatchPrefixFormatter(RequiresMatchFormatter):
     PREFIX: ClassVar[str | staticmethod[[PackageCompat], str]]
 
+    @property
+    def resolves_deps_lazily(self) -> bool:
+        # Unsorted packages are resolved one at a time
+        return not self.sort
+
     def format(self, packages: Iterable[PackageCompat]) -> Iterator[str]:
-        for package in sorted(packages):
+        if not self.rq:
+            raise TypeError("self.rq is not set")
+        if self.sort:
+            packages = sort_packages(packages)
+            # Resolve all of the packages' requirements at once instead of
+            # separately for each package
+            _get_reldep_index(self.rq).prime(
+                {str(require) for package in packages for require in package.requires}
+            )
+        for package in packages:
             prefix_fmt = self.PREFIX
             prefix = (
                 prefix_fmt(package)
@@ -704,6 +893,8 @@ DefaultFormatters = Formatters(
         "qf": QueryFormatFormatter,
         "attr": AttrFormatter,
         "json": JsonFormatter,
+        "ndjson": NdjsonFormatter,
+        "jsonl": NdjsonFormatter,
         "line": SingleLineFormatter,
         "remote_location": remote_location,
         "multiline": MultilineFormatter,
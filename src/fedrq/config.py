@@ -10,7 +10,9 @@ from __future__ import annotations
 
 import importlib.resources as importlib_resources
 import itertools
+import json
 import logging
+import operator
 import os
 import re
 import sys
@@ -18,7 +20,7 @@ import typing as t
 import warnings
 import zipfile
 from collections.abc import Callable, Mapping
-from enum import auto as auto_enum
+from contextvars import ContextVar
 from pathlib import Path
 
 if sys.version_info < (3, 11):
@@ -32,8 +34,8 @@ else:
 
 from pydantic import BaseModel, Field, PrivateAttr, validator
 
-from fedrq._compat import StrEnum
-from fedrq._config import ConfigError
+from fedrq import _filter_pydantic_v2_warnings
+from fedrq._config import ConfigError, LoadFilelists
 from fedrq._utils import merge_dict, mklog
 from fedrq.backends import BACKENDS, get_default_backend
 from fedrq.backends.base import BaseMakerBase, PackageCompat, RepoqueryBase
@@ -47,23 +49,25 @@ if t.TYPE_CHECKING:
     from fedrq.backends.dnf.backend import Repoquery as _dnfRepoquery
     from fedrq.backends.libdnf5.backend import Repoquery as _libdnf5RepoQuery
 
+_filter_pydantic_v2_warnings()
+
 CONFIG_DIRS = (Path.home() / ".config/fedrq", Path("/etc/fedrq"))
 DEFAULT_REPO_CLASS = "base"
 DEFAULT_COPR_BASEURL = "https://copr.fedoraproject.org"
+# Bump this when the format of the validated config cache changes
+CONFIG_CACHE_VERSION = 3
+# Listings of the repo dirs that are shared by the ReleaseConfig validators
+# during a get_config() call
+_REPO_DIR_LISTINGS: ContextVar[dict[str, dict[str, t.Any]] | None] = ContextVar(
+    "_REPO_DIR_LISTINGS", default=None
+)
 logger = logging.getLogger(__name__)
 
 
-class LoadFilelists(StrEnum):
-    auto = auto_enum()
-    always = auto_enum()
-    never = auto_enum()
-
-    @classmethod
-    def from_bool(cls, /, boolean: bool) -> LoadFilelists:
-        return cls.always if boolean else cls.never
-
-    def __bool__(self) -> bool:
-        return self == LoadFilelists.always
+def _get_repogs(
+    repogs: Repos, defs: dict[str, list[str]], repo_aliases: dict[str, str]
+) -> Repos:
+    return repogs | defs | AliasRepoG.from_str_mapping(repo_aliases)
 
 
 class ReleaseConfig(BaseModel):
@@ -94,9 +98,7 @@ class ReleaseConfig(BaseModel):
 
     @validator("repogs", always=True)
     def _v_repogs(cls, value: Repos, values: dict[str, t.Any]) -> Repos:
-        return (
-            value | values["defs"] | AliasRepoG.from_str_mapping(values["repo_aliases"])
-        )
+        return _get_repogs(value, values["defs"], values["repo_aliases"])
 
     @validator("full_def_paths", always=True, pre=True)
     def _v_full_def_paths(cls, value, values) -> list[t.Union[Traversable, Path]]:
@@ -139,23 +141,44 @@ class ReleaseConfig(BaseModel):
             return True
 
     @staticmethod
-    def _repo_dir_iterator(
+    def _list_repo_dir(
+        topdir: t.Union[Traversable, Path],
+    ) -> dict[str, t.Union[Traversable, Path]]:
+        """
+        Returns:
+            A mapping of filenames to files in `topdir`
+        """
+        if not topdir.is_dir():
+            return {}
+        return {file.name: file for file in topdir.iterdir() if file.is_file()}
+
+    @classmethod
+    def _repo_dir_listings(
+        cls,
         repo_dirs: list[Path],
-    ) -> t.Iterator[t.Union[Traversable, Path]]:
-        flog = mklog(__name__, "ReleaseConfig", "_repo_dir_iterator")
+    ) -> t.Iterator[dict[str, t.Union[Traversable, Path]]]:
+        """
+        Yield the listings of each repo dir in order of precedence.
+        Directories are only listed when needed.
+        During a get_config() call, the listings are shared between releases.
+        """
+        flog = mklog(__name__, "ReleaseConfig", "_repo_dir_listings")
         topdirs: tuple[t.Union[Traversable, Path], ...] = (
             *repo_dirs,
             importlib_resources.files("fedrq.data.repos"),
         )
         flog.debug("topdirs = %s", topdirs)
+        shared = _REPO_DIR_LISTINGS.get()
         for topdir in topdirs:
             if isinstance(topdir, Path):
                 topdir = topdir.expanduser()
-            if not topdir.is_dir():
+            if shared is None:
+                yield cls._list_repo_dir(topdir)
                 continue
-            for file in topdir.iterdir():
-                if file.is_file():
-                    yield file
+            key = str(topdir)
+            if key not in shared:
+                shared[key] = cls._list_repo_dir(topdir)
+            yield shared[key]
 
     @classmethod
     def _get_full_defpaths(
@@ -176,18 +199,14 @@ class ReleaseConfig(BaseModel):
                     flog.debug(f"Doesn't Exist: {path}")
                     missing_absolute.append(path)
         flog.debug(f"Getting relative defpaths: {defpaths}")
-        files = cls._repo_dir_iterator(repo_dirs)
-        while defpaths:
-            try:
-                file = next(files)
-                flog.debug(f"file={file}")
-            except StopIteration:
-                flog.debug(msg="StopIteration")
+        for listing in cls._repo_dir_listings(repo_dirs):
+            if not defpaths:
                 break
-            if file.name in defpaths:
-                flog.debug(f"{file.name} in {defpaths}")
-                full_defpaths.append(file)
-                defpaths.discard(file.name)
+            for defpath in sorted(defpaths):
+                if (file := listing.get(defpath)) is not None:
+                    flog.debug(f"Found {defpath}: {file}")
+                    full_defpaths.append(file)
+                    defpaths.discard(defpath)
         if defpaths:
             _missing = ", ".join(
                 sorted(str(p) for p in ((*defpaths, *missing_absolute)))
@@ -297,7 +316,7 @@ class Release:
             bm.load_filelists()
         if config.load_other_metadata is not None:
             bm.load_changelogs(config.load_other_metadata)
-        return bm.fill_sack() if fill_sack else bm.base
+        return bm.fill_sack(from_cache=config.cacheonly) if fill_sack else bm.base
 
     def _copr_repo(
         self, value: str, default_copr_baseurl: str = DEFAULT_COPR_BASEURL
@@ -326,6 +345,66 @@ class Release:
         return f"{copr_baseurl}/{frag}/repo/{chroot}"
 
 
+class _ReleaseDispatch:
+    """
+    Resolve branches to the ReleaseConfigs that may match them.
+    The matchers are combined into one alternation regex so a branch is
+    matched in one step.
+    """
+
+    def __init__(self, config: RQConfig) -> None:
+        self.config = config
+        self.releases_dict = config.releases
+        self.release_configs = tuple(config.releases.values())
+        # In order of precedence
+        self.releases = sorted(self.release_configs, key=lambda r: r.name, reverse=True)
+        self.regex = self._compile(self.releases)
+        # (branch, repo_name) -> the first ReleaseConfig that accepted them
+        self.memo: dict[tuple[str, str], ReleaseConfig] = {}
+
+    def is_current(self, config: RQConfig) -> bool:
+        """
+        Whether the dispatcher was built from `config`'s current releases.
+        This is checked on every get_release() call,
+        so it only compares identities.
+        """
+        return (
+            self.config is config
+            and self.releases_dict is config.releases
+            and len(self.release_configs) == len(config.releases)
+            and all(map(operator.is_, self.release_configs, config.releases.values()))
+        )
+
+    @staticmethod
+    def _compile(releases: list[ReleaseConfig]) -> re.Pattern | None:
+        default_flags = re.compile("").flags
+        if any(release.matcher.flags != default_flags for release in releases):
+            return None
+        try:
+            return re.compile(
+                "|".join(
+                    f"(?P<_r{index}>{release.matcher.pattern})"
+                    for index, release in enumerate(releases)
+                )
+            )
+        except re.error as exc:
+            # E.g., inline flags, backreferences, or duplicate group names
+            logger.debug("Failed to combine the release matchers: %s", exc)
+            return None
+
+    def candidates(self, branch: str) -> list[ReleaseConfig]:
+        """
+        Return the releases to try in order of precedence.
+        The first candidate is the first release whose matcher matches.
+        """
+        if self.regex is None:
+            return self.releases
+        if not (match := self.regex.fullmatch(branch)):
+            return []
+        # The outer group closes last, so it's always the last group
+        return self.releases[int(t.cast(str, match.lastgroup)[2:]) :]
+
+
 class RQConfig(BaseModel):
     backend: t.Optional[str] = None
     releases: dict[str, ReleaseConfig]
@@ -334,7 +413,12 @@ class RQConfig(BaseModel):
     load_other_metadata: t.Optional[bool] = None
     load_filelists: LoadFilelists = LoadFilelists.auto
     _backend_mod: BackendMod | None = PrivateAttr(None)
+    _release_dispatch: t.Optional[_ReleaseDispatch] = PrivateAttr(None)
     copr_baseurl: str = DEFAULT_COPR_BASEURL
+    cache_branches: list[str] = []
+    cacheonly: bool = False
+    download_cache_size: int = Field(2048, ge=0)
+    repofile_cache_ttl: int = Field(3600, ge=0)
 
     class Config:
         json_encoders: dict[t.Any, Callable[[t.Any], str]] = {
@@ -366,19 +450,22 @@ class RQConfig(BaseModel):
     def get_release(
         self, branch: str | None = None, repo_name: str | None = None
     ) -> Release:
-        flog = mklog(__name__, "RQConfig", "get_releases")
         branch = branch or self.default_branch
         repo_name = repo_name or DEFAULT_REPO_CLASS
         pair = (branch, repo_name)
-        for release in sorted(
-            self.releases.values(), key=lambda r: r.name, reverse=True
-        ):
+        dispatch = self._get_release_dispatch()
+        # Each call gets its own Release object, as callers may modify it
+        if (memoized := dispatch.memo.get(pair)) is not None:
+            return memoized.get_release(self, branch=branch, repo_name=repo_name)
+        flog = mklog(__name__, "RQConfig", "get_releases")
+        for release in dispatch.candidates(branch):
             try:
                 r = release.get_release(self, branch=branch, repo_name=repo_name)
             except ConfigError as exc:
                 logger.debug(f"{release.name} does not match {pair}: {exc}")
             else:
                 flog.debug("%s matches %s", release.name, pair)
+                dispatch.memo[pair] = release
                 return r
         raise ConfigError(
             "{} does not much any of the configured releases: {}".format(
@@ -386,6 +473,14 @@ class RQConfig(BaseModel):
             )
         )
 
+    def _get_release_dispatch(self) -> _ReleaseDispatch:
+        # Rebuild the dispatcher if the config was copied or the releases were
+        # replaced, added, or removed.
+        dispatch = self._release_dispatch
+        if dispatch is None or not dispatch.is_current(self):
+            dispatch = self._release_dispatch = _ReleaseDispatch(self)
+        return dispatch
+
     @property
     def release_names(self) -> list[str]:
         return [rc.name for rc in self.releases.values()]
@@ -463,7 +558,11 @@ def _get_files(
     return sorted(files, key=lambda f: f.name, reverse=reverse)
 
 
-def _warn_extra_configs(config: Mapping[str, t.Any], source: object) -> None:
+def _warn_extra_configs(config: Mapping[str, t.Any], source: object) -> str | None:
+    """
+    Returns:
+        The warning message, if any
+    """
     extra_fields: list[str] = []
     for field in config:
         if field not in RQConfig.__fields__:  # type: ignore[operator]
@@ -471,9 +570,10 @@ def _warn_extra_configs(config: Mapping[str, t.Any], source: object) -> None:
     # This would be more efficient but doesn't preserve order.
     # extra_fields = config.keys() - RQConfig.__fields__.keys()  # type: ignore
     if extra_fields:
-        warnings.warn(
-            f"Unknown config options found in {source}: {extra_fields}", stacklevel=0
-        )
+        message = f"Unknown config options found in {source}: {extra_fields}"
+        warnings.warn(message, stacklevel=0)
+        return message
+    return None
 
 
 def get_config(**overrides: t.Any) -> RQConfig:
@@ -489,16 +589,24 @@ def get_config(**overrides: t.Any) -> RQConfig:
     flog = mklog(__name__, "get_config")
     flog.debug(f"CONFIG_DIRS = {CONFIG_DIRS}")
     config: dict[str, t.Any] = {}
-    all_files: list[list[t.Union[Traversable, Path]]] = [
-        _get_files(importlib_resources.files("fedrq.data"), ".toml"),
-        *(_get_files(p, ".toml") for p in reversed(CONFIG_DIRS)),
+    all_files: list[t.Union[Traversable, Path]] = [
+        *_get_files(importlib_resources.files("fedrq.data"), ".toml"),
+        *itertools.chain.from_iterable(
+            _get_files(p, ".toml") for p in reversed(CONFIG_DIRS)
+        ),
     ]
     flog.debug("all_files = %s", all_files)
-    for path in itertools.chain.from_iterable(all_files):
+    # The cache only stores the config files' results
+    cache_key = None if overrides else _config_cache_key(all_files)
+    if cache_key and (cached := _load_config_cache(cache_key)):
+        return cached
+    messages: list[str] = []
+    for path in all_files:
         flog.debug("Loading config file: %s", path)
         with path.open("rb") as fp:
             data = tomllib.load(t.cast("t.BinaryIO", fp))
-        _warn_extra_configs(data, path)
+        if message := _warn_extra_configs(data, path):
+            messages.append(message)
         merge_dict(data, config)
     # Env vars should override config file but NOT manually specified overrides.
     if "FEDRQ_BACKEND" in os.environ:
@@ -508,7 +616,172 @@ def get_config(**overrides: t.Any) -> RQConfig:
     merge_dict(overrides, config)
     config["releases"] = _get_releases(config["releases"])
     flog.debug("Final config: %s", config)
-    return RQConfig(**config)
+    token = _REPO_DIR_LISTINGS.set({})
+    try:
+        validated = RQConfig(**config)
+    finally:
+        _REPO_DIR_LISTINGS.reset(token)
+    if cache_key:
+        _write_config_cache(cache_key, validated, messages)
+    return validated
+
+
+def _stat_key(path: t.Union[Traversable, Path]) -> tuple[str, int, int] | None:
+    if not isinstance(path, Path):
+        # Files in a zip archive change along with the fedrq version
+        return None
+    try:
+        stat = path.expanduser().stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _get_config_cache_path() -> Path:
+    return get_smartcache_basedir() / "config-cache.json"
+
+
+def _config_cache_key(files: list[t.Union[Traversable, Path]]) -> tuple | None:
+    """
+    Return a key that identifies the inputs of the validated config or None
+    if the config cache is disabled
+    """
+    if os.environ.get("FEDRQ_NO_CONFIG_CACHE"):
+        return None
+    from fedrq import __version__
+
+    return (
+        CONFIG_CACHE_VERSION,
+        __version__,
+        sys.version,
+        # Catch changes to the models in development checkouts
+        _stat_key(Path(__file__)),
+        tuple(map(str, CONFIG_DIRS)),
+        tuple((str(path), _stat_key(path)) for path in files),
+        os.environ.get("FEDRQ_BACKEND"),
+        os.environ.get("FEDRQ_BRANCH"),
+    )
+
+
+def _config_dependencies(config: RQConfig) -> set[tuple[str, t.Any]]:
+    """
+    Return the paths that the validators probed and their stat results.
+    Adding or removing repo files changes the repo directory's mtime.
+    """
+    paths: set[t.Union[Traversable, Path]] = set()
+    for release in config.releases.values():
+        paths.update(release.repo_dirs)
+        paths.update(release.full_def_paths)
+    return {(str(path), _stat_key(path)) for path in paths}
+
+
+def _dump_def_path(path: t.Union[Traversable, Path]) -> list[str]:
+    if isinstance(path, Path):
+        return ["path", str(path)]
+    # Files in a zip archive are always from fedrq.data.repos
+    return ["resource", path.name]
+
+
+def _load_def_path(value: list[str]) -> t.Union[Traversable, Path]:
+    kind, path = value
+    if kind == "path":
+        return Path(path)
+    return importlib_resources.files("fedrq.data.repos").joinpath(path)
+
+
+# Conversions of the fields that JSON can't represent to JSON values and back
+_CacheCodecs = dict[str, tuple[Callable[[t.Any], t.Any], Callable[[t.Any], t.Any]]]
+_RELEASE_CACHE_CODECS: _CacheCodecs = {
+    "matcher": (operator.attrgetter("pattern"), re.compile),
+    "repo_dirs": (
+        lambda dirs: list(map(str, dirs)),
+        lambda dirs: list(map(Path, dirs)),
+    ),
+    "defpaths": (sorted, set),
+    "full_def_paths": (
+        lambda paths: list(map(_dump_def_path, paths)),
+        lambda paths: list(map(_load_def_path, paths)),
+    ),
+}
+_CONFIG_CACHE_CODECS: _CacheCodecs = {
+    "load_filelists": (operator.attrgetter("value"), LoadFilelists),
+}
+
+
+def _dump_fields(model: BaseModel, codecs: _CacheCodecs, skip: str) -> dict[str, t.Any]:
+    fields: dict[str, t.Any] = {}
+    for field in model.__fields__:  # type: ignore[attr-defined]
+        if field == skip:
+            continue
+        value = getattr(model, field)
+        fields[field] = codecs[field][0](value) if field in codecs else value
+    return fields
+
+
+def _load_fields(fields: dict[str, t.Any], codecs: _CacheCodecs) -> dict[str, t.Any]:
+    return {
+        field: codecs[field][1](value) if field in codecs else value
+        for field, value in fields.items()
+    }
+
+
+def _write_config_cache(key: tuple, config: RQConfig, messages: list[str]) -> None:
+    path = _get_config_cache_path()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    try:
+        data = {
+            "key": json.dumps(key),
+            "dependencies": list(_config_dependencies(config)),
+            "messages": messages,
+            "fields": _dump_fields(config, _CONFIG_CACHE_CODECS, "releases"),
+            "releases": {
+                name: _dump_fields(release, _RELEASE_CACHE_CODECS, "repogs")
+                for name, release in config.releases.items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as fp:
+            json.dump(data, fp)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.debug("Failed to write the config cache", exc_info=exc)
+        tmp.unlink(missing_ok=True)
+
+
+def _load_config_cache(key: tuple) -> RQConfig | None:
+    """
+    Load the validated config from the cache without parsing the config files
+    or running the pydantic validators.
+    Returns None if the cache is missing or out of date.
+    """
+    try:
+        with _get_config_cache_path().open(encoding="utf-8") as fp:
+            data = json.load(fp)
+        if data["key"] != json.dumps(key) or any(
+            _stat_key(Path(path)) != (stat and tuple(stat))
+            for path, stat in data["dependencies"]
+        ):
+            return None
+        releases = {}
+        for name, fields in data["releases"].items():
+            fields = _load_fields(fields, _RELEASE_CACHE_CODECS)
+            releases[name] = ReleaseConfig.construct(
+                **fields,
+                repogs=_get_repogs(
+                    DefaultRepoGs, fields["defs"], fields["repo_aliases"]
+                ),
+            )
+        config = RQConfig.construct(
+            **_load_fields(data["fields"], _CONFIG_CACHE_CODECS), releases=releases
+        )
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring invalid config cache", exc_info=exc)
+        return None
+    for message in data["messages"]:
+        warnings.warn(message, stacklevel=0)
+    return config
 
 
 def _get_releases(rdict: dict[str, dict[str, t.Any]]) -> dict[str, t.Any]:
@@ -7,8 +7,6 @@ from __future__ import annotations
 
 import abc
 import logging
-import os
-import tempfile
 from collections.abc import (
     Callable,
     Iterable,
@@ -16,40 +14,55 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
-from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, NoReturn
-
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, NoReturn, cast
 
 from fedrq._config import ConfigError
+from fedrq._utils import exhaust_it
 
 if TYPE_CHECKING:
     from fedrq.backends.base import BaseMakerBase
     from fedrq.config import Release, RQConfig
 
 LOG = logging.getLogger(__name__)
+# Maximum number of repo groups that are prefetched at once
+PREFETCH_WORKERS = 8
 
 
-@contextmanager
-def _get_file(path: str) -> Iterator[str]:
+def _fetch_file(path: str, config: RQConfig | None = None) -> str:
+    """
+    Return a local path for a repo file path or URL.
+    Remote files are downloaded into the repo file cache.
+    """
     if path.startswith(("http://", "https://")):
-        LOG.info("Downloading %s", path)
-        req = requests.get(path)
-        if req.status_code != 200:
-            raise ConfigError(f"Failed to download {path}")
-        name = None
-        try:
-            fd, name = tempfile.mkstemp()
-            os.write(fd, req.content)
-            os.close(fd)
-            yield name
-        finally:
-            if name:
-                os.unlink(name)
+        from fedrq._repofile_cache import RepofileCache
+        from fedrq.config import get_smartcache_basedir
+
+        cache = RepofileCache(
+            get_smartcache_basedir() / "repofiles",
+            config.repofile_cache_ttl if config else 0,
+            offline=bool(config and config.cacheonly),
+        )
+        return str(cache.get(path))
     elif path.startswith("file://"):
-        yield path[7:]
+        return path[7:]
     else:
-        yield path
+        return path
+
+
+def prefetch_repogs(
+    repogs: Sequence[RepoG], config: RQConfig, release: Release
+) -> None:
+    """
+    Run the RepoGs' prefetch() methods concurrently.
+    Errors are re-raised in the calling thread.
+    """
+    if len(repogs) <= 1:
+        for repog in repogs:
+            repog.prefetch(config, release)
+        return
+    with ThreadPoolExecutor(max_workers=min(len(repogs), PREFETCH_WORKERS)) as ex:
+        exhaust_it(ex.map(lambda repog: repog.prefetch(config, release), repogs))
 
 
 class RepoG(metaclass=abc.ABCMeta):
@@ -83,6 +96,17 @@ class RepoG(metaclass=abc.ABCMeta):
         self, base_maker: BaseMakerBase, config: RQConfig, release: Release
     ) -> None: ...
 
+    def prefetch(self, config: RQConfig, release: Release) -> None:
+        """
+        Fetch any remote data that load() needs ahead of time.
+        This may run in a worker thread concurrently with other RepoGs,
+        so it must not touch the BaseMaker.
+        It may be called more than once.
+        """
+        # Most RepoGs don't have remote data.
+        # Purposely isn't an @abstractmethod.
+        return None
+
     def err_fmt(self, msg: str) -> ConfigError:
         return ConfigError(msg)
 
@@ -124,9 +148,15 @@ class MultiNameG(_NoArgRepoG):
         super().validate()
         self.repogs = [self.container.get_repo(repo) for repo in self.repos]
 
+    def prefetch(self, config: RQConfig, release: Release) -> None:
+        prefetch_repogs(self.repogs, config, release)
+
     def load(
         self, base_maker: BaseMakerBase, config: RQConfig, release: Release
     ) -> None:
+        # Fetch the members' remote files concurrently,
+        # and then load them in order.
+        self.prefetch(config, release)
         for repog in self.repogs:
             repog.load(base_maker, config, release)
 
@@ -166,6 +196,9 @@ class AliasRepoG(RepoG):
         expanded = self.fmt_str.format(*self.args.split(";"))
         self.final = self.container.get_repo(expanded)
 
+    def prefetch(self, config: RQConfig, release: Release) -> None:
+        self.final.prefetch(config, release)
+
     def load(
         self, base_maker: BaseMakerBase, config: RQConfig, release: Release
     ) -> None:
@@ -173,22 +206,33 @@ class AliasRepoG(RepoG):
 
 
 class FileRepoG(RepoG):
+    _path: str | None = None
+
+    def prefetch(self, config: RQConfig, release: Release) -> None:
+        if self._path is None:
+            self._path = _fetch_file(self.args, config)
+
     def load(
         self, base_maker: BaseMakerBase, config: RQConfig, release: Release
     ) -> None:
-        with _get_file(self.args) as path:
-            base_maker.read_repofile(path)
+        self.prefetch(config, release)
+        base_maker.read_repofile(cast(str, self._path))
 
 
 class CoprRepoG(RepoG):
     url: str
+    _path: str | None = None
+
+    def prefetch(self, config: RQConfig, release: Release) -> None:
+        if self._path is None:
+            self.url = release._copr_repo(self.args, config.copr_baseurl)
+            self._path = _fetch_file(self.url, config)
 
     def load(
         self, base_maker: BaseMakerBase, config: RQConfig, release: Release
     ) -> None:
-        self.url = release._copr_repo(self.args, config.copr_baseurl)
-        with _get_file(self.url) as path:
-            base_maker._read_repofile_new(path, True)
+        self.prefetch(config, release)
+        base_maker._read_repofile_new(cast(str, self._path), True)
 
 
 def _clean_invalid(string: str, valid_chars: Iterable[str], repl: str) -> str:
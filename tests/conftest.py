@@ -5,8 +5,10 @@ from __future__ import annotations
 
 import os
 import subprocess
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from shutil import rmtree
+from typing import TYPE_CHECKING
 
 import pytest
 
@@ -15,6 +17,9 @@ from fedrq import config as rqconfig
 from fedrq.backends import get_default_backend
 from fedrq.backends.base import BackendMod
 
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
 TEST_DATA = Path(__file__).parent.resolve() / "test_data"
 
 TEST_REPO_1 = f"""
@@ -39,12 +44,15 @@ system_repos = false
 
 @pytest.fixture(scope="session", autouse=True)
 def clear_cache():
-    path = rqconfig.get_smartcache_basedir() / "tester"
-    rmtree(path, ignore_errors=True)
+    basedir = rqconfig.get_smartcache_basedir()
+    paths = (basedir / "tester", basedir / "snapshots" / "tester")
+    for path in paths:
+        rmtree(path, ignore_errors=True)
     try:
         yield
     finally:
-        rmtree(path, ignore_errors=True)
+        for path in paths:
+            rmtree(path, ignore_errors=True)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -133,3 +141,41 @@ def runs(capsys):
 @pytest.fixture
 def run_command2(runs, patch_config_dirs):
     return runs
+
+
+class FakeResponse:
+    """
+    Stand-in for a streamed requests.Response
+    """
+
+    def __init__(
+        self,
+        data: bytes = b"",
+        headers: Mapping[str, str] | None = None,
+        status_code: int = 200,
+    ) -> None:
+        self.data = data
+        self.headers = dict(headers or {})
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise ValueError(self.status_code)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+@pytest.fixture
+def fake_response() -> type[FakeResponse]:
+    return FakeResponse
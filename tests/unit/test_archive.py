@@ -8,7 +8,7 @@ from pathlib import Path
 
 import pytest
 
-from fedrq._archive import RPMArchive, RPMArchiveError
+from fedrq._archive import RPMArchive, RPMArchiveError, extract_specfile_from_stream
 
 
 def test_archive_extract_specfile(tmp_path: Path, data_path: Path):
@@ -36,3 +36,25 @@ def test_archive_extract_specfile_error(
         ):
             archive.extract_specfile(dest)
     assert next(dest.iterdir(), None) is None
+
+
+def test_archive_extract_specfile_from_stream(tmp_path: Path, data_path: Path):
+    repo1 = data_path / "repos/repo1/"
+    srpm = repo1 / "repo/SRPMS/specs/packageb-1-1.fc36.src.rpm"
+    data = srpm.read_bytes()
+    chunks = (data[i : i + 512] for i in range(0, len(data), 512))
+    gotten = extract_specfile_from_stream(chunks, tmp_path, name=srpm.name)
+
+    expected_spec = repo1 / "specs/packageb.spec"
+    assert gotten == tmp_path / "packageb.spec"
+    assert expected_spec.read_bytes() == gotten.read_bytes()
+
+
+def test_archive_extract_specfile_from_stream_error(tmp_path: Path):
+    def chunks():
+        yield b"\0" * 10
+        raise OSError("Connection reset")
+
+    with pytest.raises(OSError, match="Connection reset"):
+        extract_specfile_from_stream(chunks(), tmp_path)
+    assert next(tmp_path.iterdir(), None) is None
@@ -3,9 +3,14 @@
 
 from __future__ import annotations
 
-from pytest import CaptureFixture
+import re
+from pathlib import Path
+
+import pytest
+from pytest import CaptureFixture, MonkeyPatch
 
 import fedrq.cli
+from fedrq.cli.commands.cache import MakeCacheCommand
 
 
 def test_cli_make_cache(patch_config_dirs, capsys: CaptureFixture):
@@ -13,3 +18,69 @@ def test_cli_make_cache(patch_config_dirs, capsys: CaptureFixture):
     out, err = capsys.readouterr()
     assert out == "Loaded 1 repo\n"
     assert not err
+
+
+def test_cli_make_cache_multiple(
+    patch_config_dirs: Path,
+    temp_smartcache: Path,
+    capsys: CaptureFixture,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    patch_config_dirs.joinpath("multi.toml").write_text("""
+cache_branches = ["tester", "tester2"]
+
+[releases.testrepo2]
+matcher = "^(tester2)$"
+defs.base = ["testrepo1"]
+defpaths = ["testrepo1.repo"]
+system_repos = false
+""")
+    # spawn'd workers would not see the patched config dirs
+    monkeypatch.setattr(MakeCacheCommand, "MP_CONTEXT", "fork")
+    fedrq.cli.main(["make-cache", "--all-releases"])
+    out, err = capsys.readouterr()
+    lines = out.splitlines()
+    assert sorted(line.split(":")[0] for line in lines[:-1]) == ["tester", "tester2"]
+    for line in lines[:-1]:
+        assert re.fullmatch(
+            r"tester2?: Loaded 1 repo in [\d.]+s \([\d.]+ [KMG]?i?B downloaded\)",
+            line,
+        )
+    assert lines[-1].startswith("Refreshed 2 releases in ")
+    assert not err
+    assert temp_smartcache.joinpath("fedrq", "tester").is_dir()
+    assert temp_smartcache.joinpath("fedrq", "tester2").is_dir()
+
+
+def test_cli_cacheonly(
+    patch_config_dirs, temp_smartcache: Path, capsys: CaptureFixture
+) -> None:
+    args = ["pkgs", "--cacheonly", "--no-snapshot", "-F", "name", "packageb"]
+    with pytest.raises(SystemExit, match="^1$"):
+        fedrq.cli.main(args)
+    assert "fedrq make-cache -b tester" in capsys.readouterr().err
+
+    fedrq.cli.main(["make-cache"])
+    capsys.readouterr()
+    fedrq.cli.main(args)
+    assert capsys.readouterr().out == "packageb\n"
+
+
+def test_cli_cacheonly_repo_class(
+    patch_config_dirs, temp_smartcache: Path, capsys: CaptureFixture
+) -> None:
+    args = ["pkgs", "--cacheonly", "--no-snapshot", "-r", "@repo:testrepo1"]
+    with pytest.raises(SystemExit, match="^1$"):
+        fedrq.cli.main([*args, "packageb"])
+    assert "fedrq make-cache -b tester -r @repo:testrepo1'" in capsys.readouterr().err
+
+    # Following the hint fills the right cache
+    fedrq.cli.main(["make-cache", "-b", "tester", "-r", "@repo:testrepo1"])
+    capsys.readouterr()
+    fedrq.cli.main([*args, "-F", "name", "packageb"])
+    assert capsys.readouterr().out == "packageb\n"
+
+
+def test_cli_make_cache_cacheonly(patch_config_dirs) -> None:
+    with pytest.raises(SystemExit, match="cannot be used with --cacheonly"):
+        fedrq.cli.main(["make-cache", "--cacheonly"])
@@ -3,10 +3,13 @@
 
 from __future__ import annotations
 
+import json
 import re
+from pathlib import Path
 
 import pytest
 
+from fedrq import config as rqconfig
 from fedrq.backends.base import BackendMod, PackageCompat, RepoqueryBase
 from fedrq.config import RQConfig, _warn_extra_configs, get_config
 
@@ -55,3 +58,102 @@ def test_envvars(monkeypatch: pytest.MonkeyPatch) -> None:
     config2 = get_config(default_branch="f41", backend="dnf")
     assert config2.default_branch == "f41"
     assert config2.backend == "dnf"
+
+
+def test_config_cache(
+    patch_config_dirs: Path,
+    temp_smartcache: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config1 = get_config()
+    cache = temp_smartcache.joinpath("fedrq", "config-cache.json")
+    # The cache is plain data that's never unpickled
+    assert json.loads(cache.read_text())["releases"]
+
+    def load(*args, **kwargs):
+        raise AssertionError("The config files should not be parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr(rqconfig.tomllib, "load", load)
+        config2 = get_config()
+    assert config2.dict() == config1.dict()
+    assert (
+        config2.get_release("tester").repog.name
+        == config1.get_release("tester").repog.name
+    )
+
+    # Changing a config file or an environment variable invalidates the cache
+    patch_config_dirs.joinpath("custom.toml").write_text('default_branch = "f42"\n')
+    assert get_config().default_branch == "f42"
+    monkeypatch.setenv("FEDRQ_BRANCH", "f41")
+    assert get_config().default_branch == "f41"
+    monkeypatch.delenv("FEDRQ_BRANCH")
+    # So does removing a repo file that a release depends on
+    patch_config_dirs.parent.joinpath("global", "repos", "testrepo1.repo").unlink()
+    with pytest.raises(ValueError, match="Missing defpaths"):
+        get_config()
+
+
+def test_repo_dir_listings(
+    patch_config_dirs: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    other = patch_config_dirs / "other-repos"
+    other.mkdir()
+    other.joinpath("testrepo1.repo").write_text("")
+    release_template = """
+[releases.tester{i}]
+matcher = "^(tester{i})$"
+defs.base = ["testrepo1"]
+defpaths = ["testrepo1.repo"]
+system_repos = false
+"""
+    other_release = f"""
+[releases.tester-other]
+matcher = "^(tester-other)$"
+defs.base = ["testrepo1"]
+defpaths = ["testrepo1.repo"]
+repo_dirs = "{other}"
+"""
+    releases = [release_template.format(i=i) for i in range(5)]
+    releases.append(other_release)
+    patch_config_dirs.joinpath("releases.toml").write_text("\n".join(releases))
+    listed: list[str] = []
+    list_repo_dir = rqconfig.ReleaseConfig._list_repo_dir
+
+    def wrapper(topdir):
+        listed.append(str(topdir))
+        return list_repo_dir(topdir)
+
+    monkeypatch.setattr(rqconfig.ReleaseConfig, "_list_repo_dir", wrapper)
+    monkeypatch.setenv("FEDRQ_NO_CONFIG_CACHE", "1")
+    config = get_config()
+    # Each directory is only listed once
+    assert len(listed) == len(set(listed))
+    repos_dir = patch_config_dirs.parent / "global" / "repos"
+    assert config.releases["tester3"].full_def_paths == [repos_dir / "testrepo1.repo"]
+    assert config.releases["tester-other"].full_def_paths == [other / "testrepo1.repo"]
+
+
+def test_get_release_dispatch() -> None:
+    config = get_config()
+    assert config.get_release("f41", "@updates").release_config.name == "branched"
+    assert config.get_release("epel9").release_config.name == "epel"
+    assert config.get_release("c9s", "@epel").release_config.name == "centos-stream9"
+    with pytest.raises(rqconfig.ConfigError, match="does not much any"):
+        config.get_release("not-a-branch")
+    # Each call returns a new Release
+    release = config.get_release("rawhide")
+    assert config.get_release("rawhide") is not release
+    assert config.get_release("rawhide").release_config is release.release_config
+    # Releases that are replaced in place are picked up
+    config.releases["rawhide"] = release.release_config.copy(
+        update={"matcher": re.compile("^(not-rawhide)$")}
+    )
+    with pytest.raises(rqconfig.ConfigError):
+        config.get_release("rawhide")
+    assert config.get_release("not-rawhide").release_config.name == "rawhide"
+    releases = dict(config.releases)
+    del releases["rawhide"]
+    config.releases = releases
+    with pytest.raises(rqconfig.ConfigError):
+        config.get_release("rawhide")
@@ -0,0 +1,124 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import stat
+import time
+from collections.abc import Iterator
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+import fedrq.cli
+from fedrq.cli.base import Command
+from fedrq.cli.commands.daemon import DAEMON_SOCKET_ENV, SackCache, forward
+
+
+def test_sack_cache_lru():
+    cache = SackCache(max_size=2, max_age=None)
+    cache[("a",)] = 1
+    cache[("b",)] = 2
+    assert cache[("a",)] == 1
+    cache[("c",)] = 3
+    assert list(cache) == [("a",), ("c",)]
+
+
+def test_sack_cache_expire(monkeypatch: pytest.MonkeyPatch):
+    now = 100.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = SackCache(max_age=10)
+    cache[("a",)] = 1
+    now += 5
+    assert cache[("a",)] == 1
+    now += 10
+    assert ("a",) not in cache
+    assert not cache
+
+
+def _serve(path: Path) -> None:
+    fedrq.cli.main(["daemon", "--socket", str(path)])
+
+
+@pytest.fixture
+def daemon(patch_config_dirs, tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "daemon.sock"
+    # Fork so the daemon inherits the patched config directories
+    proc = multiprocessing.get_context("fork").Process(target=_serve, args=(path,))
+    proc.start()
+    try:
+        for _ in range(100):
+            if path.exists():
+                break
+            time.sleep(0.1)
+        else:
+            raise AssertionError("daemon did not start")
+        yield path
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+def test_daemon_forward(
+    daemon: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    args = ["pkgs", "-F", "nevrr", "*"]
+    fedrq.cli.main(args)
+    expected = capsys.readouterr()
+
+    monkeypatch.setenv(DAEMON_SOCKET_ENV, str(daemon))
+    for _ in range(2):
+        fedrq.cli.main(args)
+        assert capsys.readouterr() == expected
+    # The client should never load a sack itself
+    assert Command._rq_cache is None
+
+
+def test_daemon_exit_code(
+    daemon: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    monkeypatch.setenv(DAEMON_SOCKET_ENV, str(daemon))
+    with pytest.raises(SystemExit, match="^1$"):
+        fedrq.cli.main(["pkgs", "-F", "does-not-exist", "*"])
+    _, err = capsys.readouterr()
+    assert "does-not-exist" in err
+
+
+def test_daemon_socket_permissions(daemon: Path):
+    assert stat.S_IMODE(daemon.stat().st_mode) == 0o600
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        pytest.param(["daemon", "--socket", "nested.sock"], id="daemon"),
+        pytest.param(["make-cache"], id="make-cache"),
+        pytest.param(["download-spec", "packagea"], id="download-spec"),
+    ],
+)
+def test_daemon_rejects_local_commands(daemon: Path, argv: list[str]):
+    # Write the request to the socket directly like a client that doesn't
+    # keep these commands local
+    stdout = StringIO()
+    stderr = StringIO()
+    code = forward(daemon, argv, argparse.Namespace(), stdout=stdout, stderr=stderr)
+    assert code == 1
+    assert not stdout.getvalue()
+    assert "cannot be run by the daemon" in stderr.getvalue()
+
+
+def test_daemon_unreachable(
+    patch_config_dirs,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+):
+    args = ["pkgs", "-F", "name", "*"]
+    fedrq.cli.main(args)
+    expected = capsys.readouterr()
+    monkeypatch.setenv(DAEMON_SOCKET_ENV, str(tmp_path / "missing.sock"))
+    fedrq.cli.main(args)
+    assert capsys.readouterr() == expected
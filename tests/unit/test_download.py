@@ -3,11 +3,15 @@
 
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
+from types import SimpleNamespace
 
+import pytest
 from pytest import CaptureFixture
 
 import fedrq.cli
+from fedrq.cli.commands.download import _get_req_kwargs, stream_to_file
 
 
 def test_download_spec(
@@ -42,3 +46,75 @@ def test_download(
     for expect in expected:
         gotten = tmp_path / expect.name
         assert expect.read_bytes() == gotten.read_bytes()
+    assert capsys.readouterr().err.startswith("Downloaded 2/2 packages")
+
+
+def test_download_parallel_invalid(patch_config_dirs, capsys: CaptureFixture):
+    with pytest.raises(SystemExit, match="^1$"):
+        fedrq.cli.main(["download", "packagea", "--parallel", "0", "-y"])
+    assert "--parallel must be at least 1" in capsys.readouterr().err
+
+
+def test_download_spec_gpgcheck_stream(patch_config_dirs, capsys: CaptureFixture):
+    with pytest.raises(SystemExit, match="^1$"):
+        fedrq.cli.main(
+            ["download-spec", "packagea", "--gpgcheck", "--stream-spec", "-y"]
+        )
+    assert "--stream-spec cannot be combined with --gpgcheck" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        pytest.param([], True, id="default"),
+        pytest.param(["--gpgcheck"], False, id="gpgcheck"),
+        pytest.param(["--no-stream-spec"], False, id="no-stream-spec"),
+    ],
+)
+def test_download_spec_stream_default(
+    patch_config_dirs, args: list[str], expected: bool
+):
+    parser = fedrq.cli.DownloadSpecCommand.make_parser()
+    command = fedrq.cli.DownloadSpecCommand(parser.parse_args(["packagea", *args]))
+    assert command.args.stream_spec is expected
+
+
+@pytest.mark.parametrize(
+    "repo, expected",
+    [
+        pytest.param(
+            dict(sslverify=False, sslcacert="", sslclientcert="", sslclientkey=""),
+            {"verify": False},
+            id="no-verify",
+        ),
+        pytest.param(
+            dict(
+                sslverify=True,
+                sslcacert="/ca.pem",
+                sslclientcert="/cert.pem",
+                sslclientkey="/key.pem",
+            ),
+            {"verify": "/ca.pem", "cert": ("/cert.pem", "/key.pem")},
+            id="certs",
+        ),
+    ],
+)
+def test_get_req_kwargs(repo: dict[str, object], expected: dict[str, object]):
+    package = SimpleNamespace(repo=SimpleNamespace(**repo))
+    assert _get_req_kwargs(package) == expected  # type: ignore[arg-type]
+
+
+def test_stream_to_file(tmp_path: Path):
+    chunks = [b"abc", b"def"]
+    dest = tmp_path / "package.rpm"
+    checksum = ("sha256", hashlib.sha256(b"abcdef").hexdigest())
+    stream_to_file(iter(chunks), dest, checksum)
+    assert dest.read_bytes() == b"abcdef"
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_stream_to_file_checksum_mismatch(tmp_path: Path):
+    dest = tmp_path / "package.rpm"
+    with pytest.raises(ValueError, match="^Checksum mismatch for package.rpm"):
+        stream_to_file(iter([b"abc"]), dest, ("sha256", "0" * 64))
+    assert not list(tmp_path.iterdir())
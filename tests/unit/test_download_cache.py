@@ -0,0 +1,94 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from fedrq._download_cache import DownloadCache, link_or_copy
+
+DATA = b"0123456789" * 100
+CHECKSUM = ("sha256", hashlib.sha256(DATA).hexdigest())
+
+
+@pytest.fixture
+def requested() -> list[Mapping[str, str]]:
+    return []
+
+
+@pytest.fixture
+def get(requested: list[Mapping[str, str]], fake_response):
+    def inner(headers: Mapping[str, str]):
+        requested.append(headers)
+        if rng := headers.get("Range"):
+            start = int(rng.removeprefix("bytes=").removesuffix("-"))
+            if start >= len(DATA):
+                return fake_response(status_code=416)
+            return fake_response(DATA[start:], status_code=206)
+        return fake_response(DATA)
+
+    return inner
+
+
+def test_download_cache_fetch(tmp_path: Path, get, requested) -> None:
+    cache = DownloadCache(tmp_path, 10_000)
+    assert cache.get(CHECKSUM) is None
+    path = cache.fetch(CHECKSUM, get)
+    assert path.read_bytes() == DATA
+    assert cache.get(CHECKSUM) == path
+    assert requested == [{}]
+
+    dest = tmp_path / "dest.rpm"
+    link_or_copy(path, dest)
+    assert dest.read_bytes() == DATA
+
+
+@pytest.mark.parametrize(
+    "partial, expected_headers",
+    [
+        pytest.param(DATA[:300], [{"Range": "bytes=300-"}], id="resume"),
+        pytest.param(DATA, [{"Range": "bytes=1000-"}, {}], id="invalid-range"),
+    ],
+)
+def test_download_cache_resume(
+    tmp_path: Path,
+    get,
+    requested,
+    partial: bytes,
+    expected_headers: list[Mapping[str, str]],
+) -> None:
+    cache = DownloadCache(tmp_path, 10_000)
+    part = cache.path(CHECKSUM).with_suffix(".part")
+    part.parent.mkdir(parents=True)
+    part.write_bytes(partial)
+    assert cache.fetch(CHECKSUM, get).read_bytes() == DATA
+    assert requested == expected_headers
+    assert not part.exists()
+
+
+def test_download_cache_checksum_mismatch(tmp_path: Path, get) -> None:
+    cache = DownloadCache(tmp_path, 10_000)
+    checksum = ("sha256", "0" * 64)
+    with pytest.raises(ValueError, match="^Checksum mismatch"):
+        cache.fetch(checksum, get)
+    assert not list(cache.path(checksum).parent.iterdir())
+
+
+def test_download_cache_evict(tmp_path: Path) -> None:
+    cache = DownloadCache(tmp_path, 250)
+    paths = []
+    for i in range(3):
+        path = cache.path(("sha256", str(i)))
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (i, i))
+        paths.append(path)
+    # Using an entry makes it the most recently used
+    cache.get(("sha256", "0"))
+    cache.evict()
+    assert [path.exists() for path in paths] == [True, False, True]
@@ -11,6 +11,7 @@ from pathlib import Path
 import pytest
 
 from fedrq import config as rqconfig
+from fedrq._utils import sort_packages
 from fedrq.backends.base import PackageQueryCompat, RepoqueryBase
 from fedrq.cli import formatters
 
@@ -321,6 +322,26 @@ def test_json_formatter(patch_config_dirs):
     assert json.loads(output[0]) == expected
 
 
+@pytest.mark.parametrize("name", ["ndjson", "jsonl"])
+def test_ndjson_formatter(patch_config_dirs, name: str) -> None:
+    attrs = "name,evr,arch,requires,conflicts,provides,source_name"
+    repo_test_rq = get_rq()
+    query = repo_test_rq.resolve_pkg_specs(["packagea*"], latest=1)
+    expected = json.loads(formatter(query, f"json:{attrs}")[0])
+    output = formatter(query, f"{name}:{attrs}", sort=False)
+    assert len(output) == len(expected)
+    assert all("\n" not in line for line in output)
+    # Packages are written as they're produced without sorting them first
+    assert [(obj["name"], obj["arch"]) for obj in map(json.loads, output)] == [
+        (package.name, package.arch) for package in query
+    ]
+
+    def key(obj: dict) -> tuple[str, str]:
+        return obj["name"], obj["arch"]
+
+    assert sorted(map(json.loads, output), key=key) == sorted(expected, key=key)
+
+
 def test_multiline_formatter(patch_config_dirs, target_cpu: str):
     repo_test_rq = get_rq()
     query = repo_test_rq.resolve_pkg_specs(
@@ -433,6 +454,11 @@ def formatter_test_query() -> PackageQueryCompat:
             ["qf:%{name} other text %{version}"],
             ["packagea other text 1", "packageb other text 2"],
         ),
+        pytest.param(
+            ["qf:%{name} %%{version} }{"],
+            ["packagea %{version} }{", "packageb %{version} }{"],
+            id="qf-escapes",
+        ),
     ],
 )
 def test_formatter_p(
@@ -464,3 +490,83 @@ def test_formatter_error(formatter: str, error_str: str) -> None:
     with pytest.raises(formatters.FormatterError) as err:
         formatters.DefaultFormatters.get_formatter(formatter)
     assert str(err.value) == error_str
+
+
+def test_requiresmatch_reldep_index(patch_config_dirs) -> None:
+    rq = get_rq()
+    query = formatter_test_query()
+    assert formatter(query, "narm:packageb", sort=False, repoquery=rq) == [
+        "packagea.noarch : vpackage(b)"
+    ]
+    # Versioned requirements and file paths are attributed to the correct
+    # providers when they are resolved together
+    query = rq.query()
+    requires = {str(require) for package in query for require in package.requires}
+    for name in ("packagea", "packageb", "packageb-sub"):
+        match_packages = set(rq.resolve_pkg_specs([name], with_src=False))
+        expected = sorted(
+            reldep
+            for reldep in requires
+            if not match_packages.isdisjoint(
+                rq.resolve_pkg_specs([reldep], resolve=True, with_src=False)
+            )
+        )
+        assert formatter(query, f"rm:{name}", repoquery=rq) == expected
+
+
+def test_sort_packages(patch_config_dirs) -> None:
+    query = get_rq().query()
+    assert list(map(str, sort_packages(query))) == list(map(str, sorted(query)))
+
+
+@pytest.mark.parametrize(
+    "formatter_name", ["plain", "source", "requires", "line:name,arch", "narm:packageb"]
+)
+def test_formatter_no_sort(patch_config_dirs, formatter_name: str) -> None:
+    rq = get_rq()
+    query = rq.query()
+    fmt = formatters.DefaultFormatters.get_formatter(formatter_name, repoquery=rq)
+    expected = list(fmt.format(query))
+    fmt.sort = False
+    # Streaming formatters must only iterate over the packages once
+    output = fmt.format(iter(query))
+    assert sorted(output) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "formatter_name, expected",
+    [
+        ("plain", False),
+        ("files", True),
+        ("attr:files", True),
+        ("attr:requires", False),
+        ("json:name,files", True),
+        ("json:name,arch", False),
+        ("json:files,source", True),
+        ("line:name,source", False),
+        ("multiline:name,files", True),
+        ("qf:%{name} %{arch}", False),
+        ("rm:packagea", False),
+    ],
+)
+def test_formatter_needs_filelists(formatter_name: str, expected: bool) -> None:
+    fmt = formatters.DefaultFormatters.get_formatter(formatter_name)
+    assert fmt.needs_filelists is expected
+
+
+@pytest.mark.parametrize(
+    "formatter_name, sort, expected",
+    [
+        ("plain", False, False),
+        ("rm:packagea", False, False),
+        ("narm:packagea", True, False),
+        ("narm:packagea", False, True),
+        ("multiline:name,requires", False, False),
+    ],
+)
+def test_formatter_resolves_deps_lazily(
+    formatter_name: str, sort: bool, expected: bool
+) -> None:
+    fmt = formatters.DefaultFormatters.get_formatter(formatter_name)
+    fmt.sort = sort
+    assert fmt.resolves_deps_lazily is expected
@@ -34,6 +34,7 @@ full_nevra
 installsize
 installtime
 json:
+jsonl:
 license
 line:
 location
@@ -44,6 +45,7 @@ na-requiresmatch:
 name
 narm:
 narmsrc:
+ndjson:
 nev
 nevr
 nevra
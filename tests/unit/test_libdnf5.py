@@ -72,3 +72,20 @@ def test_libdnf5_bm_load_filelists():
     bm.load_filelists(True)
     new = sorted((*default_types, "filelists"))
     assert sorted(bm.conf.optional_metadata_types) == new
+
+
+def test_libdnf5_filter_plans(repo_test_config: RQConfig):
+    from fedrq.backends.libdnf5.backend import _get_filter_plans
+
+    rq: Repoquery = repo_test_config.get_libdnf5_rq()
+    plans = _get_filter_plans(type(rq.query()))
+    assert plans["name"].list_types == (str,)
+    assert plans["epoch__gt"].list_types == (int,)
+    assert plans["latest"].list_types == ()
+    # Plain values are wrapped in a list
+    assert sorted(rq.query(name="packagea", arch__neq="src")) == sorted(
+        rq.query(name=["packagea"], arch__neq=["src"])
+    )
+    assert len(rq.query(name__glob="package*", latest=1)) > 0
+    with pytest.raises(TypeError, match="Invalid keyword arguments"):
+        rq.query(invalid="abc")
@@ -105,3 +105,45 @@ def test_package_stdin(
     fedrq.cli.main(["pkgs", "-i", "-F", "line:name,arch", "-A", "arched"])
     out, _ = capsys.readouterr()
     assert out == f"packageb : {target_cpu}\n"
+
+
+def test_filelists_required_before_output(
+    patch_config_dirs, capsys, monkeypatch: pytest.MonkeyPatch
+):
+    args = ["pkgs", "-F", "nevrr", "package*"]
+    fedrq.cli.main([*args, "--filelists=always"])
+    expected = capsys.readouterr()
+    assert expected.out
+    run = fedrq.cli.Pkgs.run
+    runs: list[bool] = []
+
+    def wrapper(self):
+        runs.append(self.rq.filelists_on_demand)
+        self.rq.require_filelists()
+        run(self)
+
+    monkeypatch.setattr(fedrq.cli.Pkgs, "run", wrapper)
+    fedrq.cli.main(args)
+    assert runs == [True, False]
+    assert capsys.readouterr() == expected
+
+
+def test_filelists_required_after_output(
+    patch_config_dirs, capsys, monkeypatch: pytest.MonkeyPatch
+):
+    args = ["pkgs", "-F", "nevrr", "package*"]
+    fedrq.cli.main([*args, "--filelists=always"])
+    expected = capsys.readouterr()
+    assert expected.out
+    run = fedrq.cli.Pkgs.run
+
+    def wrapper(self):
+        run(self)
+        # The output isn't held back until the command finishes
+        assert capsys.readouterr().out == expected.out
+        self.rq.require_filelists()
+
+    monkeypatch.setattr(fedrq.cli.Pkgs, "run", wrapper)
+    with pytest.raises(SystemExit, match="--filelists=always"):
+        fedrq.cli.main(args)
+    assert not capsys.readouterr().out
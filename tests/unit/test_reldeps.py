@@ -0,0 +1,71 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import pytest
+
+from fedrq._reldeps import Reldep, overlaps, parse_reldep, rpmvercmp
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("1.0", "1.0", 0),
+        ("1.0", "2.0", -1),
+        ("2.0.1", "2.0.1a", -1),
+        ("10", "9", 1),
+        ("001", "1", 0),
+        ("1.a", "1.1", -1),
+        ("fc36", "fc4", 1),
+        ("1_0", "1.0", 0),
+        ("1.0~rc1", "1.0", -1),
+        ("1.0~rc1", "1.0~rc2", -1),
+        ("1.0^", "1.0", 1),
+        ("1.0^git1", "1.01", -1),
+        ("1.0^", "1.0~", 1),
+    ],
+)
+def test_rpmvercmp(a: str, b: str, expected: int) -> None:
+    assert rpmvercmp(a, b) == expected
+    assert rpmvercmp(b, a) == -expected
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("foo", Reldep("foo")),
+        ("python3dist(foo)", Reldep("python3dist(foo)")),
+        ("foo >= 1.0", Reldep("foo", ">=", "1.0")),
+        ("foo == 1:1.0-1", Reldep("foo", "=", "1:1.0-1")),
+        ("(foo if bar)", None),
+        ("foo bar", None),
+        ("foo ~ 1", None),
+    ],
+)
+def test_parse_reldep(string: str, expected: Reldep | None) -> None:
+    assert parse_reldep(string) == expected
+
+
+@pytest.mark.parametrize(
+    "provide, require, expected",
+    [
+        ("foo", "foo >= 2", True),
+        ("foo = 1-1", "foo", True),
+        ("foo = 1-1", "foo >= 1", True),
+        ("foo = 1-1", "foo > 1", False),
+        ("foo = 1-1", "foo = 1", True),
+        ("foo = 1-1", "foo = 1-2", False),
+        ("foo = 1-1", "foo < 1-2", True),
+        ("foo = 2", "foo < 11:1", True),
+        ("foo = 11:2", "foo < 11:1", False),
+        ("foo >= 2", "foo < 3", True),
+        ("foo >= 2", "foo < 2", False),
+        ("foo < 2", "foo <= 1", True),
+    ],
+)
+def test_overlaps(provide: str, require: str, expected: bool) -> None:
+    parsed_provide = parse_reldep(provide)
+    parsed_require = parse_reldep(require)
+    assert parsed_provide and parsed_require
+    assert overlaps(parsed_provide, parsed_require) is expected
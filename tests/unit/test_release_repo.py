@@ -3,7 +3,13 @@
 
 from __future__ import annotations
 
+import threading
+from typing import Any
+
+import pytest
+
 import fedrq.config
+from fedrq import release_repo
 
 
 def test_source_repos_formatter():
@@ -14,3 +20,31 @@ def test_source_repos_formatter():
     assert bm.repolist(True) == ["fedora"]
     release.release_config.repogs.get_repo("@source-repos").load(bm, config, release)
     assert sorted(bm.repolist(True)) == sorted(["fedora", "fedora-source"])
+
+
+def test_multinameg_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    urls = [f"https://example.com/{i}.repo" for i in range(3)]
+    # Every fetch waits until all of them have started
+    barrier = threading.Barrier(len(urls), timeout=10)
+    fetched: list[str] = []
+
+    def fetch_file(path: str, config: Any = None) -> str:
+        barrier.wait()
+        fetched.append(path)
+        return path
+
+    class FakeBaseMaker:
+        def __init__(self) -> None:
+            self.read: list[str] = []
+
+        def read_repofile(self, path: str) -> None:
+            self.read.append(path)
+
+    monkeypatch.setattr(release_repo, "_fetch_file", fetch_file)
+    typ = release_repo.MultiNameG.from_names("test", [f"@file:{url}" for url in urls])
+    repogs = release_repo.DefaultRepoGs | {"test": typ}
+    bm = FakeBaseMaker()
+    repogs.get_repo("@test").load(bm, None, None)  # type: ignore[arg-type]
+    assert sorted(fetched) == urls
+    # The repos are still loaded in order
+    assert bm.read == urls
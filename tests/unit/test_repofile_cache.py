@@ -0,0 +1,99 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+import requests
+
+from fedrq._config import ConfigError
+from fedrq._repofile_cache import RepofileCache
+
+URL = "https://example.com/test.repo"
+CONTENT = b"[test]\nbaseurl=https://example.com/repo\n"
+
+
+@pytest.fixture
+def requested(
+    monkeypatch: pytest.MonkeyPatch, fake_response
+) -> list[Mapping[str, str]]:
+    requested: list[Mapping[str, str]] = []
+
+    def get(url: str, headers: Mapping[str, str], **kwargs):
+        assert url == URL
+        requested.append(headers)
+        if headers.get("If-None-Match") == '"abc"':
+            return fake_response(status_code=304)
+        return fake_response(CONTENT, {"ETag": '"abc"'})
+
+    monkeypatch.setattr(requests, "get", get)
+    return requested
+
+
+def test_repofile_cache(tmp_path: Path, requested: list[Mapping[str, str]]) -> None:
+    cache = RepofileCache(tmp_path, 3600)
+    path = cache.get(URL)
+    assert path.read_bytes() == CONTENT
+    assert requested == [{}]
+    # The fresh entry is used without a request
+    assert cache.get(URL) == path
+    assert requested == [{}]
+    # An expired entry is revalidated
+    cache.ttl = 0
+    assert cache.get(URL) == path
+    assert requested == [{}, {"If-None-Match": '"abc"'}]
+    assert path.read_bytes() == CONTENT
+
+
+def test_repofile_cache_stale_on_error(
+    tmp_path: Path,
+    requested: list[Mapping[str, str]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = RepofileCache(tmp_path, 0)
+    path = cache.get(URL)
+
+    def get(*args, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests, "get", get)
+    assert cache.get(URL) == path
+    assert path.read_bytes() == CONTENT
+
+    with pytest.raises(ConfigError, match="^Failed to download https://example.com/x"):
+        cache.get("https://example.com/x.repo")
+
+
+@pytest.mark.parametrize("status_code", [404, 410, 500])
+def test_repofile_cache_http_error(
+    tmp_path: Path,
+    requested: list[Mapping[str, str]],
+    monkeypatch: pytest.MonkeyPatch,
+    fake_response,
+    status_code: int,
+) -> None:
+    cache = RepofileCache(tmp_path, 0)
+    cache.get(URL)
+    monkeypatch.setattr(
+        requests, "get", lambda *args, **kwargs: fake_response(status_code=status_code)
+    )
+    # The stale copy isn't used when the server is reachable
+    with pytest.raises(ConfigError, match=f"HTTP {status_code}$"):
+        cache.get(URL)
+
+
+def test_repofile_cache_offline(
+    tmp_path: Path, requested: list[Mapping[str, str]]
+) -> None:
+    RepofileCache(tmp_path, 0).get(URL)
+    cache = RepofileCache(tmp_path, 0, offline=True)
+    # Stale entries are used without a request
+    assert cache.get(URL).read_bytes() == CONTENT
+    assert requested == [{}]
+    # Files that aren't cached aren't downloaded
+    with pytest.raises(ConfigError, match="is not cached"):
+        cache.get("https://example.com/x.repo")
+    assert requested == [{}]
@@ -13,9 +13,11 @@ import pytest
 from fedrq import config as rqconfig
 from fedrq.backends.base import (
     BackendMod,
+    FilelistsRequired,
     PackageCompat,
     PackageQueryCompat,
     RepoqueryBase,
+    path_needs_filelists,
 )
 from fedrq.release_repo import MultiNameG
 
@@ -140,3 +142,144 @@ def test_resolve_pkg_specs_resolve(
         if not canfail:
             raise
         pytest.xfail("rpm-software-management/libdnf/issues/1673")
+
+
+@pytest.mark.parametrize("resolve", [pytest.param(True), pytest.param(False)])
+@pytest.mark.parametrize("with_src", [pytest.param(True), pytest.param(False)])
+def test_resolve_pkg_specs_bulk(
+    repo_test_rq: RepoqueryBase,
+    default_backend: BackendMod,
+    resolve: bool,
+    with_src: bool,
+) -> None:
+    specs = [
+        "packagea",
+        "packageb-*",
+        "packagea.noarch",
+        "packagea-1-1.fc36.noarch",
+        "packagea-1",
+        "packagea-0:1",
+        "package(b)",
+        "package(*)",
+        "vpackage(b) >= 2",
+        "vpackage(b) < 11111:0",
+        "vpackage(b) > 0",
+        "vsubpackage(b) = 1",
+        "/usr/share/packagea",
+        "/usr/share/packageb*",
+        "does-not-exist",
+        "does-not-exist*",
+    ]
+    forms = default_backend.NEVRAForms
+    # Passing the default forms explicitly disables the bulk resolution
+    nevra_forms = [forms.NEVRA, forms.NA, forms.NAME, forms.NEVR, forms.NEV]
+    kwargs: dict[str, Any] = dict(resolve=resolve, with_src=with_src)
+
+    def resolve_each(spec: str) -> list[str]:
+        return sorted(
+            map(
+                str,
+                repo_test_rq.resolve_pkg_specs(
+                    [spec], nevra_forms=nevra_forms, **kwargs
+                ),
+            )
+        )
+
+    expected = {spec: resolve_each(spec) for spec in specs}
+    mapping = repo_test_rq.resolve_pkg_specs_mapping(specs, **kwargs)
+    assert {spec: sorted(map(str, query)) for spec, query in mapping.items()} == (
+        expected
+    )
+    assert sorted(map(str, repo_test_rq.resolve_pkg_specs(specs, **kwargs))) == (
+        sorted({pkg for pkgs in expected.values() for pkg in pkgs})
+    )
+
+
+def test_source_index(
+    repo_test_rq: RepoqueryBase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    srpms = repo_test_rq.query(arch="src")
+    expected = {
+        str(srpm): sorted(
+            map(
+                str,
+                repo_test_rq.query(
+                    sourcerpm=f"{srpm.name}-{srpm.version}-{srpm.release}.src.rpm"
+                ),
+            )
+        )
+        for srpm in srpms
+    }
+    monkeypatch.setattr(repo_test_rq, "_source_index", None)
+    assert repo_test_rq.get_source_index(build=False) is None
+    # Force get_subpackages() to build and use the index
+    monkeypatch.setattr(repo_test_rq, "_SOURCE_INDEX_THRESHOLD", 0)
+    assert {
+        str(srpm): sorted(map(str, repo_test_rq.get_subpackages([srpm])))
+        for srpm in srpms
+    } == expected
+    index = repo_test_rq.get_source_index(build=False)
+    assert index
+    for srpm in srpms:
+        for package in repo_test_rq.get_subpackages([srpm]):
+            assert index.get_source(package) == index.get_nevr(srpm)
+            assert index.get_source_name(package) == srpm.name
+
+
+def test_fetch_columns(repo_test_rq: RepoqueryBase) -> None:
+    attrs = [
+        "name",
+        "epoch",
+        "evr",
+        "arch",
+        "source_name",
+        "downloadsize",
+        "summary",
+        "reponame",
+        "provides",
+        "requires",
+        "files",
+    ]
+    reldep_attrs = {"provides", "requires", "files"}
+    query = repo_test_rq.query()
+    packages = list(query)
+    columns = repo_test_rq.fetch_columns(query, attrs)
+    assert list(columns) == attrs
+    for attr in attrs:
+        assert len(columns[attr]) == len(packages)
+        for package, value in zip(packages, columns[attr]):
+            expected = getattr(package, attr)
+            if attr in reldep_attrs:
+                expected = [str(item) for item in expected]
+            assert value == expected, (package, attr)
+    assert repo_test_rq.fetch_columns([], attrs) == {attr: [] for attr in attrs}
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/usr/share/packagea", True),
+        ("/usr/share/*", True),
+        ("/usr/bin/packagea", False),
+        ("/usr/local/sbin/*", False),
+        ("/etc/packagea.conf", False),
+        ("packagea", False),
+    ],
+)
+def test_path_needs_filelists(path: str, expected: bool) -> None:
+    assert path_needs_filelists(path) is expected
+
+
+def test_filelists_on_demand(
+    repo_test_rq: RepoqueryBase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(repo_test_rq, "filelists_on_demand", True)
+    # The primary metadata is enough for these
+    repo_test_rq.query(file=["/usr/bin/packagea"])
+    repo_test_rq.resolve_pkg_specs(["packagea"], True)
+    with pytest.raises(FilelistsRequired):
+        repo_test_rq.query(file__glob="/usr/share/*")
+    with pytest.raises(FilelistsRequired):
+        repo_test_rq.resolve_pkg_specs(["/usr/share/packagea"], True)
+    with pytest.raises(FilelistsRequired):
+        repo_test_rq.require_filelists()
@@ -0,0 +1,62 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import pytest
+
+from fedrq.backends.base import RepoqueryBase
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        pytest.param(["packagea"], ["packageb.{cpu}"], id="direct"),
+        pytest.param(["packagea", "-R"], ["1 : packageb.{cpu}"], id="recursive"),
+        pytest.param(
+            ["packagea", "-R", "--weak"],
+            ["1 : packageb.{cpu}", "2 : packageb-sub.noarch"],
+            id="weak",
+        ),
+        pytest.param(
+            ["packagea-sub", "-R", "-Lalways"],
+            [
+                "1 : packagea.noarch",
+                "1 : packageb-sub.noarch",
+                "2 : packageb.{cpu}",
+            ],
+            id="files",
+        ),
+        pytest.param(
+            ["packagea-sub", "-R"],
+            [
+                "1 : packagea.noarch",
+                "1 : packageb-sub.noarch",
+                "2 : packageb.{cpu}",
+            ],
+            id="files-on-demand",
+        ),
+        pytest.param(
+            ["packagea-sub", "--depth", "1", "-Lalways"],
+            ["1 : packagea.noarch", "1 : packageb-sub.noarch"],
+            id="depth",
+        ),
+        pytest.param(
+            ["packagea", "--buildrequires"], ["packageb.{cpu}"], id="buildrequires"
+        ),
+    ],
+)
+def test_requires(run_command2, target_cpu, args, expected):
+    stdout, stderr = run_command2(["requires", "-F", "na", *args], False)
+    assert not stderr
+    assert stdout == [line.format(cpu=target_cpu) for line in expected]
+
+
+def test_requires_closure(repo_test_rq: RepoqueryBase, target_cpu: str):
+    packages = repo_test_rq.query(name="packagea-sub", latest=1)
+    closure = repo_test_rq.requires_closure(packages, latest=1)
+    assert {f"{p.name}.{p.arch}": depth for p, depth in closure.items()} == {
+        "packagea.noarch": 1,
+        "packageb-sub.noarch": 1,
+        f"packageb.{target_cpu}": 2,
+    }
@@ -0,0 +1,115 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import fedrq.cli
+from fedrq._snapshot import Snapshot, SnapshotPackage
+from fedrq.cli.base import Command
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["pkgs", "packageb"],
+        ["pkgs", "-F", "na", "-l", "a", "package*"],
+        ["pkgs", "-S", "packageb-sub.noarch", "packagea"],
+        ["subpkgs", "-F", "nevrr", "packageb"],
+        ["subpkgs", "-l", "a", "-M", "*-sub", "packageb"],
+        ["whatrequires", "-E", "vpackage(b)"],
+        ["whatrequires", "-E", "-F", "source", "vpackage*"],
+        ["pkgs", "-A", "arched", "package*"],
+        ["subpkgs", "-A", "arched", "packageb"],
+        ["whatrequires", "-E", "-A", "arched", "vpackage*"],
+    ],
+)
+def test_snapshot(
+    patch_config_dirs,
+    temp_smartcache: Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    args: list[str],
+) -> None:
+    fedrq.cli.main(["make-cache"])
+    capsys.readouterr()
+    assert list(temp_smartcache.glob("fedrq/snapshots/tester/*.sqlite"))
+
+    fedrq.cli.main([*args, "--no-snapshot"])
+    expected = capsys.readouterr()
+    assert expected.out
+
+    def v_rq(self):
+        raise AssertionError("The snapshot should be used instead of the backend")
+
+    monkeypatch.setattr(Command, "v_rq", v_rq)
+    fedrq.cli.main(args)
+    assert capsys.readouterr() == expected
+
+
+def test_snapshot_fallback(
+    patch_config_dirs, temp_smartcache: Path, capsys: pytest.CaptureFixture
+) -> None:
+    fedrq.cli.main(["make-cache"])
+    capsys.readouterr()
+    # NEVR specs need the backend's NEVRA form resolution
+    args = ["pkgs", "packageb-11111:2-1.fc36"]
+    fedrq.cli.main([*args, "--no-snapshot"])
+    expected = capsys.readouterr()
+    fedrq.cli.main(args)
+    assert capsys.readouterr() == expected
+
+
+@pytest.mark.parametrize("cacheonly", [False, True])
+def test_snapshot_expired(
+    patch_config_dirs,
+    temp_smartcache: Path,
+    capsys: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    cacheonly: bool,
+) -> None:
+    fedrq.cli.main(["make-cache"])
+    capsys.readouterr()
+    # Pretend that the repositories' metadata_expire has passed
+    repomds = list(temp_smartcache.rglob("repomd.xml"))
+    assert repomds
+    for repomd in repomds:
+        os.utime(repomd, (0, 0))
+    loaded: list[bool] = []
+    v_rq = Command.v_rq
+
+    def wrapper(self):
+        loaded.append(True)
+        return v_rq(self)
+
+    monkeypatch.setattr(Command, "v_rq", wrapper)
+    fedrq.cli.main(["pkgs", "packageb", *(["--cacheonly"] if cacheonly else [])])
+    assert capsys.readouterr().out
+    # --cacheonly can't refresh the metadata, so the snapshot is still used
+    assert loaded == ([] if cacheonly else [True])
+
+
+@pytest.mark.parametrize(
+    "arch, expected",
+    [
+        ("arched", ["i386"]),
+        ("notsrc", ["i386", "i686", "noarch"]),
+        ("src", ["src"]),
+    ],
+)
+def test_snapshot_arch_filter(arch: str, expected: list[str]) -> None:
+    # Like the backends, 'arched' only matches the basearch
+    # when it's different from the arch
+    snapshot = Snapshot(sqlite3.connect(":memory:"), {"i686", "i386"}, "i386")
+    packages = [
+        SnapshotPackage("packagea", 0, "1", "1", package_arch, "tester", None)
+        for package_arch in ("i386", "i686", "noarch", "src")
+    ]
+    assert [package.arch for package in snapshot.arch_filter(packages, arch)] == (
+        expected
+    )
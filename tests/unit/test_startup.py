@@ -0,0 +1,51 @@
+# Copyright (C) 2026 Maxwell G <maxwell@gtmx.me>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Check that the commands that don't query the repos stay import-light
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = frozenset({"dnf", "hawkey", "libdnf5", "pydantic", "requests", "rpm"})
+
+
+def _imported_modules(*argv: str) -> set[str]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "fedrq", *argv],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        pytest.param(["--version"], id="version"),
+        pytest.param(["formatters"], id="formatters"),
+        pytest.param(["download-spec", "--help"], id="download-spec-help"),
+        pytest.param(["--help"], id="help"),
+    ],
+)
+def test_startup_imports(argv: list[str]) -> None:
+    modules = _imported_modules(*argv)
+    assert "fedrq.cli" in modules
+    assert not modules & HEAVY_MODULES
+
+
+def test_version_imports() -> None:
+    modules = _imported_modules("--version")
+    assert "pydantic" not in modules
+    assert not {m for m in modules if m.startswith("fedrq.cli.")}
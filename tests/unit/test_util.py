@@ -6,7 +6,9 @@ from __future__ import annotations
 from collections.abc import Iterator
 from typing import Any
 
-from fedrq._utils import exhaust_it
+import pytest
+
+from fedrq._utils import exhaust_it, format_size
 
 
 def fake_iter(lst: list[Any]) -> Iterator[None]:
@@ -19,3 +21,18 @@ def test_util_exhaust_it():
     lst = [*range(10)]
     exhaust_it(fake_iter(lst))
     assert not lst
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KiB"),
+        (5 * 1024**2, "5.0 MiB"),
+        (3 * 1024**3, "3.0 GiB"),
+        (2048 * 1024**3, "2048.0 GiB"),
+    ],
+)
+def test_format_size(size: int, expected: str) -> None:
+    assert format_size(size) == expected
@@ -152,3 +152,43 @@ def test_whatrequires_extra_exact(run_command):
     stdout, stderr = run_command(["--ee", "vpackage(b)"])
     assert not stderr
     assert stdout == expected
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        pytest.param(
+            ["-R"],
+            [
+                "1 : packagea.noarch",
+                "1 : packagea.src",
+                "1 : packageb-sub.noarch",
+                "2 : packagea-sub.noarch",
+            ],
+            id="recursive",
+        ),
+        pytest.param(
+            ["--depth", "1"],
+            [
+                "1 : packagea.noarch",
+                "1 : packagea.src",
+                "1 : packageb-sub.noarch",
+            ],
+            id="depth",
+        ),
+        pytest.param(
+            ["-R", "-X", "--notsrc"],
+            ["1 : packagea.noarch", "2 : packagea-sub.noarch"],
+            id="exclude-notsrc",
+        ),
+    ],
+)
+def test_whatrequires_recursive(run_command, args, expected):
+    stdout, stderr = run_command(["-F", "na", "packageb", *args])
+    assert not stderr
+    assert stdout == expected
+
+
+def test_whatrequires_recursive_invalid_depth(run_command):
+    with pytest.raises(SystemExit, match="^1$"):
+        run_command(["--depth", "0", "packageb"])
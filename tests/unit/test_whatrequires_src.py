@@ -26,3 +26,15 @@ def test_whatrequires_src_exclude(run_command2):
     )
     assert not stderr
     assert stdout == ["packagea"]
+
+
+def test_whatrequires_src_recursive(run_command2):
+    stdout, stderr = run_command2(
+        ["whatrequires-src", "packageb", "-F", "na", "-X", "-R"], False
+    )
+    assert not stderr
+    assert stdout == [
+        "1 : packagea.noarch",
+        "1 : packagea.src",
+        "2 : packagea-sub.noarch",
+    ]